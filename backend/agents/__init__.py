@@ -4,6 +4,7 @@ Agents module - Multi-Agent System Core
 from .base import BaseAgent, AgentInput, AgentOutput
 from .registry import AgentRegistry
 from .orchestrator import Orchestrator
+from .plan_cache import PlanCache
 
 __all__ = [
     "BaseAgent",
@@ -11,4 +12,5 @@ __all__ = [
     "AgentOutput",
     "AgentRegistry",
     "Orchestrator",
+    "PlanCache",
 ]
@@ -4,12 +4,17 @@ BaseAgent - Abstract base class for all agents
 모든 에이전트가 상속받는 추상 기본 클래스.
 Single Responsibility: 각 에이전트는 하나의 전문 역할만 담당
 """
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 
+# 하위 에이전트가 참조하는 이전 결과의 최대 길이
+RESULT_PREVIEW_CHARS = 1500
+
+
 class AgentInput(BaseModel):
     """에이전트 입력 모델"""
     query: str = Field(..., description="사용자 질문")
@@ -19,6 +24,11 @@ class AgentInput(BaseModel):
         description="이전 에이전트들의 결과"
     )
     session_id: Optional[str] = Field(default=None, description="세션 ID")
+    token_queue: Optional[Any] = Field(
+        default=None,
+        exclude=True,
+        description="토큰 스트리밍용 asyncio.Queue (종료 시 None 전송)"
+    )
 
 
 class Visualization(BaseModel):
@@ -38,12 +48,35 @@ class AgentOutput(BaseModel):
     sources: List[Dict[str, Any]] = Field(default_factory=list, description="참조 소스")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="메타데이터")
     duration_ms: int = Field(default=0, description="실행 시간 (ms)")
-    timestamp: datetime = Field(default_factory=datetime.now, description="실행 시각")
+    timestamp_ms: int = Field(
+        default_factory=lambda: int(time.time() * 1000),
+        description="실행 시각 (epoch ms)"
+    )
     visualizations: List[Visualization] = Field(default_factory=list, description="시각화 데이터")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
+    @property
+    def timestamp(self) -> datetime:
+        """실행 시각 (하위 호환용)"""
+        return datetime.fromtimestamp(self.timestamp_ms / 1000)
+    
+    @property
+    def result_preview(self) -> str:
+        """하위 에이전트 전달용 결과 앞부분"""
+        return self.result[:RESULT_PREVIEW_CHARS]
+    
+    def fast_dump(self) -> Dict[str, Any]:
+        """
+        이전 결과 전달용 경량 dict
+        
+        model_dump()의 전체 순회 없이 하위 에이전트가 읽는 필드만 구성.
+        """
+        return {
+            "agent_name": self.agent_name,
+            "result": self.result,
+            "result_preview": self.result_preview,
+            "confidence": self.confidence,
+            "reasoning": self.reasoning,
+            "sources": self.sources,
         }
 
 
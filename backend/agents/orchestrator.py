@@ -3,13 +3,68 @@ Orchestrator - 에이전트 조율자
 
 요청 분석, 에이전트 선택, 실행 조율, 결과 종합을 담당.
 """
-import time
+import io
+import re
+import copy
+from time import perf_counter_ns as _pc
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet, Callable
+from itertools import islice
+from collections import OrderedDict, deque
 
 from .base import BaseAgent, AgentInput, AgentOutput
 from .registry import AgentRegistry
+from .plan_cache import PlanCache, get_plan_cache, hash_text, hash_context
+
+
+# 이전 에이전트 결과에 의존하므로 병렬 단계 이후 순차 실행되는 에이전트
+SEQUENTIAL_AGENTS = ("strategist",)
+
+# 에이전트별 라우팅 키워드 (기본값, config["routing_keywords"]로 대체 가능)
+ROUTING_KEYWORDS: Dict[str, List[str]] = {
+    "law_expert": ["법", "조문", "규정", "법령", "시행령"],
+    "calculator": ["계산", "세금", "세액", "얼마", "금액", "비교"],
+    "risk_analyst": ["리스크", "위험", "조사", "문제", "주의"],
+    "strategist": ["전략", "방법", "어떻게", "추천", "유리", "vs"],
+}
+
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.,~]+$")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """라우팅 캐시 키용 질문 정규화 (소문자, 공백 축약, 끝 구두점 제거)"""
+    query = _SPACE_RE.sub(" ", query.lower()).strip()
+    return _TRAILING_PUNCT_RE.sub("", query)
+
+
+def build_router(rules: Dict[str, List[str]]) -> Callable[[str], List[str]]:
+    """
+    키워드 규칙 테이블 → 특화된 라우팅 함수 생성
+    
+    전체 키워드를 하나의 정규식으로 컴파일해 질문을 한 번만 스캔.
+    그룹명 = 에이전트명이며, lookahead로 감싸 겹치는 매칭도 잡음
+    (예: "방법" 안의 "법").
+    
+    Args:
+        rules: {에이전트명: [키워드, ...]} (순서 = 선택 순서)
+        
+    Returns:
+        소문자 질문 → 매칭된 에이전트 목록 함수
+    """
+    order = tuple(rules)
+    pattern = re.compile("(?=" + "|".join(
+        f"(?P<{agent}>{'|'.join(re.escape(kw.lower()) for kw in keywords)})"
+        for agent, keywords in rules.items()
+    ) + ")")
+    finditer = pattern.finditer
+    
+    def route(query_lower: str) -> List[str]:
+        matched = {m.lastgroup for m in finditer(query_lower)}
+        return [agent for agent in order if agent in matched]
+    
+    return route
 
 
 class Orchestrator:
@@ -26,18 +81,39 @@ class Orchestrator:
         self, 
         llm_service,
         registry: AgentRegistry = None,
-        config: Dict[str, Any] = None
+        config: Dict[str, Any] = None,
+        plan_cache: PlanCache = None
     ):
         self.llm = llm_service
         self.registry = registry or AgentRegistry
         self.config = config or {}
-        self.execution_history: List[Dict[str, Any]] = []
+        self.execution_history: "deque[Dict[str, Any]]" = deque(
+            maxlen=self.config.get("history_max", 10000)
+        )
         
         # 기본 설정
         self.default_order = self.config.get("default_order", [
             "law_expert", "calculator", "risk_analyst", "strategist"
         ])
         self.max_iterations = self.config.get("max_iterations", 10)
+        self.parallel_enabled = self.config.get("parallel_enabled", True)
+        self.max_parallel_agents = self.config.get("max_parallel_agents", 3)
+        
+        # 라우팅 규칙을 전용 함수로 컴파일
+        self._route_fn = build_router(self.config.get("routing_keywords", ROUTING_KEYWORDS))
+        
+        # 라우팅 결정 LRU 캐시 (정규화된 질문 → 분석 결과)
+        self.route_cache_size = self.config.get("route_cache_size", 10000)
+        self._route_cache: "OrderedDict[Tuple[str, FrozenSet[str]], Dict[str, Any]]" = OrderedDict()
+        
+        # 계획 캐시 (입력이 바뀌지 않은 에이전트 결과 재사용)
+        # 법령/세무 답변이 TTL 동안 그대로 재사용되므로 설정으로 켠 경우에만 사용
+        if plan_cache is None and self.config.get("plan_cache_enabled", False):
+            plan_cache = get_plan_cache()
+        self.plan_cache = plan_cache
+        
+        # 동일 질문 동시 요청 병합 (singleflight)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
     
     async def analyze_request(self, query: str) -> Dict[str, Any]:
         """
@@ -49,36 +125,23 @@ class Orchestrator:
         Returns:
             {"agents": [...], "reason": "..."}
         """
-        available_agents = self.registry.list_agents()
+        available_agents = self.registry.agent_names_frozen()
         
         if not available_agents:
             return {"agents": self.default_order, "reason": "기본 순서 사용 (등록된 에이전트 없음)"}
         
+        # 캐시 조회 (등록 에이전트 구성이 바뀌면 키도 달라짐)
+        cache_key = (normalize_query(query), available_agents)
+        cached = self._route_cache.get(cache_key)
+        if cached is not None:
+            self._route_cache.move_to_end(cache_key)
+            return {**cached, "agents": list(cached["agents"])}
+        
         # 간단한 룰 기반 분류 (LLM 호출 없이)
         # 추후 LLM 기반으로 확장 가능
         query_lower = query.lower()
         
-        selected_agents = []
-        
-        # 법령 관련 키워드
-        if any(kw in query_lower for kw in ["법", "조문", "규정", "법령", "시행령"]):
-            if "law_expert" in available_agents:
-                selected_agents.append("law_expert")
-        
-        # 계산 관련 키워드
-        if any(kw in query_lower for kw in ["계산", "세금", "세액", "얼마", "금액", "비교"]):
-            if "calculator" in available_agents:
-                selected_agents.append("calculator")
-        
-        # 리스크 관련 키워드
-        if any(kw in query_lower for kw in ["리스크", "위험", "조사", "문제", "주의"]):
-            if "risk_analyst" in available_agents:
-                selected_agents.append("risk_analyst")
-        
-        # 전략/종합 관련 키워드
-        if any(kw in query_lower for kw in ["전략", "방법", "어떻게", "추천", "유리", "vs"]):
-            if "strategist" in available_agents:
-                selected_agents.append("strategist")
+        selected_agents = [a for a in self._route_fn(query_lower) if a in available_agents]
         
         # 선택된 에이전트가 없으면 기본 순서 사용
         if not selected_agents:
@@ -89,82 +152,233 @@ class Orchestrator:
             if len(selected_agents) > 1:  # 다른 에이전트가 2개 이상이면
                 selected_agents.append("strategist")
         
-        return {
+        result = {
             "agents": selected_agents,
             "reason": f"키워드 기반 분석: {', '.join(selected_agents)}"
         }
+        
+        self._route_cache[cache_key] = {**result, "agents": list(selected_agents)}
+        if len(self._route_cache) > self.route_cache_size:
+            self._route_cache.popitem(last=False)
+        
+        return result
+    
+    async def _run_agent(
+        self,
+        name: str,
+        query: str,
+        shared_context: Dict[str, Any],
+        previous_results: List[Dict[str, Any]]
+    ) -> AgentOutput:
+        """
+        단일 에이전트 실행 (조회 + 실행 + 시간 측정 + 에러 변환)
+        
+        Args:
+            name: 에이전트 이름
+            query: 사용자 질문
+            shared_context: 공유 컨텍스트
+            previous_results: 이전 에이전트 결과 (dump된 dict)
+            
+        Returns:
+            AgentOutput (실패 시 에러 AgentOutput)
+        """
+        try:
+            agent = self.registry.get(name, llm_service=self.llm)
+            
+            # 에이전트 입력 구성
+            agent_input = AgentInput(
+                query=query,
+                context=shared_context,
+                previous_results=previous_results
+            )
+            
+            # 실행
+            start_ns = _pc()
+            output = await agent.execute(agent_input)
+            output.duration_ms = (_pc() - start_ns) // 1_000_000
+            return output
+            
+        except Exception as e:
+            return self._error_output(name, e)
+    
+    @staticmethod
+    def _error_output(name: str, error: BaseException) -> AgentOutput:
+        """예외 → 에러 AgentOutput 변환 (필드를 직접 구성하므로 검증 생략)"""
+        return AgentOutput.model_construct(
+            agent_name=name,
+            result=f"에이전트 실행 실패: {str(error)}",
+            confidence=0.0,
+            reasoning=f"Error: {str(error)}",
+            metadata={"error": True}
+        )
+    
+    def _record(self, name: str, output: AgentOutput, shared_context: Dict[str, Any]) -> None:
+        """컨텍스트 업데이트 및 히스토리 기록"""
+        if output.metadata.get("error"):
+            return
+        
+        shared_context[name] = {
+            "result": output.result,
+            "confidence": output.confidence,
+            "sources": output.sources,
+        }
+        
+        self.execution_history.append({
+            "agent": name,
+            "timestamp_ms": output.timestamp_ms,
+            "duration_ms": output.duration_ms,
+            "confidence": output.confidence,
+        })
     
     async def execute_agents(
         self, 
         query: str, 
         agent_names: List[str],
         context: Dict[str, Any] = None,
-        parallel: bool = False
+        parallel: Optional[bool] = None
     ) -> List[AgentOutput]:
         """
-        에이전트들 순차 실행
+        에이전트들 실행
+        
+        전략가(strategist)를 제외한 에이전트는 서로 의존성이 없으므로
+        병렬로 실행하고, 이전 결과를 종합하는 전략가만 마지막에 순차 실행.
         
         Args:
             query: 사용자 질문
             agent_names: 실행할 에이전트 이름 목록
             context: 공유 컨텍스트
-            parallel: 병렬 실행 여부 (현재 미지원)
+            parallel: 병렬 실행 여부 (None이면 설정값 사용)
             
         Returns:
             AgentOutput 리스트
         """
         results: List[AgentOutput] = []
+        # 결과별 dump를 한 번만 계산해 재사용 (턴마다 전체 재직렬화 방지)
+        dumped_results: List[Dict[str, Any]] = []
         shared_context = context or {}
+        if parallel is None:
+            parallel = self.parallel_enabled
         
-        for name in agent_names:
-            if not self.registry.is_registered(name):
-                continue
-            
-            try:
-                agent = self.registry.get(name, llm_service=self.llm)
-                
-                # 에이전트 입력 구성
-                agent_input = AgentInput(
-                    query=query,
-                    context=shared_context,
-                    previous_results=[r.model_dump() for r in results]
+        names = [n for n in agent_names if self.registry.is_registered(n)]
+        
+        if not parallel:
+            for name in names:
+                output = await self._run_agent(
+                    name, query, shared_context, list(dumped_results)
                 )
-                
-                # 실행
-                start_time = time.time()
-                output = await agent.execute(agent_input)
-                output.duration_ms = int((time.time() - start_time) * 1000)
-                
                 results.append(output)
-                
-                # 컨텍스트 업데이트
-                shared_context[name] = {
-                    "result": output.result,
-                    "confidence": output.confidence,
-                    "sources": output.sources,
-                }
-                
-                # 히스토리 기록
-                self.execution_history.append({
-                    "agent": name,
-                    "timestamp": datetime.now().isoformat(),
-                    "duration_ms": output.duration_ms,
-                    "confidence": output.confidence,
-                })
-                
-            except Exception as e:
-                # 에러 발생 시에도 계속 진행
-                error_output = AgentOutput(
-                    agent_name=name,
-                    result=f"에이전트 실행 실패: {str(e)}",
-                    confidence=0.0,
-                    reasoning=f"Error: {str(e)}",
-                    metadata={"error": True}
+                dumped_results.append(output.fast_dump())
+                self._record(name, output, shared_context)
+            return results
+        
+        # 1단계: 독립 에이전트 병렬 실행 (동시 실행 수 제한)
+        parallel_names = [n for n in names if n not in SEQUENTIAL_AGENTS]
+        tail_names = [n for n in names if n in SEQUENTIAL_AGENTS]
+        semaphore = asyncio.Semaphore(self.max_parallel_agents)
+        
+        async def run_limited(name: str) -> AgentOutput:
+            async with semaphore:
+                return await self._run_agent(name, query, shared_context, [])
+        
+        outputs = await asyncio.gather(
+            *(run_limited(name) for name in parallel_names),
+            return_exceptions=True
+        )
+        
+        for name, output in zip(parallel_names, outputs):
+            if isinstance(output, BaseException):
+                output = self._error_output(name, output)
+            results.append(output)
+            dumped_results.append(output.fast_dump())
+            self._record(name, output, shared_context)
+        
+        # 2단계: 종합 에이전트 순차 실행
+        for name in tail_names:
+            output = await self._run_agent(
+                name, query, shared_context, list(dumped_results)
+            )
+            results.append(output)
+            dumped_results.append(output.fast_dump())
+            self._record(name, output, shared_context)
+        
+        return results
+    
+    async def _execute_with_plan_cache(
+        self,
+        query: str,
+        agent_names: List[str],
+        context: Dict[str, Any] = None
+    ) -> List[AgentOutput]:
+        """
+        계획 캐시를 활용한 에이전트 실행
+        
+        같은 목표(정규화된 질문)에 대해 입력 컨텍스트가 동일한 에이전트는
+        캐시된 결과를 재사용하고, 나머지만 실행. 종합 에이전트는 앞선
+        에이전트가 모두 재사용된 경우에만 재사용.
+        
+        Args:
+            query: 사용자 질문
+            agent_names: 실행할 에이전트 이름 목록
+            context: 공유 컨텍스트
+            
+        Returns:
+            AgentOutput 리스트 (agent_names 순서)
+        """
+        if self.plan_cache is None:
+            return await self.execute_agents(query, agent_names, context)
+        
+        shared_context = context or {}
+        goal_key = hash_text(normalize_query(query))
+        input_hash = hash_context(shared_context)
+        cached = await asyncio.to_thread(self.plan_cache.get, goal_key)
+        
+        names = [n for n in agent_names if self.registry.is_registered(n)]
+        parallel_names = [n for n in names if n not in SEQUENTIAL_AGENTS]
+        tail_names = [n for n in names if n in SEQUENTIAL_AGENTS]
+        
+        def reusable(name: str) -> bool:
+            entry = cached.get(name)
+            return entry is not None and entry["input_hash"] == input_hash
+        
+        outputs: Dict[str, AgentOutput] = {
+            n: AgentOutput.model_validate(cached[n]["output"])
+            for n in parallel_names if reusable(n)
+        }
+        
+        # 변경된 에이전트만 실행
+        stale_names = [n for n in parallel_names if n not in outputs]
+        if stale_names:
+            fresh = await self.execute_agents(query, stale_names, shared_context)
+            for output in fresh:
+                outputs[output.agent_name] = output
+                await self._store_plan(goal_key, input_hash, output)
+        
+        for name in parallel_names:
+            if name not in stale_names:
+                self._record(name, outputs[name], shared_context)
+        
+        results = [outputs[n] for n in parallel_names if n in outputs]
+        dumped_results = [r.fast_dump() for r in results]
+        
+        for name in tail_names:
+            if not stale_names and reusable(name):
+                output = AgentOutput.model_validate(cached[name]["output"])
+            else:
+                output = await self._run_agent(
+                    name, query, shared_context, list(dumped_results)
                 )
-                results.append(error_output)
+                await self._store_plan(goal_key, input_hash, output)
+            results.append(output)
+            dumped_results.append(output.fast_dump())
+            self._record(name, output, shared_context)
         
         return results
     
+    async def _store_plan(self, goal_key: str, input_hash: str, output: AgentOutput) -> None:
+        """성공한 에이전트 결과만 계획 캐시에 저장 (SQLite 쓰기는 스레드에서)"""
+        if not output.metadata.get("error"):
+            await asyncio.to_thread(self.plan_cache.put, goal_key, output.agent_name, input_hash, output)
+    
     async def synthesize_results(
         self, 
         query: str, 
@@ -192,36 +406,45 @@ class Orchestrator:
         avg_confidence = sum(r.confidence for r in valid_results) / len(valid_results) if valid_results else 0.5
         
         # 리포트 구성
-        report_parts = []
-        report_parts.append("## 📊 종합 분석 리포트\n")
-        report_parts.append(f"**질문**: {query}\n")
-        report_parts.append(f"**분석 에이전트**: {len(results)}개\n")
-        report_parts.append(f"**종합 신뢰도**: {avg_confidence:.0%}\n")
-        report_parts.append("\n---\n")
+        buf = io.StringIO()
+        w = buf.write
+        w("## 📊 종합 분석 리포트\n")
+        w(f"**질문**: {query}\n")
+        w(f"**분석 에이전트**: {len(results)}개\n")
+        w(f"**종합 신뢰도**: {avg_confidence:.0%}\n")
+        w("\n---\n")
         
+        # 리포트 작성과 함께 소스 수집 / 결과 dump (단일 패스)
+        all_sources = []
+        agent_results = []
         for result in results:
             emoji = "✅" if result.confidence >= 0.7 else "⚠️" if result.confidence >= 0.4 else "❌"
-            report_parts.append(f"### {emoji} {result.agent_name}\n")
-            report_parts.append(f"**신뢰도**: {result.confidence:.0%}\n")
-            report_parts.append(f"\n{result.result}\n")
+            w(f"### {emoji} {result.agent_name}\n")
+            w(f"**신뢰도**: {result.confidence:.0%}\n")
+            w(f"\n{result.result}\n")
             
-            if result.reasoning:
-                report_parts.append(f"\n> 💭 **추론 과정**: {result.reasoning[:200]}...\n" if len(result.reasoning) > 200 else f"\n> 💭 **추론 과정**: {result.reasoning}\n")
+            reasoning = result.reasoning
+            if reasoning:
+                if len(reasoning) > 200:
+                    reasoning = reasoning[:200] + "..."
+                w(f"\n> 💭 **추론 과정**: {reasoning}\n")
+            
+            w("\n---\n")
             
-            report_parts.append("\n---\n")
-        
-        # 모든 소스 수집
-        all_sources = []
-        for result in results:
             all_sources.extend(result.sources)
+            agent_results.append(result.model_dump())
         
         return {
-            "report": "".join(report_parts),
+            "report": buf.getvalue(),
             "confidence": avg_confidence,
             "agent_count": len(results),
-            "agent_results": [r.model_dump() for r in results],
+            "agent_results": agent_results,
             "sources": all_sources,
-            "execution_history": self.execution_history[-len(results):],
+            "execution_history": list(islice(
+                self.execution_history,
+                max(len(self.execution_history) - len(results), 0),
+                None
+            )),
         }
     
     async def run(
@@ -232,6 +455,10 @@ class Orchestrator:
         """
         전체 오케스트레이션 실행
         
+        같은 질문/컨텍스트로 동시에 들어온 요청은 하나의 실행 결과를 공유.
+        파이프라인은 별도 Task로 실행되므로 먼저 요청한 호출자가 취소되어도
+        나머지 호출자는 결과를 받으며, 결과는 호출자별 복사본으로 반환.
+        
         Args:
             query: 사용자 질문
             context: 초기 컨텍스트
@@ -239,11 +466,34 @@ class Orchestrator:
         Returns:
             최종 결과 dict
         """
+        key = (normalize_query(query), hash_context(context))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_pipeline(query, context))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+    
+    def _forget_inflight(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        """완료된 공유 실행 제거"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 대기자가 모두 취소되어도 미회수 경고가 나지 않도록 표시
+    
+    async def _run_pipeline(
+        self,
+        query: str,
+        context: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """분석 → 실행 → 종합 파이프라인"""
         # 1. 요청 분석
         analysis = await self.analyze_request(query)
         
-        # 2. 에이전트 실행
-        results = await self.execute_agents(
+        # 2. 에이전트 실행 (계획 캐시 경유)
+        results = await self._execute_with_plan_cache(
             query=query,
             agent_names=analysis["agents"],
             context=context
@@ -257,7 +507,7 @@ class Orchestrator:
     
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """실행 히스토리 반환"""
-        return self.execution_history.copy()
+        return list(self.execution_history)
     
     def clear_history(self) -> None:
         """히스토리 초기화"""
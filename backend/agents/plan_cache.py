@@ -0,0 +1,107 @@
+"""
+PlanCache - 에이전트 실행 계획 캐시
+
+질문(목표)별로 각 에이전트의 입력 지문과 출력을 저장하여,
+입력이 바뀌지 않은 에이전트는 재실행 없이 이전 결과를 재사용.
+"""
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict
+from functools import lru_cache
+
+import orjson
+
+from .base import AgentOutput
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "storage" / "sqlite" / "plan_cache.db"
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 해시"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_context(context: Dict[str, Any]) -> str:
+    """컨텍스트 지문 (키 순서 무관)"""
+    payload = orjson.dumps(
+        context or {},
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class PlanCache:
+    """
+    SQLite 기반 계획 캐시
+
+    저장 형식: goal_key → {agent_name: {"input_hash": ..., "output": AgentOutput dict}}
+    """
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        ttl_hours: float = 24
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plan_cache (
+                goal_key TEXT NOT NULL,
+                agent_name TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                output TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (goal_key, agent_name)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, goal_key: str) -> Dict[str, Dict[str, Any]]:
+        """목표에 대해 저장된 에이전트별 항목 조회 (만료 제외)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT agent_name, input_hash, output FROM plan_cache "
+                "WHERE goal_key = ? AND expires_at > ?",
+                (goal_key, time.time())
+            ).fetchall()
+
+        return {
+            name: {"input_hash": input_hash, "output": orjson.loads(output)}
+            for name, input_hash, output in rows
+        }
+
+    def put(self, goal_key: str, agent_name: str, input_hash: str, output: AgentOutput) -> None:
+        """에이전트 결과 저장"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plan_cache VALUES (?, ?, ?, ?, ?)",
+                (
+                    goal_key,
+                    agent_name,
+                    input_hash,
+                    output.model_dump_json(),
+                    time.time() + self.ttl_seconds,
+                )
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 초기화"""
+        with self._lock:
+            self._conn.execute("DELETE FROM plan_cache")
+            self._conn.commit()
+
+
+@lru_cache()
+def get_plan_cache() -> PlanCache:
+    """계획 캐시 싱글톤 반환"""
+    return PlanCache()
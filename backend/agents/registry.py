@@ -4,7 +4,8 @@ AgentRegistry - Plugin pattern for dynamic agent registration
 에이전트를 동적으로 등록하고 관리하는 레지스트리.
 새 에이전트 추가 시 코드 변경 최소화.
 """
-from typing import Dict, Type, List, Optional, Any
+import importlib
+from typing import Dict, Type, List, Optional, Any, FrozenSet
 from .base import BaseAgent
 
 
@@ -18,11 +19,21 @@ class AgentRegistry:
             ...
             
         agent = AgentRegistry.get("law_expert", llm_service=llm)
+        
+        # 지연 로딩: 모듈은 첫 get() 시점에 import
+        AgentRegistry.register_lazy("law_expert", "agents.specialists.law_expert")
     """
     
     _agents: Dict[str, Type[BaseAgent]] = {}
     _instances: Dict[str, BaseAgent] = {}
     _configs: Dict[str, Dict[str, Any]] = {}
+    _lazy_modules: Dict[str, str] = {}
+    _agents_frozen: FrozenSet[str] = frozenset()
+    
+    @classmethod
+    def _refresh_names(cls) -> None:
+        """이름 스냅샷 갱신 (등록 + 지연 등록)"""
+        cls._agents_frozen = frozenset(cls._agents) | frozenset(cls._lazy_modules)
     
     @classmethod
     def register(cls, name: str, config: Dict[str, Any] = None):
@@ -42,9 +53,29 @@ class AgentRegistry:
             
             cls._agents[name] = agent_class
             cls._configs[name] = config or {}
+            cls._refresh_names()
             return agent_class
         return decorator
     
+    @classmethod
+    def register_lazy(cls, name: str, module: str) -> None:
+        """
+        모듈 import 없이 에이전트 이름만 등록
+        
+        Args:
+            name: 에이전트 고유 이름
+            module: @register 데코레이터가 있는 모듈 경로
+        """
+        cls._lazy_modules[name] = module
+        cls._refresh_names()
+    
+    @classmethod
+    def ensure_loaded(cls, name: str) -> bool:
+        """지연 등록된 에이전트 모듈을 필요 시 import"""
+        if name not in cls._agents and name in cls._lazy_modules:
+            importlib.import_module(cls._lazy_modules[name])
+        return name in cls._agents
+    
     @classmethod
     def get(
         cls, 
@@ -66,23 +97,29 @@ class AgentRegistry:
         Raises:
             ValueError: 등록되지 않은 에이전트
         """
-        if name not in cls._agents:
-            raise ValueError(f"Unknown agent: {name}. Available: {list(cls._agents.keys())}")
+        # 싱글톤 히트는 단일 dict 조회로 반환
+        if singleton:
+            instance = cls._instances.get(name)
+            if instance is not None:
+                return instance
         
-        if singleton and name in cls._instances:
-            return cls._instances[name]
+        agent_class = cls._agents.get(name)
+        if agent_class is None and cls.ensure_loaded(name):
+            agent_class = cls._agents[name]
+        if agent_class is None:
+            raise ValueError(f"Unknown agent: {name}. Available: {list(cls._agents)}")
         
         # 기본 설정과 kwargs 병합
-        merged_config = {**cls._configs.get(name, {}), **kwargs.get("config", {})}
-        kwargs["config"] = merged_config
+        base_config = cls._configs.get(name, {})
+        kwargs["config"] = {**base_config, **kwargs.get("config", {})}
         
         # 기본 인자 설정
         if "name" not in kwargs:
             kwargs["name"] = name
         if "description" not in kwargs:
-            kwargs["description"] = cls._configs.get(name, {}).get("description", "")
+            kwargs["description"] = base_config.get("description", "")
         
-        instance = cls._agents[name](**kwargs)
+        instance = agent_class(**kwargs)
         
         if singleton:
             cls._instances[name] = instance
@@ -92,17 +129,24 @@ class AgentRegistry:
     @classmethod
     def list_agents(cls) -> List[str]:
         """등록된 에이전트 이름 목록"""
-        return list(cls._agents.keys())
+        return list(dict.fromkeys([*cls._lazy_modules, *cls._agents]))
+    
+    @classmethod
+    def agent_names_frozen(cls) -> FrozenSet[str]:
+        """등록된 에이전트 이름 스냅샷 (O(1) 멤버십 검사용)"""
+        return cls._agents_frozen
     
     @classmethod
     def get_all_configs(cls) -> Dict[str, Dict[str, Any]]:
         """모든 에이전트 설정 반환"""
+        for name in list(cls._lazy_modules):
+            cls.ensure_loaded(name)
         return cls._configs.copy()
     
     @classmethod
     def is_registered(cls, name: str) -> bool:
-        """에이전트 등록 여부 확인"""
-        return name in cls._agents
+        """에이전트 등록 여부 확인 (지연 등록 포함)"""
+        return name in cls._agents_frozen
     
     @classmethod
     def clear(cls) -> None:
@@ -110,6 +154,8 @@ class AgentRegistry:
         cls._agents.clear()
         cls._instances.clear()
         cls._configs.clear()
+        cls._lazy_modules.clear()
+        cls._agents_frozen = frozenset()
     
     @classmethod
     def remove_instance(cls, name: str) -> None:
@@ -120,7 +166,7 @@ class AgentRegistry:
     @classmethod
     def get_agent_info(cls, name: str) -> Optional[Dict[str, Any]]:
         """에이전트 정보 반환"""
-        if name not in cls._agents:
+        if not cls.ensure_loaded(name):
             return None
         
         return {
@@ -1,17 +1,31 @@
 """
 Specialist Agents Initialization
+
+에이전트 모듈은 처음 사용될 때 import (PEP 562 지연 로딩).
 """
-from .law_expert import LawExpertAgent
-from .calculator import CalculatorAgent
-from .risk_analyst import RiskAnalystAgent
-from .strategist import StrategistAgent
-from .data_analyst import DataAnalystAgent
+import importlib
+
+from ..registry import AgentRegistry
+
+# 클래스명 → 모듈명 (모듈명 = 레지스트리 등록 이름)
+_AGENT_MODULES = {
+    "LawExpertAgent": "law_expert",
+    "CalculatorAgent": "calculator",
+    "RiskAnalystAgent": "risk_analyst",
+    "StrategistAgent": "strategist",
+    "DataAnalystAgent": "data_analyst",
+}
+
+for _module in _AGENT_MODULES.values():
+    AgentRegistry.register_lazy(_module, f"{__name__}.{_module}")
+
+__all__ = list(_AGENT_MODULES)
 
-__all__ = [
-    "LawExpertAgent",
-    "CalculatorAgent", 
-    "RiskAnalystAgent",
-    "StrategistAgent",
-    "DataAnalystAgent",
-]
 
+def __getattr__(name: str):
+    if name in _AGENT_MODULES:
+        module = importlib.import_module(f".{_AGENT_MODULES[name]}", __name__)
+        cls = getattr(module, name)
+        globals()[name] = cls
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
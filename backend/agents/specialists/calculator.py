@@ -3,36 +3,29 @@ CalculatorAgent - 계산 전문가 에이전트
 
 세금 계산 및 시뮬레이션을 담당하는 전문가 에이전트.
 """
+import re
 from typing import Dict, Any
 from ..base import BaseAgent, AgentInput, AgentOutput, Visualization
 from ..registry import AgentRegistry
+from services.llm_cache import get_llm_cache
 
 
-@AgentRegistry.register("calculator", config={
-    "description": "세금 계산 및 시뮬레이션 전문가",
-    "temperature": 0.1,
-})
-class CalculatorAgent(BaseAgent):
-    """
-    계산 전문가 에이전트
-    
-    Responsibilities:
-    - 세금 계산 (종합소득세, 부가세 등)
-    - 시나리오 시뮬레이션
-    - 비교 분석
-    """
-    
-    def __init__(
-        self, 
-        name: str = "calculator",
-        description: str = "세금 계산 및 시뮬레이션 전문가",
-        llm_service = None,
-        config: Dict[str, Any] = None
-    ):
-        super().__init__(name, description, llm_service, config)
-    
-    def get_system_prompt(self) -> str:
-        return """당신은 세금 계산 전문가입니다.
+# 비교 차트를 붙일 질문 키워드
+_VIZ_TRIGGER = re.compile(r"법인|개인|비교")
+
+# 고정 예시 데이터이므로 import 시 한 번만 생성 (응답마다 깊은 복사본을 붙여 요청 간 공유 방지)
+_DEFAULT_COMPARE_VIZ = Visualization(
+    type="compare",
+    title="세금 부담 비교",
+    data=[
+        {"name": "개인사업 유지", "종합소득세": 3500, "건강보험": 400, "국민연금": 200, "total": 4100},
+        {"name": "법인 전환", "법인세": 1200, "급여소득세": 1500, "배당세": 500, "건보료": 300, "total": 3500},
+    ],
+    insight="법인 전환 시 연간 약 600만원 절세 효과 (수익 1억 기준)"
+)
+
+
+SYSTEM_PROMPT = """당신은 세금 계산 전문가입니다.
 정확한 세금 계산과 시뮬레이션을 수행합니다.
 
 규칙:
@@ -58,6 +51,33 @@ class CalculatorAgent(BaseAgent):
 ### 시나리오 비교
 [대안 비교 (해당 시)]
 """
+
+
+@AgentRegistry.register("calculator", config={
+    "description": "세금 계산 및 시뮬레이션 전문가",
+    "temperature": 0.1,
+})
+class CalculatorAgent(BaseAgent):
+    """
+    계산 전문가 에이전트
+    
+    Responsibilities:
+    - 세금 계산 (종합소득세, 부가세 등)
+    - 시나리오 시뮬레이션
+    - 비교 분석
+    """
+    
+    def __init__(
+        self, 
+        name: str = "calculator",
+        description: str = "세금 계산 및 시뮬레이션 전문가",
+        llm_service = None,
+        config: Dict[str, Any] = None
+    ):
+        super().__init__(name, description, llm_service, config)
+    
+    def get_system_prompt(self) -> str:
+        return SYSTEM_PROMPT
     
     async def execute(self, input: AgentInput) -> AgentOutput:
         """세금 계산 실행"""
@@ -74,7 +94,7 @@ class CalculatorAgent(BaseAgent):
         if input.previous_results:
             for prev in input.previous_results:
                 if prev.get("agent_name") == "law_expert":
-                    law_context = prev.get("result", "")[:1000]
+                    law_context = prev.get("result_preview", prev.get("result", ""))[:1000]
                     break
         
         user_prompt = f"""다음 질문에 대해 세금 계산을 수행해주세요.
@@ -86,28 +106,49 @@ class CalculatorAgent(BaseAgent):
 정확한 계산 과정과 함께 결과를 제시해주세요.
 가정이 필요한 경우 명확히 명시하고, 가능하면 여러 시나리오를 비교해주세요."""
         
-        try:
-            result = await self.llm.chat(
-                system_prompt=self.get_system_prompt(),
+        system_prompt = self.get_system_prompt()
+        queue = input.token_queue
+        streamed = False
+        
+        async def compute() -> str:
+            nonlocal streamed
+            if queue is None:
+                return await self.llm.chat(
+                    system_prompt=system_prompt,
+                    user_message=user_prompt
+                )
+            
+            # 토큰을 받는 즉시 큐로 전달하면서 전체 응답 누적
+            streamed = True
+            chunks = []
+            async for token in self.llm.chat_stream(
+                system_prompt=system_prompt,
                 user_message=user_prompt
+            ):
+                chunks.append(token)
+                await queue.put(token)
+            return "".join(chunks)
+        
+        try:
+            result = await get_llm_cache().get_or_compute(
+                (system_prompt, user_prompt),
+                compute,
+                metadata={"agent": self.name}
             )
             
+            # 캐시 히트 시 전체 응답을 한 번에 전달
+            if queue is not None and not streamed:
+                await queue.put(result)
+            
             # 시나리오 비교 시각화 데이터 생성 (예시)
             visualizations = []
             
             # 법인전환 관련 질문인 경우 비교 차트 생성
-            if "법인" in input.query or "개인" in input.query or "비교" in input.query:
-                visualizations.append(Visualization(
-                    type="compare",
-                    title="세금 부담 비교",
-                    data=[
-                        {"name": "개인사업 유지", "종합소득세": 3500, "건강보험": 400, "국민연금": 200, "total": 4100},
-                        {"name": "법인 전환", "법인세": 1200, "급여소득세": 1500, "배당세": 500, "건보료": 300, "total": 3500},
-                    ],
-                    insight="법인 전환 시 연간 약 600만원 절세 효과 (수익 1억 기준)"
-                ))
+            if _VIZ_TRIGGER.search(input.query):
+                visualizations.append(_DEFAULT_COMPARE_VIZ.model_copy(deep=True))
             
-            return AgentOutput(
+            # 에이전트가 직접 구성한 값이므로 검증 생략
+            return AgentOutput.model_construct(
                 agent_name=self.name,
                 result=result,
                 confidence=0.90,
@@ -125,4 +166,7 @@ class CalculatorAgent(BaseAgent):
                 reasoning=f"Error: {str(e)}",
                 metadata={"error": True}
             )
+        finally:
+            if queue is not None:
+                await queue.put(None)
 
@@ -3,45 +3,63 @@ DataAnalystAgent - 데이터 분석 전문가 에이전트
 
 CSV 데이터 자동 분석, 상관관계, A/B 테스트 등을 담당.
 """
-import io
-import json
-from typing import Dict, Any, List, Optional
+import math
+import warnings
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from scipy import stats
+import orjson
 
 from ..base import BaseAgent, AgentInput, AgentOutput, Visualization
 from ..registry import AgentRegistry
+from utils.csv_reader import read_csv_bytes
 
 
-@AgentRegistry.register("data_analyst", config={
-    "description": "CSV 데이터 자동 분석 전문가",
-    "temperature": 0.2,
-})
-class DataAnalystAgent(BaseAgent):
+def _dumps(obj: Any) -> str:
+    """프롬프트 삽입용 JSON 직렬화 (numpy 값 직접 지원)"""
+    return orjson.dumps(
+        obj,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+def _ttest_core(a: np.ndarray, b: np.ndarray) -> Tuple[float, float, float, float, float]:
     """
-    데이터 분석 전문가 에이전트
+    독립 2표본 t-검정 통계량을 한 번에 계산 (stats.ttest_ind와 동일한 등분산 가정)
     
-    Capabilities:
-    - CSV 자동 프로파일링
-    - 상관관계 분석
-    - A/B 테스트
-    - 기술 통계
-    - 인사이트 생성
+    Returns:
+        (mean_a, mean_b, t_statistic, p_value, cohens_d)
     """
+    # scipy는 import 비용이 커서 실제 검정 시점에 로드
+    from scipy import stats
     
-    def __init__(
-        self, 
-        name: str = "data_analyst",
-        description: str = "CSV 데이터 자동 분석 전문가",
-        llm_service = None,
-        config: Dict[str, Any] = None
-    ):
-        super().__init__(name, description, llm_service, config)
-        self._current_df: Optional[pd.DataFrame] = None
+    na, nb = a.size, b.size
+    mean_a, mean_b = a.mean(), b.mean()
     
-    def get_system_prompt(self) -> str:
-        return """당신은 데이터 분석 전문가입니다.
+    # 편차 제곱합은 BLAS 내적으로 계산
+    dev_a, dev_b = a - mean_a, b - mean_b
+    var_a = float(dev_a @ dev_a) / (na - 1) if na > 1 else np.nan
+    var_b = float(dev_b @ dev_b) / (nb - 1) if nb > 1 else np.nan
+    
+    dof = na + nb - 2
+    pooled_var = ((na - 1) * var_a + (nb - 1) * var_b) / dof if dof > 0 else np.nan
+    se = np.sqrt(pooled_var * (1 / na + 1 / nb)) if na and nb else np.nan
+    
+    if se > 0:
+        t_stat = (mean_a - mean_b) / se
+        p_value = float(2 * stats.t.sf(abs(t_stat), dof))
+    else:
+        t_stat = p_value = np.nan
+    
+    # 효과 크기 (Cohen's d)
+    pooled_std = np.sqrt((var_a + var_b) / 2)
+    effect_size = (mean_b - mean_a) / pooled_std if pooled_std > 0 else 0
+    
+    return float(mean_a), float(mean_b), float(t_stat), p_value, float(effect_size)
+
+
+SYSTEM_PROMPT = """당신은 데이터 분석 전문가입니다.
 CSV 데이터를 분석하고 인사이트를 도출합니다.
 
 규칙:
@@ -70,28 +88,59 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
 ### 인사이트 및 권장사항
 [실행 가능한 제안]
 """
+
+
+@AgentRegistry.register("data_analyst", config={
+    "description": "CSV 데이터 자동 분석 전문가",
+    "temperature": 0.2,
+})
+class DataAnalystAgent(BaseAgent):
+    """
+    데이터 분석 전문가 에이전트
+    
+    Capabilities:
+    - CSV 자동 프로파일링
+    - 상관관계 분석
+    - A/B 테스트
+    - 기술 통계
+    - 인사이트 생성
+    """
+    
+    def __init__(
+        self, 
+        name: str = "data_analyst",
+        description: str = "CSV 데이터 자동 분석 전문가",
+        llm_service = None,
+        config: Dict[str, Any] = None
+    ):
+        super().__init__(name, description, llm_service, config)
+        self._current_df: Optional[pd.DataFrame] = None
+        self._numeric_cols: List[str] = []
+        self._numeric_mat: Optional[np.ndarray] = None
+    
+    def get_system_prompt(self) -> str:
+        return SYSTEM_PROMPT
     
     async def execute(self, input: AgentInput) -> AgentOutput:
         """데이터 분석 실행"""
         visualizations = []
         
-        # CSV 데이터가 컨텍스트에 있는지 확인
-        csv_data = input.context.get("csv_data")
+        # CSV 데이터가 컨텍스트에 있는지 확인 (csv_bytes: 원본 바이트, csv_data: 문자열 하위 호환)
+        csv_data = input.context.get("csv_bytes") or input.context.get("csv_data")
         file_path = input.context.get("file_path")
         
         if csv_data or file_path:
             # CSV 로드 및 분석
             try:
                 if csv_data:
-                    self._current_df = pd.read_csv(io.StringIO(csv_data))
+                    if isinstance(csv_data, str):
+                        csv_data = csv_data.encode("utf-8")
+                    self._current_df = read_csv_bytes(csv_data)
                 elif file_path:
-                    self._current_df = pd.read_csv(file_path)
-                
-                # 기본 프로파일링
-                profile = self._profile_data(self._current_df)
+                    self._current_df = read_csv_bytes(file_path)
                 
-                # 상관관계 분석
-                correlation = self._analyze_correlation(self._current_df)
+                # 프로파일링 + 상관관계 + 분포 (수치형 행렬/통계를 공유하여 한 번에 계산)
+                profile, correlation, dist_viz = self._profile_all(self._current_df)
                 
                 # 시각화 데이터 생성
                 if correlation:
@@ -103,7 +152,6 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
                     ))
                 
                 # 분포 시각화
-                dist_viz = self._create_distribution_viz(self._current_df)
                 if dist_viz:
                     visualizations.append(dist_viz)
                 
@@ -111,10 +159,10 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
                 if self.llm:
                     insight_prompt = f"""다음 데이터 프로파일을 분석하고 인사이트를 제공해주세요:
 
-{json.dumps(profile, indent=2, ensure_ascii=False)}
+{_dumps(profile)}
 
 상관관계 분석:
-{json.dumps(correlation, indent=2, ensure_ascii=False) if correlation else '수치형 데이터 없음'}
+{_dumps(correlation) if correlation else '수치형 데이터 없음'}
 
 사용자 질문: {input.query}
 """
@@ -166,7 +214,34 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
             reasoning="데이터 없음"
         )
     
-    def _profile_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _profile_all(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Visualization]]:
+        """
+        프로파일링, 상관관계, 분포 시각화를 한 번에 수행
+        
+        수치형 행렬과 컬럼 통계(평균/표준편차/최소/최대)를 한 번만 계산하여
+        세 분석이 같은 데이터를 다시 읽지 않도록 공유.
+        
+        Returns:
+            (프로파일, 상관관계 분석 결과, 분포 시각화)
+        """
+        self._numeric_cols, self._numeric_mat = self._extract_numeric(df)
+        col_stats = self._numeric_stats(self._numeric_mat)
+        
+        profile = self._profile_data(df, self._numeric_cols, col_stats)
+        correlation = self._analyze_correlation(self._numeric_cols, self._numeric_mat, col_stats)
+        dist_viz = self._create_distribution_viz(self._numeric_cols, self._numeric_mat, col_stats)
+        
+        return profile, correlation, dist_viz
+    
+    def _profile_data(
+        self,
+        df: pd.DataFrame,
+        numeric_cols: List[str],
+        col_stats: Dict[str, np.ndarray]
+    ) -> Dict[str, Any]:
         """기본 데이터 프로파일링"""
         profile = {
             "shape": {"rows": len(df), "columns": len(df.columns)},
@@ -175,21 +250,27 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
             "data_quality": {}
         }
         
-        for col in df.columns:
+        # 컬럼별 통계를 한 번에 계산 (컬럼마다 개별 스캔 방지)
+        na_counts = df.isna().sum()
+        na_pct = (na_counts / len(df) * 100).round(2)
+        nuniques = df.nunique()
+        num_index = {col: i for i, col in enumerate(numeric_cols)}
+        num_stats = {key: np.round(values, 2).tolist() for key, values in col_stats.items()}
+        
+        for col, dtype in df.dtypes.items():
             col_info = {
                 "name": col,
-                "dtype": str(df[col].dtype),
-                "missing": int(df[col].isna().sum()),
-                "missing_pct": round(df[col].isna().mean() * 100, 2),
-                "unique": int(df[col].nunique())
+                "dtype": str(dtype),
+                "missing": int(na_counts[col]),
+                "missing_pct": float(na_pct[col]),
+                "unique": int(nuniques[col])
             }
             
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if col in num_index:
+                i = num_index[col]
                 col_info.update({
-                    "mean": round(df[col].mean(), 2) if not df[col].isna().all() else None,
-                    "std": round(df[col].std(), 2) if not df[col].isna().all() else None,
-                    "min": round(df[col].min(), 2) if not df[col].isna().all() else None,
-                    "max": round(df[col].max(), 2) if not df[col].isna().all() else None,
+                    key: (None if math.isnan(values[i]) else values[i])
+                    for key, values in num_stats.items()
                 })
             
             profile["columns"].append(col_info)
@@ -199,8 +280,9 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
         
         # 데이터 품질 경고
         warnings = []
-        if df.duplicated().sum() > 0:
-            warnings.append(f"중복 행 {df.duplicated().sum()}개 발견")
+        dup_count = int(df.duplicated().sum())
+        if dup_count > 0:
+            warnings.append(f"중복 행 {dup_count}개 발견")
         
         high_missing = [c for c in profile["columns"] if c["missing_pct"] > 20]
         if high_missing:
@@ -210,35 +292,81 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
         
         return profile
     
-    def _analyze_correlation(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
-        """상관관계 분석"""
+    @staticmethod
+    def _extract_numeric(df: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """
+        수치형 컬럼 목록과 float64 행렬 추출
+        
+        Returns:
+            (컬럼명 리스트, 행 x 컬럼 행렬 - 컬럼 단위 연속 메모리, 결측치는 NaN)
+        """
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        arr = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        return numeric_cols, np.asfortranarray(arr)
+    
+    @staticmethod
+    def _numeric_stats(arr: np.ndarray) -> Dict[str, np.ndarray]:
+        """컬럼별 평균/표준편차(ddof=1)/최소/최대 (결측치 제외, 값이 없으면 NaN)"""
+        if arr.size == 0:
+            empty = np.full(arr.shape[1], np.nan)
+            return {"mean": empty, "std": empty, "min": empty, "max": empty}
         
+        # 전부 결측인 컬럼의 RuntimeWarning 억제 (결과는 NaN)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return {
+                "mean": np.nanmean(arr, axis=0),
+                "std": np.nanstd(arr, axis=0, ddof=1),
+                "min": np.nanmin(arr, axis=0),
+                "max": np.nanmax(arr, axis=0),
+            }
+    
+    def _analyze_correlation(
+        self,
+        numeric_cols: List[str],
+        arr: np.ndarray,
+        col_stats: Dict[str, np.ndarray]
+    ) -> Optional[Dict[str, Any]]:
+        """상관관계 분석"""
         if len(numeric_cols) < 2:
             return None
         
-        corr_matrix = df[numeric_cols].corr()
-        
-        # 강한 상관관계 추출
-        strong_correlations = []
-        for i, col1 in enumerate(numeric_cols):
-            for j, col2 in enumerate(numeric_cols):
-                if i < j:
-                    corr_val = corr_matrix.loc[col1, col2]
-                    if abs(corr_val) > 0.7:
-                        strong_correlations.append({
-                            "pair": [col1, col2],
-                            "correlation": round(corr_val, 3),
-                            "strength": "강한 양의 상관" if corr_val > 0 else "강한 음의 상관"
-                        })
+        if np.isnan(arr).any():
+            # 결측치가 있으면 df.corr()와 같은 pairwise-complete 계산 (쌍마다 둘 다 있는 행만 사용)
+            corr = pd.DataFrame(arr).corr().to_numpy()
+        else:
+            # 표준화 후 A.T @ A 한 번의 행렬곱 (BLAS GEMM)
+            n = arr.shape[0]
+            A = arr - col_stats["mean"]
+            std = col_stats["std"]
+            valid = std > 0
+            A /= np.where(valid, std, 1.0)
+            corr = np.clip((A.T @ A) / max(n - 1, 1), -1.0, 1.0)
+            np.fill_diagonal(corr, 1.0)
+            # 상수 컬럼은 NaN (df.corr()와 동일)
+            corr[~valid, :] = np.nan
+            corr[:, ~valid] = np.nan
+        
+        # 강한 상관관계 추출 (상삼각 마스크 한 번으로 위치 탐색)
+        k = len(numeric_cols)
+        strong_mask = np.triu(np.ones((k, k), dtype=bool), k=1) & (np.abs(corr) > 0.7)
+        ii, jj = np.nonzero(strong_mask)
+        vals = np.round(corr[ii, jj], 3)
+        
+        strong_correlations = [
+            {
+                "pair": [numeric_cols[i], numeric_cols[j]],
+                "correlation": v,
+                "strength": "강한 양의 상관" if v > 0 else "강한 음의 상관"
+            }
+            for i, j, v in zip(ii.tolist(), jj.tolist(), vals.tolist())
+        ]
         
         # 히트맵용 데이터 변환
-        matrix_data = []
-        for col in numeric_cols:
-            row_data = {"id": col}
-            for col2 in numeric_cols:
-                row_data[col2] = round(corr_matrix.loc[col, col2], 2)
-            matrix_data.append(row_data)
+        matrix_data = [
+            {"id": col, **dict(zip(numeric_cols, row))}
+            for col, row in zip(numeric_cols, np.round(corr, 2).tolist())
+        ]
         
         insight = ""
         if strong_correlations:
@@ -251,34 +379,40 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
             "insight": insight
         }
     
-    def _create_distribution_viz(self, df: pd.DataFrame) -> Optional[Visualization]:
+    def _create_distribution_viz(
+        self,
+        numeric_cols: List[str],
+        arr: np.ndarray,
+        col_stats: Dict[str, np.ndarray]
+    ) -> Optional[Visualization]:
         """분포 시각화 데이터 생성"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        
         if not numeric_cols:
             return None
         
         # 첫 번째 수치형 컬럼의 분포
         col = numeric_cols[0]
-        data = df[col].dropna()
+        data = arr[:, 0]
+        data = data[~np.isnan(data)]
         
-        # 히스토그램 데이터
+        # 히스토그램 데이터 (구간 라벨은 한 번에 포맷팅)
         hist, bin_edges = np.histogram(data, bins=10)
+        edge_labels = np.char.mod("%.1f", bin_edges)
+        labels = np.char.add(np.char.add(edge_labels[:-1], "-"), edge_labels[1:])
         hist_data = [
-            {"bin": f"{bin_edges[i]:.1f}-{bin_edges[i+1]:.1f}", "count": int(hist[i])}
-            for i in range(len(hist))
+            {"bin": label, "count": count}
+            for label, count in zip(labels.tolist(), hist.tolist())
         ]
         
         return Visualization(
             type="bar",
             title=f"{col} 분포",
             data=hist_data,
-            insight=f"평균: {data.mean():.2f}, 표준편차: {data.std():.2f}"
+            insight=f"평균: {col_stats['mean'][0]:.2f}, 표준편차: {col_stats['std'][0]:.2f}"
         )
     
     def _generate_basic_report(self, profile: Dict, correlation: Optional[Dict]) -> str:
         """기본 분석 리포트 생성"""
-        report = f"""## 📊 데이터 분석 결과
+        parts: List[str] = [f"""## 📊 데이터 분석 결과
 
 ### 데이터 개요
 | 항목 | 값 |
@@ -290,22 +424,21 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
 ### 컬럼 정보
 | 컬럼명 | 타입 | 결측치(%) | 고유값 |
 |:------|:-----|--------:|------:|
-"""
+"""]
         for col in profile['columns'][:10]:
-            report += f"| {col['name']} | {col['dtype']} | {col['missing_pct']}% | {col['unique']} |\n"
+            parts.append(f"| {col['name']} | {col['dtype']} | {col['missing_pct']}% | {col['unique']} |\n")
         
         if profile['data_quality']['warnings']:
-            report += "\n### ⚠️ 데이터 품질 경고\n"
-            for w in profile['data_quality']['warnings']:
-                report += f"- {w}\n"
+            parts.append("\n### ⚠️ 데이터 품질 경고\n")
+            parts.extend(f"- {w}\n" for w in profile['data_quality']['warnings'])
         
         if correlation and correlation['strong_correlations']:
-            report += "\n### 📈 상관관계 분석\n"
+            parts.append("\n### 📈 상관관계 분석\n")
             for c in correlation['strong_correlations'][:5]:
                 emoji = "⬆️" if c['correlation'] > 0 else "⬇️"
-                report += f"- {c['pair'][0]} ↔ {c['pair'][1]}: r={c['correlation']} {emoji}\n"
+                parts.append(f"- {c['pair'][0]} ↔ {c['pair'][1]}: r={c['correlation']} {emoji}\n")
         
-        return report
+        return "".join(parts)
     
     async def perform_ab_test(
         self, 
@@ -315,26 +448,23 @@ CSV 데이터를 분석하고 인사이트를 도출합니다.
         alpha: float = 0.05
     ) -> Dict[str, Any]:
         """A/B 테스트 수행"""
-        groups = df[group_col].unique()
+        # 한 번의 groupby로 그룹별 배열 분할 (등장 순서 유지)
+        grouped = df.groupby(group_col, sort=False, observed=True)[metric_col]
+        arrays = {name: s.dropna().to_numpy(dtype=np.float64) for name, s in grouped}
         
-        if len(groups) != 2:
+        if len(arrays) != 2:
             return {"error": "A/B 테스트에는 정확히 2개 그룹이 필요합니다."}
         
-        group_a = df[df[group_col] == groups[0]][metric_col].dropna()
-        group_b = df[df[group_col] == groups[1]][metric_col].dropna()
-        
-        # t-test
-        t_stat, p_value = stats.ttest_ind(group_a, group_b)
+        (name_a, group_a), (name_b, group_b) = arrays.items()
         
-        # 효과 크기 (Cohen's d)
-        pooled_std = np.sqrt((group_a.std()**2 + group_b.std()**2) / 2)
-        effect_size = (group_b.mean() - group_a.mean()) / pooled_std if pooled_std > 0 else 0
+        # t-test + 효과 크기 (그룹별 평균/분산을 한 번만 계산해 공유)
+        mean_a, mean_b, t_stat, p_value, effect_size = _ttest_core(group_a, group_b)
         
         is_significant = p_value < alpha
         
         return {
-            "group_a": {"name": str(groups[0]), "mean": group_a.mean(), "n": len(group_a)},
-            "group_b": {"name": str(groups[1]), "mean": group_b.mean(), "n": len(group_b)},
+            "group_a": {"name": str(name_a), "mean": mean_a, "n": len(group_a)},
+            "group_b": {"name": str(name_b), "mean": mean_b, "n": len(group_b)},
             "t_statistic": t_stat,
             "p_value": p_value,
             "effect_size": effect_size,
@@ -9,6 +9,32 @@ from ..base import BaseAgent, AgentInput, AgentOutput
 from ..registry import AgentRegistry
 
 
+SYSTEM_PROMPT = """당신은 대한민국 세법 전문가입니다.
+관련 법령을 검색하고 정확한 조문을 인용하여 법적 근거를 제시합니다.
+
+규칙:
+- 항상 법령 근거를 명시 (예: 소득세법 제XX조)
+- 불확실한 내용은 "확인 필요"로 표기
+- 최신 법령 기준으로 답변
+- 판례나 해석 사례가 있으면 함께 인용
+
+출력 형식:
+## 📜 법령 분석
+
+### 관련 법령
+[법령 목록 및 조문 번호]
+
+### 핵심 내용
+[요약 설명]
+
+### 적용 조건
+[조건 및 요건 설명]
+
+### 주의사항
+[주의해야 할 점]
+"""
+
+
 @AgentRegistry.register("law_expert", config={
     "description": "법령 검색 및 해석 전문가",
     "temperature": 0.2,
@@ -33,30 +59,7 @@ class LawExpertAgent(BaseAgent):
         super().__init__(name, description, llm_service, config)
     
     def get_system_prompt(self) -> str:
-        return """당신은 대한민국 세법 전문가입니다.
-관련 법령을 검색하고 정확한 조문을 인용하여 법적 근거를 제시합니다.
-
-규칙:
-- 항상 법령 근거를 명시 (예: 소득세법 제XX조)
-- 불확실한 내용은 "확인 필요"로 표기
-- 최신 법령 기준으로 답변
-- 판례나 해석 사례가 있으면 함께 인용
-
-출력 형식:
-## 📜 법령 분석
-
-### 관련 법령
-[법령 목록 및 조문 번호]
-
-### 핵심 내용
-[요약 설명]
-
-### 적용 조건
-[조건 및 요건 설명]
-
-### 주의사항
-[주의해야 할 점]
-"""
+        return SYSTEM_PROMPT
     
     async def execute(self, input: AgentInput) -> AgentOutput:
         """법령 분석 실행"""
@@ -72,7 +75,7 @@ class LawExpertAgent(BaseAgent):
         previous_context = ""
         if input.previous_results:
             for prev in input.previous_results:
-                previous_context += f"\n[{prev.get('agent_name', 'Unknown')}]: {prev.get('result', '')[:500]}"
+                previous_context += f"\n[{prev.get('agent_name', 'Unknown')}]: {prev.get('result_preview', prev.get('result', ''))[:500]}"
         
         # 사용자 프롬프트 구성
         user_prompt = f"""다음 질문에 대해 관련 법령을 분석해주세요.
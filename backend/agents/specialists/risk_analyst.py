@@ -8,31 +8,7 @@ from ..base import BaseAgent, AgentInput, AgentOutput, Visualization
 from ..registry import AgentRegistry
 
 
-@AgentRegistry.register("risk_analyst", config={
-    "description": "세무조사 리스크 분석 전문가",
-    "temperature": 0.3,
-})
-class RiskAnalystAgent(BaseAgent):
-    """
-    리스크 분석가 에이전트
-    
-    Responsibilities:
-    - 세무 리스크 식별
-    - 위험도 평가
-    - 완화 방안 제안
-    """
-    
-    def __init__(
-        self, 
-        name: str = "risk_analyst",
-        description: str = "세무조사 리스크 분석 전문가",
-        llm_service = None,
-        config: Dict[str, Any] = None
-    ):
-        super().__init__(name, description, llm_service, config)
-    
-    def get_system_prompt(self) -> str:
-        return """당신은 세무조사 리스크 분석 전문가입니다.
+SYSTEM_PROMPT = """당신은 세무조사 리스크 분석 전문가입니다.
 잠재적인 세무 리스크를 식별하고 평가합니다.
 
 규칙:
@@ -58,6 +34,33 @@ class RiskAnalystAgent(BaseAgent):
 ### 완화 방안
 [리스크별 대응 전략]
 """
+
+
+@AgentRegistry.register("risk_analyst", config={
+    "description": "세무조사 리스크 분석 전문가",
+    "temperature": 0.3,
+})
+class RiskAnalystAgent(BaseAgent):
+    """
+    리스크 분석가 에이전트
+    
+    Responsibilities:
+    - 세무 리스크 식별
+    - 위험도 평가
+    - 완화 방안 제안
+    """
+    
+    def __init__(
+        self, 
+        name: str = "risk_analyst",
+        description: str = "세무조사 리스크 분석 전문가",
+        llm_service = None,
+        config: Dict[str, Any] = None
+    ):
+        super().__init__(name, description, llm_service, config)
+    
+    def get_system_prompt(self) -> str:
+        return SYSTEM_PROMPT
     
     async def execute(self, input: AgentInput) -> AgentOutput:
         """리스크 분석 실행"""
@@ -74,7 +77,7 @@ class RiskAnalystAgent(BaseAgent):
         for prev in input.previous_results:
             agent_name = prev.get("agent_name", "")
             if agent_name in ["law_expert", "calculator"]:
-                previous_context += f"\n\n[{agent_name}]:\n{prev.get('result', '')[:800]}"
+                previous_context += f"\n\n[{agent_name}]:\n{prev.get('result_preview', prev.get('result', ''))[:800]}"
         
         user_prompt = f"""다음 상황에 대해 세무 리스크를 분석해주세요.
 
@@ -8,32 +8,7 @@ from ..base import BaseAgent, AgentInput, AgentOutput
 from ..registry import AgentRegistry
 
 
-@AgentRegistry.register("strategist", config={
-    "description": "종합 전략 수립 전문가",
-    "temperature": 0.4,
-})
-class StrategistAgent(BaseAgent):
-    """
-    전략가 에이전트
-    
-    Responsibilities:
-    - 모든 분석 결과 종합
-    - 장단점 비교 평가
-    - 최적 의사결정 제안
-    - 실행 계획 수립
-    """
-    
-    def __init__(
-        self, 
-        name: str = "strategist",
-        description: str = "종합 전략 수립 전문가",
-        llm_service = None,
-        config: Dict[str, Any] = None
-    ):
-        super().__init__(name, description, llm_service, config)
-    
-    def get_system_prompt(self) -> str:
-        return """당신은 세무 전략 전문가입니다.
+SYSTEM_PROMPT = """당신은 세무 전략 전문가입니다.
 다른 전문가들의 분석을 종합하여 최적의 의사결정을 제안합니다.
 
 규칙:
@@ -65,6 +40,34 @@ class StrategistAgent(BaseAgent):
 ### 주의사항
 [실행 시 유의점]
 """
+
+
+@AgentRegistry.register("strategist", config={
+    "description": "종합 전략 수립 전문가",
+    "temperature": 0.4,
+})
+class StrategistAgent(BaseAgent):
+    """
+    전략가 에이전트
+    
+    Responsibilities:
+    - 모든 분석 결과 종합
+    - 장단점 비교 평가
+    - 최적 의사결정 제안
+    - 실행 계획 수립
+    """
+    
+    def __init__(
+        self, 
+        name: str = "strategist",
+        description: str = "종합 전략 수립 전문가",
+        llm_service = None,
+        config: Dict[str, Any] = None
+    ):
+        super().__init__(name, description, llm_service, config)
+    
+    def get_system_prompt(self) -> str:
+        return SYSTEM_PROMPT
     
     async def execute(self, input: AgentInput) -> AgentOutput:
         """전략 수립 실행"""
@@ -81,7 +84,7 @@ class StrategistAgent(BaseAgent):
         for prev in input.previous_results:
             agent_name = prev.get("agent_name", "Unknown")
             confidence = prev.get("confidence", 0)
-            result = prev.get("result", "")
+            result = prev.get("result_preview", prev.get("result", ""))
             previous_analyses.append(f"""
 ### {agent_name} (신뢰도: {confidence:.0%})
 {result[:1500]}
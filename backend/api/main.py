@@ -5,8 +5,10 @@ Multi-Agent Decision Support System API
 """
 import os
 import sys
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Add backend directory to path
@@ -23,20 +25,38 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Multi-Agent Decision System starting...")
     
-    # Import agents to trigger registration
-    from agents.specialists import (
-        LawExpertAgent, 
-        CalculatorAgent, 
-        RiskAnalystAgent, 
-        StrategistAgent,
-        DataAnalystAgent
-    )
+    # 접근 로그 리스너 스레드 (import 시점이 아닌 여기서 시작하여 워커 풀이 물려받지 않도록 함)
+    from api.middleware.logging import start_log_listener
+    start_log_listener()
+    
+    # Register specialist agents (modules load lazily on first use)
     from agents.registry import AgentRegistry
+    if not AgentRegistry.list_agents():
+        import agents.specialists
     print(f"✅ Registered agents: {AgentRegistry.list_agents()}")
     
+    # 이전 프로세스가 디스크로 내보낸 DataFrame 정리 (메모리 색인이 없어 다시 조회되지 않음)
+    from api.routes.analysis import clear_spilled
+    clear_spilled()
+    
+    # LLM 공급자 커넥션 예열 (시작을 막지 않도록 백그라운드 실행)
+    from services.llm_service import warm_http_pool
+    app.state.http_warmup = asyncio.create_task(warm_http_pool())
+    
     yield
     
     # Shutdown
+    from services.llm_service import close_http_clients
+    from api.middleware.logging import stop_log_listener
+    from api.routes.analysis.ab_test import shutdown_bootstrap_pool
+    from api.routes.analysis.code_generator import shutdown_sandbox_pool
+    from api.routes.analysis import shutdown_spill_executor
+    await close_http_clients()
+    shutdown_bootstrap_pool()
+    shutdown_sandbox_pool()
+    shutdown_spill_executor()
+    clear_spilled()
+    stop_log_listener()
     print("👋 Multi-Agent Decision System shutting down...")
 
 
@@ -57,6 +77,7 @@ def create_app() -> FastAPI:
         """,
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # CORS middleware
@@ -1,6 +1,6 @@
 """
 Middleware module initialization
 """
-from .logging import LoggingMiddleware
+from .logging import LoggingMiddleware, start_log_listener, stop_log_listener
 
-__all__ = ["LoggingMiddleware"]
+__all__ = ["LoggingMiddleware", "start_log_listener", "stop_log_listener"]
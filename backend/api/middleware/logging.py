@@ -2,27 +2,66 @@
 Logging Middleware
 """
 import time
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
 
+# 포맷팅과 스트림 출력은 리스너 스레드에서 수행하고 요청 처리 경로는 큐에 넣기만 함
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_queue_handler = QueueHandler(_log_queue)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+_listener = None
+
+# 리스너 시작 전(앱 lifespan 없이 실행 등)에는 스트림에 바로 출력
+logger = logging.getLogger("api.access")
+logger.addHandler(_stream_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+
+def start_log_listener():
+    """백그라운드 리스너 시작 후 접근 로그를 큐로 전달 (앱 시작 시 호출, 이미 실행 중이면 무시)"""
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_log_queue, _stream_handler)
+        _listener.start()
+        logger.removeHandler(_stream_handler)
+        logger.addHandler(_queue_handler)
+
+
+def stop_log_listener():
+    """대기 중인 로그를 출력하고 백그라운드 리스너 종료 (앱 종료 시 호출)"""
+    global _listener
+    if _listener is not None:
+        logger.removeHandler(_queue_handler)
+        logger.addHandler(_stream_handler)
+        _listener.stop()
+        _listener = None
+
+
 class LoggingMiddleware(BaseHTTPMiddleware):
     """Request logging middleware"""
     
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Process request
         response = await call_next(request)
         
         # Calculate duration
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
         # Log request
-        print(
-            f"[{request.method}] {request.url.path} "
-            f"- {response.status_code} "
-            f"- {duration:.3f}s"
+        logger.info(
+            "[%s] %s - %d - %.3fs",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration
         )
         
         return response
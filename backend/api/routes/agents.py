@@ -5,11 +5,16 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from typing import List, Dict, Any, Optional
+import json
+import asyncio
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from agents.registry import AgentRegistry
+from agents.base import AgentInput
+from services.llm_service import get_llm_service
 
 
 router = APIRouter()
@@ -29,11 +34,18 @@ class AgentListResponse(BaseModel):
     total: int
 
 
-@router.get("", response_model=AgentListResponse)
-async def list_agents():
-    """
-    등록된 에이전트 목록 조회
-    """
+class AgentStreamRequest(BaseModel):
+    """단일 에이전트 스트리밍 실행 요청"""
+    query: str = Field(..., min_length=1)
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+# (레지스트리 이름 집합, 응답) - 레지스트리가 바뀌면 다시 생성
+_agent_list_cache: Optional[Tuple[FrozenSet[str], AgentListResponse]] = None
+
+
+def _build_agent_list() -> AgentListResponse:
+    """에이전트 목록 응답 생성"""
     agent_names = AgentRegistry.list_agents()
     agents = []
     
@@ -50,6 +62,19 @@ async def list_agents():
     return AgentListResponse(agents=agents, total=len(agents))
 
 
+@router.get("", response_model=AgentListResponse)
+async def list_agents():
+    """
+    등록된 에이전트 목록 조회
+    """
+    global _agent_list_cache
+    if _agent_list_cache is None or _agent_list_cache[0] is not AgentRegistry.agent_names_frozen():
+        response = _build_agent_list()
+        # 목록 생성 중 지연 모듈이 로드되며 스냅샷이 갱신되므로 생성 후의 스냅샷을 저장
+        _agent_list_cache = (AgentRegistry.agent_names_frozen(), response)
+    return _agent_list_cache[1]
+
+
 @router.get("/{agent_name}")
 async def get_agent(agent_name: str):
     """
@@ -82,3 +107,61 @@ async def get_agent_status(agent_name: str):
         "has_instance": info.get("has_instance", False) if info else False,
         "last_execution": None,  # TODO: Track this
     }
+
+
+@router.post("/{agent_name}/stream")
+async def stream_agent(agent_name: str, request: AgentStreamRequest):
+    """
+    단일 에이전트 실행 결과를 SSE로 스트리밍
+    
+    토큰 스트리밍을 지원하는 에이전트는 생성 즉시 `data: {"token": ...}` 이벤트를,
+    완료 시 `event: done` 이벤트로 최종 AgentOutput을, 실패 시 `event: error` 이벤트를 전송.
+    """
+    if not AgentRegistry.is_registered(agent_name):
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
+    
+    agent = AgentRegistry.get(agent_name, llm_service=get_llm_service())
+    
+    def token_event(token: str) -> str:
+        return f"data: {json.dumps({'token': token}, ensure_ascii=False)}\n\n"
+    
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(agent.execute(AgentInput(
+            query=request.query,
+            context=request.context,
+            token_queue=queue,
+        )))
+        get_token = None
+        try:
+            while True:
+                get_token = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({get_token, task}, return_when=asyncio.FIRST_COMPLETED)
+                
+                if get_token in done:
+                    token = get_token.result()
+                    if token is None:
+                        break
+                    yield token_event(token)
+                    continue
+                
+                # 스트리밍 미지원 에이전트이거나 종료 신호 전에 끝난 경우: 남은 토큰 전송
+                get_token.cancel()
+                while not queue.empty():
+                    token = queue.get_nowait()
+                    if token is not None:
+                        yield token_event(token)
+                break
+            
+            output = await task
+            yield f"event: done\ndata: {output.model_dump_json()}\n\n"
+        except Exception as e:
+            error = json.dumps({"error": str(e), "agent_name": agent_name}, ensure_ascii=False)
+            yield f"event: error\ndata: {error}\n\n"
+        finally:
+            # 클라이언트 연결 종료/오류 시 LLM 호출과 대기 중인 queue.get 정리
+            if get_token is not None:
+                get_token.cancel()
+            task.cancel()
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
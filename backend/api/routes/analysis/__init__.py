@@ -2,30 +2,385 @@
 Analysis Routes - 공통 모듈
 """
 import io
+import os
+import re
+import time
 import uuid
-from typing import Dict, Any, List, Optional
+import asyncio
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from utils.csv_reader import read_csv_bytes
+from utils.logger import get_logger
+
+logger = get_logger("analysis.store")
+
 # 임시 저장소 (프로덕션에서는 DB 사용)
-_uploaded_files: Dict[str, pd.DataFrame] = {}
+# 최근 사용 순서(LRU) + 마지막 접근 시각(TTL)으로 메모리 상주 개수를 제한.
+# TTL이 지난 DataFrame은 삭제하고, 개수 초과로 밀려난 DataFrame은 디스크로 내보냈다가
+# 다시 요청되면 적재 (디스크 파일도 TTL이 지나거나 다시 적재되면 삭제)
+# 디스크 쓰기/삭제는 백그라운드 스레드, 재적재는 get_dataframe_async에서 스레드로 수행
+MAX_IN_MEMORY_FILES = 32
+FILE_TTL_SECONDS = 3600
+SPILL_DIR = Path(__file__).resolve().parents[4] / "storage" / "uploads"
+SPILL_SUFFIXES = (".arrow", ".parquet")
+
+# generate_file_id 형식 (클라이언트가 보낸 ID로 경로를 만들기 전에 검증)
+FILE_ID_PATTERN = re.compile(r"[0-9a-f]{8}")
+
+_uploaded_files: "OrderedDict[str, Tuple[pd.DataFrame, float]]" = OrderedDict()
+_lock = threading.RLock()
+
+# 디스크로 내보내는 중인 DataFrame (file_id → (DataFrame, 토큰)), 쓰기가 끝날 때까지 메모리에서 응답
+_pending_spills: Dict[str, Tuple[pd.DataFrame, object]] = {}
+# 디스크로 내보낸 파일 (file_id → (내보낸 시각, 경로, 메타데이터))
+_spilled: Dict[str, Tuple[float, Path, Dict[str, Any]]] = {}
+
+# 파일별 버전 (store_dataframe마다 증가)과 버전별 계산 결과 캐시
+# (키: (file_id, 계산 이름) → (버전, 결과))
+_versions: Dict[str, int] = {}
+_stats_cache: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+
+# 디스크 내보내기 전용 스레드 (첫 내보내기 시 생성)
+_spill_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _check_file_id(file_id: str):
+    """생성된 ID 형식이 아니면 KeyError (경로 조작 방지)"""
+    if not isinstance(file_id, str) or FILE_ID_PATTERN.fullmatch(file_id) is None:
+        raise KeyError(f"파일을 찾을 수 없습니다: {file_id}")
+
+
+def _spill_path(file_id: str, suffix: str) -> Path:
+    """디스크 파일 경로 (SPILL_DIR 밖으로 벗어나면 KeyError)"""
+    _check_file_id(file_id)
+    spill_dir = SPILL_DIR.resolve()
+    path = (spill_dir / f"{file_id}{suffix}").resolve()
+    if path.parent != spill_dir:
+        raise KeyError(f"파일을 찾을 수 없습니다: {file_id}")
+    return path
+
+
+def _frame_meta(df: pd.DataFrame) -> Dict[str, Any]:
+    """파일 목록용 메타데이터"""
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "column_names": df.columns.tolist(),
+    }
+
+
+def _spill(file_id: str, df: pd.DataFrame) -> Optional[Tuple[Path, Path]]:
+    """
+    DataFrame을 디스크 임시 파일로 내보내기 (lock 없이 호출)
+    
+    Arrow IPC(LZ4) → parquet 순으로 시도.
+    Arrow IPC는 기본 RangeIndex와 문자열 컬럼명만 지원하므로 그 외에는 parquet 사용.
+    둘 다 실패하면 내보내지 않음 (pickle은 적재 시 임의 코드 실행 위험이 있어 사용하지 않음).
+    
+    Returns:
+        (임시 파일 경로, 최종 경로), 실패 시 None
+    """
+    SPILL_DIR.mkdir(parents=True, exist_ok=True)
+    token = uuid.uuid4().hex
+    writers = (
+        (".arrow", lambda path: df.to_feather(path, compression="lz4")),
+        (".parquet", lambda path: df.to_parquet(path)),
+    )
+    for suffix, write in writers:
+        final_path = _spill_path(file_id, suffix)
+        tmp_path = final_path.with_name(f"{file_id}-{token}{suffix}.tmp")
+        try:
+            write(tmp_path)
+            return tmp_path, final_path
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+    
+    logger.warning("DataFrame spill failed, keeping file %s in memory", file_id)
+    return None
+
+
+def _read_spilled(path: Path) -> pd.DataFrame:
+    """디스크로 내보낸 DataFrame 적재"""
+    if path.suffix == ".arrow":
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def _evict(now: float) -> Tuple[List[Tuple[str, pd.DataFrame, float, object]], List[Path]]:
+    """
+    만료 항목은 삭제하고 최대 개수를 초과한 항목은 내보내기 대기로 이동 (lock 보유 상태에서 호출)
+    
+    디스크 I/O는 lock 밖에서 _finish_evictions로 처리.
+    
+    Returns:
+        (내보낼 항목 리스트, 삭제할 디스크 파일 리스트)
+    """
+    to_spill = []
+    while _uploaded_files:
+        file_id, (df, last_access) = next(iter(_uploaded_files.items()))
+        expired = now - last_access >= FILE_TTL_SECONDS
+        if len(_uploaded_files) <= MAX_IN_MEMORY_FILES and not expired:
+            break
+        _uploaded_files.popitem(last=False)
+        _drop_stats(file_id)
+        if expired:
+            _versions.pop(file_id, None)
+        else:
+            token = object()
+            _pending_spills[file_id] = (df, token)
+            to_spill.append((file_id, df, last_access, token))
+    
+    expired_spills = [
+        file_id for file_id, (spilled_at, _, _) in _spilled.items()
+        if now - spilled_at >= FILE_TTL_SECONDS
+    ]
+    stale_paths = [_spilled.pop(file_id)[1] for file_id in expired_spills]
+    for file_id in expired_spills:
+        _versions.pop(file_id, None)
+    return to_spill, stale_paths
+
+
+def _finish_evictions(evictions: Tuple[List[Tuple[str, pd.DataFrame, float, object]], List[Path]]):
+    """_evict 결과의 디스크 쓰기/삭제 수행 (내보내기 스레드에서 lock 없이 실행)"""
+    to_spill, stale_paths = evictions
+    for path in stale_paths:
+        path.unlink(missing_ok=True)
+    
+    for file_id, df, last_access, token in to_spill:
+        written = _spill(file_id, df)
+        with _lock:
+            # 쓰는 동안 다시 조회/교체되지 않았을 때만 디스크 파일로 등록
+            current = _pending_spills.get(file_id)
+            if current is not None and current[1] is token:
+                del _pending_spills[file_id]
+                if written is None:
+                    # 직렬화할 수 없는 DataFrame (혼합 타입 object 컬럼 등)은 TTL까지 메모리에 유지
+                    _promote(file_id, df, last_access)
+                    continue
+                tmp_path, final_path = written
+                try:
+                    os.replace(tmp_path, final_path)
+                except OSError:
+                    logger.warning("DataFrame spill failed, keeping file %s in memory", file_id)
+                    tmp_path.unlink(missing_ok=True)
+                    _promote(file_id, df, last_access)
+                    continue
+                _spilled[file_id] = (time.time(), final_path, _frame_meta(df))
+                continue
+        if written is not None:
+            written[0].unlink(missing_ok=True)
+
+
+def _submit_evictions(evictions: Tuple[List[Tuple[str, pd.DataFrame, float, object]], List[Path]]):
+    """_evict 결과의 디스크 I/O를 내보내기 스레드에 넘김 (요청 처리/이벤트 루프를 막지 않음)"""
+    global _spill_executor
+    to_spill, stale_paths = evictions
+    if not to_spill and not stale_paths:
+        return
+    with _lock:
+        if _spill_executor is None:
+            _spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataframe-spill")
+        _spill_executor.submit(_finish_evictions, evictions)
+
+
+def shutdown_spill_executor():
+    """내보내기 스레드 종료 (진행 중인 쓰기는 완료될 때까지 대기, 앱 종료 시 호출)"""
+    global _spill_executor
+    with _lock:
+        executor, _spill_executor = _spill_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _promote(file_id: str, df: pd.DataFrame, now: float):
+    """메모리 저장소의 최신 항목으로 등록 (lock 보유 상태에서 호출)"""
+    _uploaded_files[file_id] = (df, now)
+    _uploaded_files.move_to_end(file_id)
+
+
+def _drop_stats(file_id: str):
+    """파일의 계산 결과 캐시 제거 (lock 보유 상태에서 호출)"""
+    for key in [key for key in _stats_cache if key[0] == file_id]:
+        del _stats_cache[key]
 
 
 def get_dataframe(file_id: str) -> pd.DataFrame:
     """파일 ID로 DataFrame 조회"""
-    if file_id not in _uploaded_files:
-        raise KeyError(f"파일을 찾을 수 없습니다: {file_id}")
-    return _uploaded_files[file_id]
+    _check_file_id(file_id)
+    now = time.time()
+    with _lock:
+        entry = _uploaded_files.get(file_id)
+        pending = _pending_spills.pop(file_id, None)
+        spilled = _spilled.get(file_id)
+        if entry is not None or pending is not None:
+            df = entry[0] if entry is not None else pending[0]
+            _promote(file_id, df, now)
+            evictions = _evict(now)
+        elif spilled is None:
+            raise KeyError(f"파일을 찾을 수 없습니다: {file_id}")
+    
+    if spilled is not None and entry is None and pending is None:
+        # 디스크 적재는 lock 밖에서 수행
+        try:
+            loaded = _read_spilled(spilled[1])
+        except (OSError, ValueError) as e:
+            raise KeyError(f"파일을 찾을 수 없습니다: {file_id}") from e
+        
+        reloaded_path = None
+        with _lock:
+            entry = _uploaded_files.get(file_id)
+            if entry is not None:
+                # 동시에 적재되었거나 교체된 경우 그 DataFrame 사용
+                df = entry[0]
+            else:
+                df = loaded
+            if _spilled.get(file_id) is spilled:
+                del _spilled[file_id]
+                reloaded_path = spilled[1]
+            _promote(file_id, df, now)
+            evictions = _evict(now)
+        if reloaded_path is not None:
+            reloaded_path.unlink(missing_ok=True)
+    
+    _submit_evictions(evictions)
+    return df
+
+
+async def get_dataframe_async(file_id: str) -> pd.DataFrame:
+    """
+    파일 ID로 DataFrame 조회 (async 핸들러용)
+    
+    메모리에 있으면 바로 반환하고, 디스크에서 다시 적재해야 하면 스레드에서 읽어
+    이벤트 루프를 막지 않음.
+    """
+    with _lock:
+        resident = file_id in _uploaded_files or file_id in _pending_spills
+    if resident:
+        return get_dataframe(file_id)
+    return await asyncio.to_thread(get_dataframe, file_id)
 
 
 def store_dataframe(file_id: str, df: pd.DataFrame):
     """DataFrame 저장"""
-    _uploaded_files[file_id] = df
+    _check_file_id(file_id)
+    now = time.time()
+    with _lock:
+        _promote(file_id, df, now)
+        _versions[file_id] = _versions.get(file_id, 0) + 1
+        _drop_stats(file_id)
+        _pending_spills.pop(file_id, None)
+        replaced = _spilled.pop(file_id, None)
+        evictions = _evict(now)
+    
+    if replaced is not None:
+        replaced[1].unlink(missing_ok=True)
+    _submit_evictions(evictions)
+
+
+def clear_spilled():
+    """디스크로 내보낸 파일 전체 삭제 (앱 시작/종료 시 이전 프로세스의 파일 정리)"""
+    with _lock:
+        for file_id in _spilled:
+            _versions.pop(file_id, None)
+        _spilled.clear()
+    if not SPILL_DIR.exists():
+        return
+    for pattern in (*(f"*{suffix}" for suffix in SPILL_SUFFIXES), "*.tmp", "*.pkl"):
+        for path in SPILL_DIR.glob(pattern):
+            path.unlink(missing_ok=True)
+
+
+def _build_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """LLM 프롬프트용 데이터 요약 (스키마, 결측/고유값 수, 샘플)"""
+    nunique = df.nunique()
+    
+    # 텍스트 컬럼의 고유값 샘플 (수치형 제외)
+    value_samples = {}
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        uniques = df[col].unique()
+        value_samples[col] = (uniques if nunique[col] < 50 else uniques[:10]).tolist()
+    
+    return {
+        "columns": list(df.columns),
+        "dtypes": df.dtypes.astype(str).to_dict(),
+        "shape": df.shape,
+        "sample": df.head(5).to_dict(orient="records"),
+        "null_counts": df.isnull().sum().to_dict(),
+        "unique_counts": nunique.astype(int).to_dict(),
+        "value_samples": value_samples,
+    }
+
+
+def get_cached_stat(file_id: str, name: str, compute: Callable[[pd.DataFrame], Any]) -> Any:
+    """
+    파일별 계산 결과 조회 (같은 버전이면 캐시 재사용, 없으면 compute(df)로 계산)
+    
+    반환값은 캐시와 공유되므로 수정하지 말 것.
+    
+    Args:
+        file_id: 파일 ID
+        name: 계산 이름 (파일 내에서 결과를 구분하는 키)
+        compute: DataFrame을 받아 결과를 계산하는 함수
+    
+    Returns:
+        계산 결과
+    """
+    df = get_dataframe(file_id)
+    key = (file_id, name)
+    with _lock:
+        version = _versions.get(file_id, 0)
+        cached = _stats_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    
+    result = compute(df)
+    with _lock:
+        if _versions.get(file_id, 0) == version:
+            _stats_cache[key] = (version, result)
+    return result
+
+
+def get_summary(file_id: str) -> Dict[str, Any]:
+    """
+    파일 ID로 데이터 요약 조회 (같은 버전이면 캐시 재사용)
+    
+    반환된 dict는 캐시와 공유되므로 수정하지 말 것.
+    """
+    return get_cached_stat(file_id, "summary", _build_summary)
+
+
+def get_datetime_column(file_id: str, column: str) -> pd.Series:
+    """
+    파일 컬럼을 datetime으로 변환한 Series 조회 (같은 버전이면 캐시 재사용)
+    
+    반환된 Series는 캐시와 공유되므로 수정하지 말 것.
+    """
+    return get_cached_stat(file_id, f"datetime:{column}", lambda df: pd.to_datetime(df[column]))
 
 
-def list_stored_files() -> Dict[str, pd.DataFrame]:
-    """저장된 모든 파일 조회"""
-    return _uploaded_files
+def list_stored_files() -> Dict[str, Dict[str, Any]]:
+    """
+    저장된 파일 메타데이터 조회 (디스크로 내보낸 파일 포함, 적재하지 않음)
+    
+    Returns:
+        file_id → {"rows", "columns", "column_names", "in_memory"}
+    """
+    with _lock:
+        files = {
+            file_id: {**meta, "in_memory": False}
+            for file_id, (_, _, meta) in _spilled.items()
+        }
+        for file_id, (df, _) in _pending_spills.items():
+            files[file_id] = {**_frame_meta(df), "in_memory": False}
+        for file_id, (df, _) in _uploaded_files.items():
+            files[file_id] = {**_frame_meta(df), "in_memory": True}
+    return files
 
 
 def generate_file_id() -> str:
@@ -36,6 +391,6 @@ def generate_file_id() -> str:
 def parse_uploaded_file(content: bytes, filename: str) -> pd.DataFrame:
     """업로드된 파일을 DataFrame으로 변환"""
     if filename.endswith('.csv'):
-        return pd.read_csv(io.BytesIO(content))
+        return read_csv_bytes(content)
     else:
         return pd.read_excel(io.BytesIO(content))
@@ -1,14 +1,26 @@
 """
 A/B Testing Module - 고급 A/B 테스트 기능
 """
+import os
 import math
-from typing import Dict, Any, List, Optional
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import numpy as np
+import pandas as pd
 from scipy import stats
 
-from . import get_dataframe
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:  # numba는 선택 의존성 (없으면 NumPy 경로 사용)
+    njit = None
+
+from . import get_dataframe_async
+from utils.process_pool import process_context, random_subset_sums, subset_sums_chunk
 
 router = APIRouter()
 
@@ -43,14 +55,29 @@ class ABTestResponse(BaseModel):
     bootstrap_results: Optional[Dict[str, Any]] = None
 
 
+_STD_NORMAL = NormalDist()
+
+
+@lru_cache(maxsize=64)
+def _z_two_sided(alpha: float) -> float:
+    """양측 검정 임계값 z_(1-α/2)"""
+    return _STD_NORMAL.inv_cdf(1 - alpha/2)
+
+
+@lru_cache(maxsize=1024)
+def _t_ppf(alpha: float, dof: int) -> float:
+    """양측 신뢰구간용 t 임계값 t_(1-α/2, dof)"""
+    return float(stats.t.ppf(1 - alpha/2, dof))
+
+
 def calculate_power(effect_size: float, n: int, alpha: float = 0.05) -> float:
     """검정력 계산"""
     if effect_size == 0 or n <= 1:
         return 0.0
     try:
-        z_alpha = stats.norm.ppf(1 - alpha/2)
+        z_alpha = _z_two_sided(alpha)
         z_power = abs(effect_size) * math.sqrt(n/2) - z_alpha
-        return float(stats.norm.cdf(z_power))
+        return _STD_NORMAL.cdf(z_power)
     except:
         return 0.5
 
@@ -60,44 +87,164 @@ def sample_size_for_power(effect_size: float, power: float = 0.8, alpha: float =
     if effect_size == 0:
         return 1000
     try:
-        z_alpha = stats.norm.ppf(1 - alpha/2)
-        z_power = stats.norm.ppf(power)
+        z_alpha = _z_two_sided(alpha)
+        z_power = _STD_NORMAL.inv_cdf(power)
         n = 2 * ((z_alpha + z_power) / effect_size) ** 2
-        return max(10, int(np.ceil(n)))
+        return max(10, math.ceil(n))
     except:
         return 100
 
 
-def bootstrap_test(group_a, group_b, n_iterations: int = 1000) -> Dict[str, Any]:
-    """부트스트랩 가설 검정"""
-    observed_diff = group_b.mean() - group_a.mean()
-    combined = np.concatenate([group_a.values, group_b.values])
+# 이 반복 수 이상이면 프로세스 풀로 분할 (프로세스 전달 비용 상쇄)
+BOOTSTRAP_PARALLEL_MIN_ITERATIONS = 2000
+BOOTSTRAP_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+
+@lru_cache()
+def _get_bootstrap_pool() -> ProcessPoolExecutor:
+    """부트스트랩용 프로세스 풀 (첫 사용 시 생성, 스레드가 있는 서버에서 fork하지 않도록 forkserver/spawn)"""
+    return ProcessPoolExecutor(max_workers=BOOTSTRAP_WORKERS, mp_context=process_context())
+
+
+def shutdown_bootstrap_pool():
+    """부트스트랩 프로세스 풀 종료 (앱 종료 시 호출, 생성된 적 없으면 무시)"""
+    if _get_bootstrap_pool.cache_info().currsize:
+        _get_bootstrap_pool().shutdown(cancel_futures=True)
+        _get_bootstrap_pool.cache_clear()
+
+
+def _parallel_subset_sums(
+    combined: np.ndarray,
+    m: int,
+    n_iterations: int,
+    seed_seq: np.random.SeedSequence
+) -> np.ndarray:
+    """반복을 워커 수만큼 나누어 프로세스 풀에서 병렬 계산"""
+    workers = BOOTSTRAP_WORKERS
+    shares = [n_iterations // workers + (i < n_iterations % workers) for i in range(workers)]
+    seeds = seed_seq.spawn(workers)
     
-    bootstrap_diffs = []
-    n_a, n_b = len(group_a), len(group_b)
+    pool = _get_bootstrap_pool()
+    futures = [
+        pool.submit(subset_sums_chunk, combined, m, share, seed)
+        for share, seed in zip(shares, seeds) if share
+    ]
+    return np.concatenate([f.result() for f in futures])
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _random_subset_sums_jit(combined, m, n_iterations):
+        """반복마다 크기 m 무작위 부분집합의 합계 (스레드별 부분 Fisher-Yates, 반복당 O(m))"""
+        n = combined.size
+        n_chunks = min(n_iterations, get_num_threads())
+        sums = np.empty(n_iterations)
+        for c in prange(n_chunks):
+            # 스레드별 작업 버퍼 - 임의 순서에서 시작해도 부분 셔플 결과는 균등 부분집합
+            buf = combined.copy()
+            for it in range(c * n_iterations // n_chunks, (c + 1) * n_iterations // n_chunks):
+                total = 0.0
+                for i in range(m):
+                    j = np.random.randint(i, n)
+                    tmp = buf[i]
+                    buf[i] = buf[j]
+                    buf[j] = tmp
+                    total += tmp
+                sums[it] = total
+        return sums
+else:
+    _random_subset_sums_jit = None
+
+
+def bootstrap_test(group_a, group_b, n_iterations: int = 1000, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    부트스트랩 가설 검정 (순열을 행렬로 생성하여 벡터 연산)
+    
+    Args:
+        group_a: 그룹 A 값
+        group_b: 그룹 B 값
+        n_iterations: 재표본 반복 수
+        seed: 난수 시드 (NumPy 경로 재현용, None이면 매번 새 엔트로피)
+    """
+    a = np.asarray(group_a, dtype=np.float64)
+    b = np.asarray(group_b, dtype=np.float64)
+    observed_diff = b.mean() - a.mean()
+    combined = np.concatenate([a, b])
+    
+    # 평균 차이는 공통 이동에 불변 → 중심화 후 float32로 순열 연산 (메모리 대역폭 절반)
+    # 중심화하지 않으면 큰 평균값 대비 작은 차이가 float32 정밀도에 묻힘
+    combined = (combined - combined.mean()).astype(np.float32)
     
-    for _ in range(n_iterations):
-        np.random.shuffle(combined)
-        boot_a = combined[:n_a]
-        boot_b = combined[n_a:n_a+n_b]
-        bootstrap_diffs.append(boot_b.mean() - boot_a.mean())
+    n_a, n_b = len(a), len(b)
+    
+    # 차이는 한쪽 그룹 합계의 선형식: B평균 - A평균 = total/n_b - a_sum*(1/n_a + 1/n_b)
+    # → 더 작은 그룹의 합계만 모으면 됨
+    total = combined.sum(dtype=np.float64)
+    k = 1.0 / n_a + 1.0 / n_b
+    m = min(n_a, n_b)
+    
+    if _random_subset_sums_jit is not None:
+        sums = _random_subset_sums_jit(combined, m, n_iterations)
+    else:
+        # PCG64 스트림 하나에서 출발 - 병렬 시 워커별 독립 하위 스트림으로 분기
+        seed_seq = np.random.SeedSequence(seed)
+        if n_iterations >= BOOTSTRAP_PARALLEL_MIN_ITERATIONS and BOOTSTRAP_WORKERS > 1:
+            sums = _parallel_subset_sums(combined, m, n_iterations, seed_seq)
+        else:
+            sums = random_subset_sums(combined, m, n_iterations, np.random.default_rng(seed_seq))
+    
+    if m == n_a:
+        bootstrap_diffs = total / n_b - sums * k
+    else:
+        bootstrap_diffs = sums * k - total / n_a
     
-    bootstrap_diffs = np.array(bootstrap_diffs)
     p_value = np.mean(np.abs(bootstrap_diffs) >= np.abs(observed_diff))
+    ci_lower, ci_upper = np.percentile(bootstrap_diffs, [2.5, 97.5])
     
     return {
         "p_value": round(float(p_value), 4),
-        "ci_lower": round(float(np.percentile(bootstrap_diffs, 2.5)), 4),
-        "ci_upper": round(float(np.percentile(bootstrap_diffs, 97.5)), 4),
+        "ci_lower": round(float(ci_lower), 4),
+        "ci_upper": round(float(ci_upper), 4),
         "iterations": n_iterations
     }
 
 
+def _t_test(
+    mean_a: float, mean_b: float,
+    var_a: float, var_b: float,
+    n_a: int, n_b: int,
+    welch: bool = False
+) -> Tuple[float, float]:
+    """
+    독립 2표본 t-검정 (양측, scipy.stats.ttest_ind와 동일한 결과)
+    
+    두 그룹의 분산이 모두 0이면 평균이 다를 때 ±inf / p=0, 같을 때 NaN.
+    
+    Returns:
+        (t 통계량, p-value)
+    """
+    se2_a, se2_b = var_a / n_a, var_b / n_b
+    if welch:
+        se = math.sqrt(se2_a + se2_b)
+        dof = (se2_a + se2_b) ** 2 / (se2_a ** 2 / (n_a - 1) + se2_b ** 2 / (n_b - 1)) if se > 0 else np.nan
+    else:
+        dof = n_a + n_b - 2
+        pooled_var = ((n_a - 1) * var_a + (n_b - 1) * var_b) / dof if dof > 0 else np.nan
+        se = math.sqrt(pooled_var * (1 / n_a + 1 / n_b))
+    
+    if se > 0:
+        stat = (mean_a - mean_b) / se
+        return float(stat), float(2 * stats.t.sf(abs(stat), dof))
+    if se == 0 and mean_a != mean_b:
+        return math.copysign(math.inf, mean_a - mean_b), 0.0
+    return np.nan, np.nan
+
+
 @router.post("/analysis/ab-test", response_model=ABTestResponse)
 async def run_ab_test(request: ABTestRequest):
     """고급 A/B 테스트"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -107,7 +254,9 @@ async def run_ab_test(request: ABTestRequest):
     if request.metric_column not in df.columns:
         raise HTTPException(status_code=400, detail=f"지표 컬럼 '{request.metric_column}' 없음")
     
-    all_groups = df[request.group_column].unique().tolist()
+    # 그룹 라벨을 정수 코드로 한 번만 인코딩 (등장 순서 유지, 결측은 -1)
+    codes, uniques = pd.factorize(df[request.group_column], sort=False)
+    all_groups = uniques.tolist()
     
     # 그룹 A/B 값이 지정되었으면 해당 값 사용, 아니면 자동 선택
     if request.group_a_value and request.group_b_value:
@@ -122,33 +271,40 @@ async def run_ab_test(request: ABTestRequest):
             raise HTTPException(status_code=400, detail=f"최소 2개 그룹 필요. 현재: {len(all_groups)}개")
         groups = all_groups[:2]
     
-    group_a = df[df[request.group_column] == groups[0]][request.metric_column].dropna()
-    group_b = df[df[request.group_column] == groups[1]][request.metric_column].dropna()
+    metric = df[request.metric_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    group_a = metric[codes == all_groups.index(groups[0])]
+    group_b = metric[codes == all_groups.index(groups[1])]
+    group_a = group_a[~np.isnan(group_a)]
+    group_b = group_b[~np.isnan(group_b)]
     
     if len(group_a) == 0:
         raise HTTPException(status_code=400, detail=f"그룹 A '{groups[0]}'에 유효한 데이터가 없습니다")
     if len(group_b) == 0:
         raise HTTPException(status_code=400, detail=f"그룹 B '{groups[1]}'에 유효한 데이터가 없습니다")
     
-    # 테스트 타입에 따른 통계 검정
-    if request.test_type == "welch":
-        stat, p_value = stats.ttest_ind(group_a, group_b, equal_var=False)
-    elif request.test_type == "mannwhitney":
+    # 그룹별 기술 통계는 한 번만 계산하여 재사용
+    n_a, n_b = len(group_a), len(group_b)
+    mean_a, mean_b = group_a.mean(), group_b.mean()
+    var_a, var_b = group_a.var(ddof=1), group_b.var(ddof=1)
+    std_a, std_b = np.sqrt(var_a), np.sqrt(var_b)
+    mean_diff = mean_b - mean_a
+    
+    # 테스트 타입에 따른 통계 검정 (t-검정은 위 통계량으로 직접 계산)
+    if request.test_type == "mannwhitney":
         stat, p_value = stats.mannwhitneyu(group_a, group_b, alternative='two-sided')
     else:
-        stat, p_value = stats.ttest_ind(group_a, group_b)
+        stat, p_value = _t_test(mean_a, mean_b, var_a, var_b, n_a, n_b, welch=request.test_type == "welch")
     
     if request.one_tailed:
         p_value = p_value / 2
     
     # Cohen's d
-    pooled_std = np.sqrt((group_a.std()**2 + group_b.std()**2) / 2)
-    effect_size = float((group_b.mean() - group_a.mean()) / pooled_std) if pooled_std > 0 else 0
+    pooled_std = np.sqrt((var_a + var_b) / 2)
+    effect_size = float(mean_diff / pooled_std) if pooled_std > 0 else 0
     
     # 신뢰구간
-    mean_diff = group_b.mean() - group_a.mean()
-    se_diff = np.sqrt(group_a.var()/len(group_a) + group_b.var()/len(group_b))
-    ci_margin = stats.t.ppf(1 - request.alpha/2, len(group_a) + len(group_b) - 2) * se_diff
+    se_diff = np.sqrt(var_a/n_a + var_b/n_b)
+    ci_margin = _t_ppf(request.alpha, n_a + n_b - 2) * se_diff
     
     confidence_interval = {
         "lower": round(float(mean_diff - ci_margin), 4),
@@ -156,24 +312,27 @@ async def run_ab_test(request: ABTestRequest):
         "mean_diff": round(float(mean_diff), 4)
     }
     
-    n = min(len(group_a), len(group_b))
+    n = min(n_a, n_b)
     power = calculate_power(effect_size, n, request.alpha)
     sample_rec = sample_size_for_power(effect_size, 0.8, request.alpha)
     
     # 분포 데이터
-    dist_data = []
-    for val in group_a.values[:100]:
-        dist_data.append({"group": str(groups[0]), "value": float(val)})
-    for val in group_b.values[:100]:
-        dist_data.append({"group": str(groups[1]), "value": float(val)})
+    name_a, name_b = str(groups[0]), str(groups[1])
+    dist_data = (
+        [{"group": name_a, "value": v} for v in group_a[:100].tolist()]
+        + [{"group": name_b, "value": v} for v in group_b[:100].tolist()]
+    )
     
     # 부트스트랩
     bootstrap_results = None
     if request.bootstrap_iterations > 0:
-        bootstrap_results = bootstrap_test(group_a, group_b, request.bootstrap_iterations)
+        # 재표본 계산과 프로세스 풀 대기가 이벤트 루프를 막지 않도록 스레드에서 실행
+        bootstrap_results = await asyncio.to_thread(
+            bootstrap_test, group_a, group_b, request.bootstrap_iterations
+        )
     
     is_significant = p_value < request.alpha
-    diff_pct = (group_b.mean() - group_a.mean()) / group_a.mean() * 100 if group_a.mean() != 0 else 0
+    diff_pct = mean_diff / mean_a * 100 if mean_a != 0 else 0
     
     conclusion = f"{'✅ 통계적으로 유의' if is_significant else '⚠️ 유의하지 않음'} (p={p_value:.4f}, α={request.alpha}). "
     conclusion += f"차이: {diff_pct:+.2f}%. 효과크기(Cohen's d): {effect_size:.3f} "
@@ -182,18 +341,18 @@ async def run_ab_test(request: ABTestRequest):
     
     return ABTestResponse(
         group_a={
-            "name": str(groups[0]), 
-            "mean": round(float(group_a.mean()), 4), 
-            "std": round(float(group_a.std()), 4),
-            "median": round(float(group_a.median()), 4),
-            "n": len(group_a)
+            "name": name_a, 
+            "mean": round(float(mean_a), 4), 
+            "std": round(float(std_a), 4),
+            "median": round(float(np.median(group_a)), 4),
+            "n": n_a
         },
         group_b={
-            "name": str(groups[1]), 
-            "mean": round(float(group_b.mean()), 4), 
-            "std": round(float(group_b.std()), 4),
-            "median": round(float(group_b.median()), 4),
-            "n": len(group_b)
+            "name": name_b, 
+            "mean": round(float(mean_b), 4), 
+            "std": round(float(std_b), 4),
+            "median": round(float(np.median(group_b)), 4),
+            "n": n_b
         },
         test_type=request.test_type,
         statistic=round(float(stat), 4),
@@ -7,10 +7,16 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 from scipy import stats
-from . import get_dataframe
+from . import get_dataframe_async
 
 router = APIRouter()
 
+# 이 행 수를 넘으면 메모리 사용량을 표본으로 추정 (문자열 컬럼의 deep 측정 비용 절감)
+MEMORY_SAMPLE_THRESHOLD = 50_000
+MEMORY_SAMPLE_ROWS = 5_000
+# 이 행 수를 넘으면 상관계수를 표본 행으로 추정 (|r| 구간 분류에는 충분한 정확도)
+CORR_SAMPLE_ROWS = 20_000
+
 class InsightRequest(BaseModel):
     file_id: str
     analysis_type: str = "comprehensive"
@@ -21,17 +27,21 @@ class InsightRequest(BaseModel):
 async def generate_ai_insights(request: InsightRequest):
     """상세 AI 인사이트 리포트 생성"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
+    # 컬럼 타입 분류는 한 번만 수행하여 모든 분석 단계에 전달
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    
     # 상세 분석 수행
-    data_summary = _generate_detailed_summary(df)
-    statistical_analysis = _run_statistical_analysis(df)
+    data_summary = _generate_detailed_summary(df, numeric_cols, cat_cols)
+    statistical_analysis = _run_statistical_analysis(df, numeric_cols)
     quality_report = _assess_data_quality(df)
-    insights = _generate_detailed_insights(df, statistical_analysis)
-    recommendations = _generate_actionable_recommendations(df, statistical_analysis)
-    executive_summary = _generate_executive_summary(df, statistical_analysis, insights)
+    insights = _generate_detailed_insights(df, statistical_analysis, numeric_cols)
+    recommendations = _generate_actionable_recommendations(df, statistical_analysis, numeric_cols, cat_cols)
+    executive_summary = _generate_executive_summary(df, statistical_analysis, insights, numeric_cols, cat_cols)
     
     return {
         "file_id": request.file_id,
@@ -42,15 +52,13 @@ async def generate_ai_insights(request: InsightRequest):
         "key_insights": insights,
         "recommendations": recommendations,
         "risk_alerts": _identify_detailed_risks(df, statistical_analysis),
-        "opportunities": _identify_opportunities(df, statistical_analysis),
-        "next_steps": _suggest_next_steps(df, statistical_analysis)
+        "opportunities": _identify_opportunities(df, statistical_analysis, cat_cols),
+        "next_steps": _suggest_next_steps(df, statistical_analysis, numeric_cols, cat_cols)
     }
 
 
-def _generate_detailed_summary(df: pd.DataFrame) -> Dict:
+def _generate_detailed_summary(df: pd.DataFrame, numeric_cols: List[str], cat_cols: List[str]) -> Dict:
     """상세 데이터 요약"""
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
     
     # 수치형 컬럼 통계
     numeric_stats = []
@@ -70,7 +78,7 @@ def _generate_detailed_summary(df: pd.DataFrame) -> Dict:
     
     # 범주형 컬럼 분포
     categorical_stats = []
-    for col in categorical_cols[:5]:
+    for col in cat_cols[:5]:
         vc = df[col].value_counts()
         categorical_stats.append({
             "column": col,
@@ -84,67 +92,97 @@ def _generate_detailed_summary(df: pd.DataFrame) -> Dict:
         "total_rows": len(df),
         "total_columns": len(df.columns),
         "numeric_columns": len(numeric_cols),
-        "categorical_columns": len(categorical_cols),
+        "categorical_columns": len(cat_cols),
         "date_range": None,  # TODO: 날짜 컬럼 감지
         "missing_rate": round(df.isna().mean().mean() * 100, 2),
         "duplicate_rows": int(df.duplicated().sum()),
-        "memory_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2),
+        "memory_mb": round(_estimate_memory_mb(df), 2),
         "numeric_stats": numeric_stats,
         "categorical_stats": categorical_stats
     }
 
 
-def _run_statistical_analysis(df: pd.DataFrame) -> Dict:
+def _estimate_memory_mb(df: pd.DataFrame) -> float:
+    """
+    DataFrame 메모리 사용량(MB)
+    
+    대용량 데이터는 표본 행의 deep 측정값을 전체 행 수로 환산한 근사치
+    """
+    n = len(df)
+    if n > MEMORY_SAMPLE_THRESHOLD:
+        sample_bytes = df.sample(MEMORY_SAMPLE_ROWS, random_state=0).memory_usage(deep=True).sum()
+        return sample_bytes * n / MEMORY_SAMPLE_ROWS / 1024 / 1024
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def _run_statistical_analysis(df: pd.DataFrame, numeric_cols: List[str]) -> Dict:
     """고급 통계 분석"""
     results = {"correlations": [], "distributions": [], "outliers": [], "trends": []}
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     
     # 상관관계 분석
     if len(numeric_cols) >= 2:
-        corr_matrix = df[numeric_cols[:15]].corr()
-        for i, c1 in enumerate(numeric_cols[:15]):
-            for j, c2 in enumerate(numeric_cols[:15]):
-                if i < j:
-                    val = corr_matrix.loc[c1, c2]
-                    if abs(val) > 0.5:
-                        relationship = "강한 양의 상관" if val > 0.7 else "양의 상관" if val > 0.5 else "강한 음의 상관" if val < -0.7 else "음의 상관"
-                        results['correlations'].append({
-                            'var1': c1, 'var2': c2, 
-                            'correlation': round(float(val), 3),
-                            'relationship': relationship,
-                            'interpretation': f"{c1}이(가) 증가하면 {c2}도 {'증가' if val > 0 else '감소'}하는 경향 (r={val:.3f})"
-                        })
-    
-    # 분포 분석
-    for col in numeric_cols[:5]:
-        data = df[col].dropna()
-        if len(data) > 10:
-            skew = float(data.skew())
-            kurt = float(data.kurtosis())
-            dist_type = "정규분포" if abs(skew) < 0.5 and abs(kurt) < 1 else "왼쪽 치우침" if skew < -0.5 else "오른쪽 치우침" if skew > 0.5 else "비정규"
-            results['distributions'].append({
-                'column': col,
-                'distribution_type': dist_type,
-                'skewness': round(skew, 3),
-                'kurtosis': round(kurt, 3),
-                'interpretation': f"{col}은 {dist_type} 형태. {'변환 권장' if abs(skew) > 1 else '분석에 적합'}"
+        cols = numeric_cols[:15]
+        corr_df = df[cols]
+        if len(corr_df) > CORR_SAMPLE_ROWS:
+            corr_df = corr_df.sample(CORR_SAMPLE_ROWS, random_state=0)
+        corr = corr_df.corr().to_numpy()
+        # 상삼각 쌍을 한 번에 추출하고 |r| > 0.5인 쌍만 순회
+        iu, ju = np.triu_indices(len(cols), k=1)
+        vals = corr[iu, ju]
+        mask = np.abs(vals) > 0.5
+        for i, j, val in zip(iu[mask].tolist(), ju[mask].tolist(), vals[mask].tolist()):
+            c1, c2 = cols[i], cols[j]
+            relationship = "강한 양의 상관" if val > 0.7 else "양의 상관" if val > 0.5 else "강한 음의 상관" if val < -0.7 else "음의 상관"
+            results['correlations'].append({
+                'var1': c1, 'var2': c2, 
+                'correlation': round(val, 3),
+                'relationship': relationship,
+                'interpretation': f"{c1}이(가) 증가하면 {c2}도 {'증가' if val > 0 else '감소'}하는 경향 (r={val:.3f})"
             })
     
-    # 이상치 탐지 (IQR 방법)
-    for col in numeric_cols[:5]:
-        data = df[col].dropna()
-        if len(data) > 10:
-            Q1, Q3 = data.quantile(0.25), data.quantile(0.75)
-            IQR = Q3 - Q1
-            outlier_count = int(((data < Q1 - 1.5*IQR) | (data > Q3 + 1.5*IQR)).sum())
-            if outlier_count > 0:
+    # 분포 분석 (왜도/첨도를 컬럼 전체에 대해 한 번에 계산)
+    dist_cols = numeric_cols[:5]
+    if dist_cols:
+        sub = df[dist_cols]
+        dist = pd.DataFrame({
+            'column': dist_cols,
+            'skewness': sub.skew().to_numpy(),
+            'kurtosis': sub.kurtosis().to_numpy(),
+        })
+        dist = dist[sub.count().to_numpy() > 10]
+        skew, kurt = dist['skewness'], dist['kurtosis']
+        dist['distribution_type'] = np.select(
+            [(skew.abs() < 0.5) & (kurt.abs() < 1), skew < -0.5, skew > 0.5],
+            ["정규분포", "왼쪽 치우침", "오른쪽 치우침"],
+            default="비정규"
+        )
+        advice = pd.Series(np.where(skew.abs() > 1, '변환 권장', '분석에 적합'), index=dist.index)
+        dist['interpretation'] = dist['column'].astype(str) + "은 " + dist['distribution_type'] + " 형태. " + advice
+        dist[['skewness', 'kurtosis']] = dist[['skewness', 'kurtosis']].round(3)
+        results['distributions'] = dist[
+            ['column', 'distribution_type', 'skewness', 'kurtosis', 'interpretation']
+        ].to_dict(orient='records')
+    
+    # 이상치 탐지 (IQR 방법, 사분위수와 경계 비교를 컬럼 전체에 대해 한 번에 계산)
+    if dist_cols:
+        q = sub.quantile([0.25, 0.75])
+        Q1, Q3 = q.iloc[0].to_numpy(), q.iloc[1].to_numpy()
+        IQR = Q3 - Q1
+        lb, ub = Q1 - 1.5*IQR, Q3 + 1.5*IQR
+        arr = sub.to_numpy(dtype=np.float64, na_value=np.nan)
+        outlier_counts = ((arr < lb) | (arr > ub)).sum(axis=0).tolist()
+        valid_counts = sub.count().tolist()
+        
+        for i, col in enumerate(dist_cols):
+            n_valid, outlier_count = valid_counts[i], outlier_counts[i]
+            if n_valid > 10 and outlier_count > 0:
                 results['outliers'].append({
                     'column': col,
                     'outlier_count': outlier_count,
-                    'outlier_percentage': round(outlier_count / len(data) * 100, 2),
-                    'lower_bound': round(float(Q1 - 1.5*IQR), 2),
-                    'upper_bound': round(float(Q3 + 1.5*IQR), 2),
-                    'interpretation': f"{col}에서 {outlier_count}개 이상치 발견 ({outlier_count/len(data)*100:.1f}%)"
+                    'outlier_percentage': round(outlier_count / n_valid * 100, 2),
+                    'lower_bound': round(float(lb[i]), 2),
+                    'upper_bound': round(float(ub[i]), 2),
+                    'interpretation': f"{col}에서 {outlier_count}개 이상치 발견 ({outlier_count/n_valid*100:.1f}%)"
                 })
     
     return results
@@ -155,8 +193,9 @@ def _assess_data_quality(df: pd.DataFrame) -> Dict:
     issues = []
     score = 100
     
-    # 결측치 평가
-    missing_pct = df.isna().mean().mean() * 100
+    # 결측치 평가 (isna 마스크 한 번으로 전체 비율과 영향 컬럼 모두 계산)
+    na_col_sums = df.isna().sum()
+    missing_pct = na_col_sums.sum() / max(df.size, 1) * 100
     if missing_pct > 0:
         score -= min(missing_pct * 2, 30)
         severity = "critical" if missing_pct > 20 else "high" if missing_pct > 10 else "medium" if missing_pct > 5 else "low"
@@ -165,33 +204,34 @@ def _assess_data_quality(df: pd.DataFrame) -> Dict:
             "severity": severity,
             "metric": f"{missing_pct:.1f}%",
             "description": f"전체 데이터의 {missing_pct:.1f}%가 결측치입니다.",
-            "affected_columns": [col for col in df.columns if df[col].isna().sum() > 0][:5],
+            "affected_columns": na_col_sums.index[na_col_sums > 0][:5].tolist(),
             "recommendation": "결측치 처리 필요 (삭제, 대체, 보간 등)"
         })
     
     # 중복 평가
-    dup_pct = df.duplicated().sum() / len(df) * 100
+    dup_count = int(df.duplicated().sum())
+    dup_pct = dup_count / len(df) * 100 if len(df) else 0
     if dup_pct > 0:
         score -= min(dup_pct * 1.5, 20)
         issues.append({
             "type": "duplicates",
             "severity": "high" if dup_pct > 10 else "medium" if dup_pct > 5 else "low",
             "metric": f"{dup_pct:.1f}%",
-            "description": f"{int(df.duplicated().sum())}개의 중복 행 ({dup_pct:.1f}%)",
+            "description": f"{dup_count}개의 중복 행 ({dup_pct:.1f}%)",
             "recommendation": "중복 제거 여부 검토"
         })
     
-    # 단일값 컬럼
-    for col in df.columns:
-        if df[col].nunique() == 1:
-            score -= 5
-            issues.append({
-                "type": "constant_column",
-                "severity": "low",
-                "metric": col,
-                "description": f"'{col}' 컬럼은 단일 값만 포함 (분석 의미 없음)",
-                "recommendation": "해당 컬럼 제거 고려"
-            })
+    # 단일값 컬럼 (모든 컬럼의 고유값 수를 한 번에 계산)
+    nuniq = df.nunique()
+    for col in nuniq.index[nuniq == 1].tolist():
+        score -= 5
+        issues.append({
+            "type": "constant_column",
+            "severity": "low",
+            "metric": col,
+            "description": f"'{col}' 컬럼은 단일 값만 포함 (분석 의미 없음)",
+            "recommendation": "해당 컬럼 제거 고려"
+        })
     
     return {
         "quality_score": max(0, round(score)),
@@ -201,10 +241,19 @@ def _assess_data_quality(df: pd.DataFrame) -> Dict:
     }
 
 
-def _generate_detailed_insights(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
+def _generate_detailed_insights(df: pd.DataFrame, analysis: Dict, numeric_cols: List[str]) -> List[Dict]:
     """상세 인사이트 생성"""
     insights = []
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    
+    # 같은 컬럼의 히스토그램은 한 번만 계산 (분포/상위 컬럼 인사이트에서 공유)
+    hist_cache: Dict[str, List[Dict]] = {}
+    
+    def _hist(col: str) -> List[Dict]:
+        if col not in hist_cache:
+            counts, bin_edges = np.histogram(df[col].dropna(), bins=15)
+            bin_strs = np.round(bin_edges[:-1], 1).astype(str).tolist()
+            hist_cache[col] = [{"bin": b, "count": c} for b, c in zip(bin_strs, counts.tolist())]
+        return hist_cache[col]
     
     # 상관관계 인사이트 (Scatter Plot Data)
     for corr in analysis.get('correlations', [])[:5]:
@@ -238,9 +287,7 @@ def _generate_detailed_insights(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
         if dist['distribution_type'] != "정규분포":
             # 히스토그램 생성 (15 bins)
             try:
-                data = df[dist['column']].dropna()
-                counts, bin_edges = np.histogram(data, bins=15)
-                hist_data = [{"bin": str(round(bin_edges[i], 1)), "count": int(c)} for i, c in enumerate(counts)]
+                hist_data = _hist(dist['column'])
             except:
                 hist_data = []
 
@@ -290,8 +337,7 @@ def _generate_detailed_insights(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
             data = df[col].dropna()
             if len(data) > 0:
                 try:
-                    counts, bin_edges = np.histogram(data, bins=15)
-                    hist_data = [{"bin": str(round(bin_edges[i], 1)), "count": int(c)} for i, c in enumerate(counts)]
+                    hist_data = _hist(col)
                 except:
                     hist_data = []
 
@@ -316,11 +362,14 @@ def _generate_detailed_insights(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
     return insights
 
 
-def _generate_actionable_recommendations(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
+def _generate_actionable_recommendations(
+    df: pd.DataFrame,
+    analysis: Dict,
+    numeric_cols: List[str],
+    cat_cols: List[str]
+) -> List[Dict]:
     """실행 가능한 추천사항"""
     recommendations = []
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
     
     # 상관관계 기반 추천
     if analysis.get('correlations'):
@@ -441,7 +490,7 @@ def _identify_detailed_risks(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
     return risks
 
 
-def _identify_opportunities(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
+def _identify_opportunities(df: pd.DataFrame, analysis: Dict, cat_cols: List[str]) -> List[Dict]:
     """기회 요소 식별"""
     opportunities = []
     
@@ -456,7 +505,6 @@ def _identify_opportunities(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
                 "potential_impact": "높은 예측 정확도 달성 가능"
             })
     
-    cat_cols = df.select_dtypes(exclude=[np.number]).columns
     for col in cat_cols:
         if 2 <= df[col].nunique() <= 10:
             opportunities.append({
@@ -471,19 +519,22 @@ def _identify_opportunities(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
     return opportunities
 
 
-def _suggest_next_steps(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
+def _suggest_next_steps(
+    df: pd.DataFrame,
+    analysis: Dict,
+    numeric_cols: List[str],
+    cat_cols: List[str]
+) -> List[Dict]:
     """다음 단계 제안"""
     steps = []
-    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
-    num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     
-    if cat_cols and num_cols:
+    if cat_cols and numeric_cols:
         binary = [c for c in cat_cols if df[c].nunique() == 2]
         if binary:
             steps.append({
                 "step": 1,
                 "action": "A/B 테스트 실행",
-                "detail": f"'{binary[0]}' 그룹별 '{num_cols[0]}' 비교",
+                "detail": f"'{binary[0]}' 그룹별 '{numeric_cols[0]}' 비교",
                 "icon": "🧪"
             })
     
@@ -494,11 +545,14 @@ def _suggest_next_steps(df: pd.DataFrame, analysis: Dict) -> List[Dict]:
     return steps
 
 
-def _generate_executive_summary(df: pd.DataFrame, analysis: Dict, insights: List[Dict]) -> str:
+def _generate_executive_summary(
+    df: pd.DataFrame,
+    analysis: Dict,
+    insights: List[Dict],
+    numeric_cols: List[str],
+    cat_cols: List[str]
+) -> str:
     """경영진용 요약 리포트"""
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
-    
     summary_parts = []
     
     # 데이터 규모
@@ -7,11 +7,16 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 import json
-from . import get_dataframe
-from services.llm_service import get_llm_service
+from . import get_dataframe_async, get_summary
+from services.llm_service import get_llm_service, get_usage_stats
+from services.llm_cache import get_llm_cache, fingerprint, make_cache_key
+from utils.llm_summary import summarize_for_llm
 
 router = APIRouter()
 
+# 진단 프롬프트에 넣는 데이터 요약의 토큰 상한
+DIAGNOSIS_TOKEN_BUDGET = 800
+
 class AIDiagnosisRequest(BaseModel):
     file_id: str
 
@@ -27,37 +32,8 @@ class AIDiagnosisResponse(BaseModel):
     issues: List[DiagnosisIssue]
     total_issues: int
 
-@router.post("/analysis/ai-preprocess/diagnose", response_model=AIDiagnosisResponse)
-async def diagnose_data_with_ai(request: AIDiagnosisRequest):
-    """
-    LLM을 사용하여 데이터의 품질 문제(의미적 불일치, 이상치, PII 등)를 진단합니다.
-    """
-    try:
-        df = get_dataframe(request.file_id)
-    except KeyError:
-        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
-
-    # 1. 데이터 요약 생성
-    summary = {
-        "columns": list(df.columns),
-        "dtypes": {col: str(df[col].dtype) for col in df.columns},
-        "shape": df.shape,
-        "sample": df.head(5).to_dict(orient="records"),
-        "null_counts": df.isnull().sum().to_dict(),
-        "unique_counts": {col: int(df[col].nunique()) for col in df.columns},
-    }
-    
-    # 텍스트 컬럼의 고유값 샘플 (수치형 제외)
-    object_cols = df.select_dtypes(include=['object', 'string']).columns
-    summary["value_samples"] = {}
-    for col in object_cols:
-        if df[col].nunique() < 50:
-            summary["value_samples"][col] = df[col].unique().tolist()
-        else:
-            summary["value_samples"][col] = df[col].unique()[:10].tolist()
 
-    # 2. LLM 프롬프트 구성
-    system_prompt = """
+SYSTEM_PROMPT = """
     You are a Data Quality Expert AI. Your goal is to diagnose data quality issues based on the provided dataset summary.
     Focus on 'semantic' issues that valid code might miss, such as:
     1. Standardization: Same meaning but different text (e.g., 'USA', 'U.S.A', 'United States').
@@ -76,16 +52,38 @@ async def diagnose_data_with_ai(request: AIDiagnosisRequest):
     If no significant issues are found, return empty list in 'issues'.
     Response must be ONLY JSON. No markdown fencing.
     """
-    
+
+
+@router.post("/analysis/ai-preprocess/diagnose", response_model=AIDiagnosisResponse)
+async def diagnose_data_with_ai(request: AIDiagnosisRequest):
+    """
+    LLM을 사용하여 데이터의 품질 문제(의미적 불일치, 이상치, PII 등)를 진단합니다.
+    """
+    # 1. 데이터 요약 조회 (파일 버전별 캐시)
+    try:
+        # 디스크로 내보낸 파일은 이벤트 루프 밖에서 먼저 적재
+        await get_dataframe_async(request.file_id)
+        summary = get_summary(request.file_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+
+    # 2. LLM 프롬프트 구성 (정적 지시문을 앞에, 요청별 요약 JSON을 뒤에 배치)
     user_message = f"""
     Analyze this dataset summary and find data quality issues:
-    {json.dumps(summary, default=str, ensure_ascii=False)[:3000]}  # Limit token usage
+    {summarize_for_llm(summary, token_budget=DIAGNOSIS_TOKEN_BUDGET)}
     """
 
     # 3. LLM 호출
     llm = get_llm_service()
+    cache = get_llm_cache()
+    cache_key = make_cache_key((SYSTEM_PROMPT, user_message, fingerprint(summary)))
     try:
-        response_text = await llm.chat(system_prompt, user_message)
+        # 같은 데이터 요약에 대한 재진단은 캐시된 응답 재사용
+        cached_text = await cache.get_async(cache_key)
+        if cached_text is not None:
+            response_text = cached_text
+        else:
+            response_text = await llm.chat(SYSTEM_PROMPT, user_message, label="ai_diagnosis")
         
         # JSON 파싱 (마크다운 제거)
         cleaned_text = response_text.replace("```json", "").replace("```", "").strip()
@@ -93,12 +91,17 @@ async def diagnose_data_with_ai(request: AIDiagnosisRequest):
         
         issues = result.get("issues", [])
         
-        return AIDiagnosisResponse(
+        response = AIDiagnosisResponse(
             file_id=request.file_id,
             issues=issues,
             total_issues=len(issues)
         )
         
+        # 파싱/검증을 통과한 응답만 캐시 (잘리거나 형식이 틀린 응답이 TTL 동안 재사용되지 않도록)
+        if cached_text is None:
+            await cache.set_async(cache_key, response_text, metadata={"route": "ai_diagnosis", "file_id": request.file_id})
+        return response
+        
     except Exception as e:
         print(f"AI Diagnosis Error: {e}")
         # 실패 시 빈 결과 반환보다는 에러를 알리는 이슈 하나 추가
@@ -113,3 +116,13 @@ async def diagnose_data_with_ai(request: AIDiagnosisRequest):
             }],
             total_issues=1
         )
+
+
+@router.get("/analysis/ai-preprocess/metrics")
+async def get_llm_cache_metrics():
+    """
+    AI 전처리 LLM 호출의 공급자 prefix 캐시 적중률을 조회합니다.
+    
+    적중률이 낮으면 가변 데이터가 정적 프롬프트 앞쪽에 섞여 있는지 점검.
+    """
+    return {"endpoints": get_usage_stats()}
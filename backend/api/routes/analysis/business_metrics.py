@@ -7,7 +7,12 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 
-from . import get_dataframe
+from . import get_dataframe_async, get_datetime_column
+
+try:
+    from numba import njit
+except ImportError:  # numba는 선택 의존성 - 없으면 NumPy 경로 사용
+    njit = None
 
 router = APIRouter()
 
@@ -29,7 +34,7 @@ class BusinessMetricsRequest(BaseModel):
 async def calculate_business_metrics(request: BusinessMetricsRequest):
     """2025 실무 비즈니스 KPI 계산"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -69,10 +74,10 @@ def _calculate_ltv(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     
     churn_rate = 0.1
     if req.date_column and req.date_column in df.columns:
-        df_sorted = df.sort_values(req.date_column)
-        first_period = df_sorted.groupby(req.user_column)[req.date_column].min()
-        last_period = df_sorted.groupby(req.user_column)[req.date_column].max()
-        active_months = ((pd.to_datetime(last_period) - pd.to_datetime(first_period)).dt.days / 30).mean()
+        # min/max는 순서와 무관하므로 정렬 없이 유저별 첫/마지막 날짜를 한 번에 집계
+        dates = get_datetime_column(req.file_id, req.date_column)
+        bounds = dates.groupby(df[req.user_column]).agg(['min', 'max'])
+        active_months = ((bounds['max'] - bounds['min']).dt.days / 30).mean()
         if active_months > 0:
             churn_rate = 1 / max(active_months, 1)
     
@@ -121,15 +126,16 @@ def _calculate_arpu(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     
     segment_arpu = []
     if req.group_column and req.group_column in df.columns:
-        for group in df[req.group_column].unique()[:10]:
-            subset = df[df[req.group_column] == group]
-            g_revenue = subset[req.revenue_column].sum()
-            g_users = subset[req.user_column].nunique()
-            segment_arpu.append({
-                "segment": str(group),
-                "arpu": round(g_revenue / max(g_users, 1), 2),
-                "users": int(g_users)
-            })
+        # 그룹별 매출 합계/유저 수를 한 번의 groupby로 집계 (등장 순서 상위 10개)
+        agg = df.groupby(req.group_column, sort=False, dropna=False).agg(
+            revenue=(req.revenue_column, 'sum'),
+            users=(req.user_column, 'nunique')
+        ).head(10)
+        agg['arpu'] = agg['revenue'] / agg['users'].clip(lower=1)
+        segment_arpu = [
+            {"segment": str(group), "arpu": round(arpu, 2), "users": users}
+            for group, arpu, users in zip(agg.index, agg['arpu'].tolist(), agg['users'].tolist())
+        ]
     
     return {
         "metric": "ARPU",
@@ -142,26 +148,87 @@ def _calculate_arpu(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     }
 
 
+def _period_user_pairs(period: pd.Series, users: pd.Series):
+    """
+    (기간 코드, 유저 코드) 고유 쌍을 기간 → 유저 순으로 정렬하여 반환
+    
+    기간 코드는 관측된 기간의 정렬 순위이므로 코드 k+1이 k의 다음 기간.
+    """
+    period_codes, periods = pd.factorize(period, sort=True)
+    user_codes, user_uniques = pd.factorize(users, use_na_sentinel=False)
+    n_users = max(len(user_uniques), 1)
+    
+    valid = period_codes >= 0
+    keys = np.unique(period_codes[valid].astype(np.int64) * n_users + user_codes[valid])
+    return keys // n_users, keys % n_users, periods
+
+
+def _churn_counts(period_codes: np.ndarray, user_codes: np.ndarray, n_periods: int):
+    """
+    기간별 유저 수와 다음 기간 잔존 유저 수 (NumPy 경로)
+    
+    정렬된 쌍 키 (기간 × U + 유저)에서 다음 기간의 같은 유저 키(+U)를 searchsorted로 한 번에 조회.
+    """
+    n_users = int(user_codes.max()) + 1 if len(user_codes) else 1
+    keys = period_codes * n_users + user_codes
+    next_keys = keys + n_users
+    pos = np.searchsorted(keys, next_keys)
+    present = pos < len(keys)
+    present[present] = keys[pos[present]] == next_keys[present]
+    
+    prev_sizes = np.bincount(period_codes, minlength=n_periods)
+    retained = np.bincount(period_codes[present], minlength=n_periods)
+    return prev_sizes, retained
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _churn_counts_jit(period_codes, user_codes, n_periods):
+        """인접 기간 블록을 투 포인터로 훑어 기간별 유저 수와 다음 기간 잔존 유저 수 계산 (O(N))"""
+        starts = np.searchsorted(period_codes, np.arange(n_periods + 1))
+        prev_sizes = np.zeros(n_periods, dtype=np.int64)
+        retained = np.zeros(n_periods, dtype=np.int64)
+        for k in range(n_periods - 1):
+            i, i_end = starts[k], starts[k + 1]
+            j, j_end = starts[k + 1], starts[k + 2]
+            prev_sizes[k] = i_end - i
+            count = 0
+            while i < i_end and j < j_end:
+                if user_codes[i] == user_codes[j]:
+                    count += 1
+                    i += 1
+                    j += 1
+                elif user_codes[i] < user_codes[j]:
+                    i += 1
+                else:
+                    j += 1
+            retained[k] = count
+        return prev_sizes, retained
+else:
+    _churn_counts_jit = None
+
+
 def _calculate_churn(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     """이탈률 계산"""
     if not req.user_column or not req.date_column:
         raise ValueError("Churn 계산에는 user_column과 date_column이 필요합니다")
     
-    df = df.copy()
-    df[req.date_column] = pd.to_datetime(df[req.date_column])
-    df['period'] = df[req.date_column].dt.to_period('M')
-    periods = sorted(df['period'].unique())
+    period = get_datetime_column(req.file_id, req.date_column).dt.to_period('M')
+    
+    # prev_sizes[k]: k번째 기간 유저 수, churned[k]: 그중 k+1번째 기간에 없는 유저 수
+    period_codes, user_codes, periods = _period_user_pairs(period, df[req.user_column])
+    counts_fn = _churn_counts_jit if _churn_counts_jit is not None else _churn_counts
+    prev_sizes, retained = counts_fn(period_codes, user_codes, len(periods))
+    prev_sizes, churned = prev_sizes.tolist(), (prev_sizes - retained).tolist()
     
     churn_data = []
     for i in range(1, len(periods)):
-        prev_users = set(df[df['period'] == periods[i-1]][req.user_column])
-        curr_users = set(df[df['period'] == periods[i]][req.user_column])
-        churned = prev_users - curr_users
-        churn_rate = len(churned) / max(len(prev_users), 1)
+        prev_users, churned_users = prev_sizes[i-1], churned[i-1]
+        churn_rate = churned_users / max(prev_users, 1)
         churn_data.append({
             "period": str(periods[i]),
-            "prev_users": len(prev_users),
-            "churned_users": len(churned),
+            "prev_users": prev_users,
+            "churned_users": churned_users,
             "churn_rate": round(churn_rate, 4)
         })
     
@@ -183,8 +250,11 @@ def _calculate_retention(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     if not req.user_column or not req.date_column:
         raise ValueError("Retention 계산에는 user_column과 date_column이 필요합니다")
     
-    df = df.copy()
-    df[req.date_column] = pd.to_datetime(df[req.date_column])
+    # 필요한 두 컬럼만으로 작업 프레임 구성 (날짜는 파일 버전별 캐시된 변환 결과)
+    df = pd.DataFrame({
+        req.user_column: df[req.user_column],
+        req.date_column: get_datetime_column(req.file_id, req.date_column),
+    })
     
     first_activity = df.groupby(req.user_column)[req.date_column].min().reset_index()
     first_activity.columns = [req.user_column, 'cohort_date']
@@ -194,16 +264,18 @@ def _calculate_retention(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     df['week_number'] = df['days_since_first'] // 7
     
     total_users = df[req.user_column].nunique()
-    retention_curve = []
-    
-    for week in range(min(12, int(df['week_number'].max()) + 1)):
-        retained = df[df['week_number'] >= week][req.user_column].nunique()
-        retention_rate = retained / max(total_users, 1)
-        retention_curve.append({
-            "week": int(week),
-            "retained_users": int(retained),
-            "retention_rate": round(retention_rate, 4)
-        })
+    
+    # week 이후에도 활동한 유저 = 마지막 활동 주차가 week 이상인 유저
+    # → 유저별 마지막 주차를 정렬해 두고 searchsorted로 모든 주차를 한 번에 계산
+    weeks = np.arange(min(12, int(df['week_number'].max()) + 1))
+    last_weeks = np.sort(df.groupby(req.user_column)['week_number'].max().dropna().to_numpy())
+    retained = len(last_weeks) - np.searchsorted(last_weeks, weeks, side='left')
+    rates = np.round(retained / max(total_users, 1), 4)
+    
+    retention_curve = [
+        {"week": week, "retained_users": users, "retention_rate": rate}
+        for week, users, rate in zip(weeks.tolist(), retained.tolist(), rates.tolist())
+    ]
     
     week_1_retention = retention_curve[1]['retention_rate'] if len(retention_curve) > 1 else 0
     week_4_retention = retention_curve[4]['retention_rate'] if len(retention_curve) > 4 else 0
@@ -224,17 +296,18 @@ def _calculate_conversion(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict
     if not req.event_column or not req.user_column:
         raise ValueError("Conversion 계산에는 event_column과 user_column이 필요합니다")
     
-    events = df[req.event_column].unique()
     total_users = df[req.user_column].nunique()
     
-    conversion_funnel = []
-    for event in events[:10]:
-        event_users = df[df[req.event_column] == event][req.user_column].nunique()
-        conversion_funnel.append({
+    # 이벤트별 유저 수를 한 번의 groupby로 집계 (등장 순서 상위 10개)
+    event_users = df.groupby(req.event_column, sort=False, dropna=False)[req.user_column].nunique().head(10)
+    conversion_funnel = [
+        {
             "event": str(event),
-            "users": int(event_users),
-            "conversion_rate": round(event_users / max(total_users, 1), 4)
-        })
+            "users": users,
+            "conversion_rate": round(users / max(total_users, 1), 4)
+        }
+        for event, users in zip(event_users.index, event_users.tolist())
+    ]
     
     conversion_funnel = sorted(conversion_funnel, key=lambda x: x['users'], reverse=True)
     
@@ -252,16 +325,14 @@ def _calculate_mrr(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     if not req.revenue_column or not req.date_column:
         raise ValueError("MRR 계산에는 revenue_column과 date_column이 필요합니다")
     
-    df = df.copy()
-    df[req.date_column] = pd.to_datetime(df[req.date_column])
-    df['month'] = df[req.date_column].dt.to_period('M')
-    
-    monthly_revenue = df.groupby('month')[req.revenue_column].sum().reset_index()
+    month = get_datetime_column(req.file_id, req.date_column).dt.to_period('M')
+    monthly_revenue = df.groupby(month)[req.revenue_column].sum().reset_index()
     monthly_revenue.columns = ['month', 'mrr']
     
+    recent = monthly_revenue.tail(12)
     mrr_data = [
-        {"month": str(row['month']), "mrr": round(float(row['mrr']), 2)}
-        for _, row in monthly_revenue.tail(12).iterrows()
+        {"month": str(month), "mrr": mrr}
+        for month, mrr in zip(recent['month'], np.round(recent['mrr'].to_numpy(dtype=np.float64), 2).tolist())
     ]
     
     current_mrr = mrr_data[-1]['mrr'] if mrr_data else 0
@@ -284,8 +355,11 @@ def _calculate_cohort(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     if not req.user_column or not req.date_column:
         raise ValueError("Cohort 분석에는 user_column과 date_column이 필요합니다")
     
-    df = df.copy()
-    df[req.date_column] = pd.to_datetime(df[req.date_column])
+    # 필요한 두 컬럼만으로 작업 프레임 구성 (날짜는 파일 버전별 캐시된 변환 결과)
+    df = pd.DataFrame({
+        req.user_column: df[req.user_column],
+        req.date_column: get_datetime_column(req.file_id, req.date_column),
+    })
     
     first_purchase = df.groupby(req.user_column)[req.date_column].min().reset_index()
     first_purchase.columns = [req.user_column, 'cohort_date']
@@ -293,19 +367,23 @@ def _calculate_cohort(df: pd.DataFrame, req: BusinessMetricsRequest) -> Dict:
     
     df = df.merge(first_purchase[[req.user_column, 'cohort']], on=req.user_column)
     df['activity_month'] = df[req.date_column].dt.to_period('M')
-    df['period_number'] = (df['activity_month'] - df['cohort']).apply(lambda x: x.n if hasattr(x, 'n') else 0)
+    # 월 Period의 정수 ordinal 차이 = 경과 개월 수 (NaT는 기존과 같이 0)
+    period_number = df['activity_month'].astype('int64') - df['cohort'].astype('int64')
+    df['period_number'] = period_number.where(df['activity_month'].notna() & df['cohort'].notna(), 0)
     
-    cohort_data = df.groupby(['cohort', 'period_number'])[req.user_column].nunique().reset_index()
+    cohort_users = df.groupby(['cohort', 'period_number'])[req.user_column].nunique()
     cohort_sizes = df.groupby('cohort')[req.user_column].nunique()
     
-    cohort_table = []
-    for cohort in sorted(cohort_data['cohort'].unique())[-6:]:
-        cohort_row = {"cohort": str(cohort)}
-        for period in range(min(6, int(cohort_data['period_number'].max()) + 1)):
-            users = cohort_data[(cohort_data['cohort'] == cohort) & (cohort_data['period_number'] == period)][req.user_column].sum()
-            retention = users / max(cohort_sizes.get(cohort, 1), 1)
-            cohort_row[f"M{period}"] = round(float(retention), 3)
-        cohort_table.append(cohort_row)
+    # 코호트 × 경과 개월 피벗을 코호트 크기로 한 번에 나눔 (최대 6개월)
+    # div는 인덱스 합집합으로 정렬하므로 나눈 뒤에 최근 6개 코호트만 남김
+    n_periods = min(6, int(df['period_number'].max()) + 1)
+    pivot = cohort_users.unstack(fill_value=0).reindex(columns=range(n_periods), fill_value=0)
+    retention = pivot.div(cohort_sizes.clip(lower=1), axis=0).tail(6).round(3)
+    
+    cohort_table = [
+        {"cohort": str(cohort), **{f"M{period}": rate for period, rate in enumerate(rates)}}
+        for cohort, rates in zip(retention.index, retention.to_numpy().tolist())
+    ]
     
     return {
         "metric": "Cohort Analysis",
@@ -7,10 +7,17 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 from scipy import stats
-from . import get_dataframe
+from . import get_dataframe_async
 
 router = APIRouter()
 
+# 히스토그램 구간 수 상한 판정에 쓰는 앞부분 표본 크기
+HIST_UNIQUE_SAMPLE = 10_000
+
+# 산점도: 대용량 데이터는 먼저 이 크기의 표본만 추출한 뒤 결측 제거/상관계수 계산
+SCATTER_RESERVOIR_ROWS = 5_000
+SCATTER_MAX_POINTS = 500
+
 class ChartDataRequest(BaseModel):
     file_id: str
     chart_type: str
@@ -22,7 +29,7 @@ class ChartDataRequest(BaseModel):
 @router.post("/analysis/chart-data")
 async def get_chart_data(request: ChartDataRequest):
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -36,36 +43,45 @@ async def get_chart_data(request: ChartDataRequest):
         if not pd.api.types.is_numeric_dtype(df[request.x_column]):
             raise HTTPException(status_code=400, detail=f"'{request.x_column}'은 수치형 컬럼이 아닙니다. 히스토그램에는 수치형 컬럼을 선택하세요.")
         
-        data = df[request.x_column].dropna()
+        # 결측치와 무한값을 isfinite 마스크 한 번으로 제거
+        raw = df[request.x_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        data = raw[np.isfinite(raw)]
         
         # 데이터 유효성 검사
-        if len(data) == 0:
-            raise HTTPException(status_code=400, detail="유효한 데이터가 없습니다.")
-        
-        # 무한값 제거
-        data = data[np.isfinite(data)]
-        if len(data) == 0:
+        if data.size == 0:
+            if np.isnan(raw).all():
+                raise HTTPException(status_code=400, detail="유효한 데이터가 없습니다.")
             raise HTTPException(status_code=400, detail="유효한 숫자 데이터가 없습니다 (무한값만 존재).")
         
-        hist, edges = np.histogram(data, bins=min(request.bins, len(data.unique())))
+        # 구간 수 상한(고유값 수)은 앞부분 표본에서 bins 이상이면 전체도 bins 이상 → 전체 해시는 저카디널리티일 때만
+        n_bins = request.bins
+        if len(np.unique(data[:HIST_UNIQUE_SAMPLE])) < n_bins:
+            n_bins = min(n_bins, len(pd.unique(data)))
+        
+        hist, edges = np.histogram(data, bins=n_bins)
         return {
             "chart_type": "histogram", "column": request.x_column,
-            "data": [{"bin": f"{edges[i]:.2f}", "count": int(hist[i])} for i in range(len(hist))],
-            "stats": {"mean": round(float(data.mean()), 2), "std": round(float(data.std()), 2), "min": round(float(data.min()), 2), "max": round(float(data.max()), 2)}
+            "data": [{"bin": f"{edge:.2f}", "count": count} for edge, count in zip(edges[:-1].tolist(), hist.tolist())],
+            "stats": {"mean": round(float(data.mean()), 2), "std": round(float(data.std(ddof=1)), 2), "min": round(float(data.min()), 2), "max": round(float(data.max()), 2)}
         }
     elif request.chart_type == "scatter":
         if not request.x_column or not request.y_column:
             raise HTTPException(status_code=400, detail="x_column과 y_column 필요")
-        sample = df[[request.x_column, request.y_column]].dropna()
-        if len(sample) > 500: sample = sample.sample(500)
-        corr = df[[request.x_column, request.y_column]].corr().iloc[0, 1]
-        return {"chart_type": "scatter", "data": [{"x": float(r[request.x_column]), "y": float(r[request.y_column])} for _, r in sample.iterrows()], "correlation": round(float(corr), 3)}
+        pair = df[[request.x_column, request.y_column]]
+        if len(pair) > SCATTER_RESERVOIR_ROWS:
+            pair = pair.sample(SCATTER_RESERVOIR_ROWS, random_state=0)
+        clean = pair.dropna()
+        corr = clean.corr().iloc[0, 1]
+        sample = clean.sample(SCATTER_MAX_POINTS, random_state=0) if len(clean) > SCATTER_MAX_POINTS else clean
+        xs = sample[request.x_column].to_numpy(dtype=np.float64).tolist()
+        ys = sample[request.y_column].to_numpy(dtype=np.float64).tolist()
+        return {"chart_type": "scatter", "data": [{"x": x, "y": y} for x, y in zip(xs, ys)], "correlation": round(float(corr), 3)}
     elif request.chart_type == "bar":
         if not request.x_column:
             raise HTTPException(status_code=400, detail="x_column 필요")
         if request.y_column:
             agg = df.groupby(request.x_column)[request.y_column].mean().head(20)
-            return {"chart_type": "bar", "data": [{"category": str(k), "value": round(float(v), 2)} for k, v in agg.items()]}
+            return {"chart_type": "bar", "data": [{"category": str(k), "value": v} for k, v in zip(agg.index, agg.round(2).tolist())]}
         else:
             counts = df[request.x_column].value_counts().head(20)
             return {"chart_type": "bar", "data": [{"category": str(k), "value": int(v)} for k, v in counts.items()]}
@@ -74,18 +90,25 @@ async def get_chart_data(request: ChartDataRequest):
             raise HTTPException(status_code=400, detail="x_column과 y_column 필요")
         sorted_df = df[[request.x_column, request.y_column]].dropna().sort_values(request.x_column)
         if len(sorted_df) > 200: sorted_df = sorted_df.iloc[::len(sorted_df)//200]
-        return {"chart_type": "line", "data": [{"x": str(r[request.x_column]), "y": float(r[request.y_column])} for _, r in sorted_df.iterrows()]}
+        xs = sorted_df[request.x_column].tolist()
+        ys = sorted_df[request.y_column].to_numpy(dtype=np.float64).tolist()
+        return {"chart_type": "line", "data": [{"x": str(x), "y": y} for x, y in zip(xs, ys)]}
     elif request.chart_type == "boxplot":
         if not request.y_column:
             raise HTTPException(status_code=400, detail="y_column 필요")
-        data = df[request.y_column].dropna()
-        return {"chart_type": "boxplot", "data": [{"group": request.y_column, "min": float(data.min()), "q1": float(data.quantile(0.25)), "median": float(data.median()), "q3": float(data.quantile(0.75)), "max": float(data.max())}]}
+        raw = df[request.y_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        data = raw[~np.isnan(raw)]
+        if data.size == 0:
+            raise HTTPException(status_code=400, detail="유효한 데이터가 없습니다.")
+        # 다섯 요약값을 한 번의 quantile 호출로 계산
+        q_min, q1, median, q3, q_max = np.quantile(data, [0.0, 0.25, 0.5, 0.75, 1.0]).tolist()
+        return {"chart_type": "boxplot", "data": [{"group": request.y_column, "min": q_min, "q1": q1, "median": median, "q3": q3, "max": q_max}]}
     raise HTTPException(status_code=400, detail=f"지원하지 않는 차트: {request.chart_type}")
 
 @router.get("/analysis/describe/{file_id}/{column}")
 async def describe_column(file_id: str, column: str):
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     if column not in df.columns:
@@ -94,5 +117,21 @@ async def describe_column(file_id: str, column: str):
     if pd.api.types.is_numeric_dtype(col):
         return {"column": column, "type": "numeric", "count": len(col), "mean": round(float(col.mean()), 4), "std": round(float(col.std()), 4), "min": round(float(col.min()), 4), "max": round(float(col.max()), 4), "median": round(float(col.median()), 4)}
     else:
-        vc = col.value_counts()
-        return {"column": column, "type": "categorical", "count": len(col), "unique": int(col.nunique()), "top_values": [{"value": str(v), "count": int(c)} for v, c in vc.head(10).items()]}
+        uniques, counts = _category_counts(col)
+        top = _top_indices(counts, 10)
+        return {"column": column, "type": "categorical", "count": len(col), "unique": len(uniques), "top_values": [{"value": str(uniques[i]), "count": c} for i, c in zip(top.tolist(), counts[top].tolist())]}
+
+
+def _category_counts(col: pd.Series):
+    """범주별 빈도 (값을 정수 코드로 한 번 인코딩 후 bincount)"""
+    codes, uniques = pd.factorize(col)
+    return uniques, np.bincount(codes, minlength=len(uniques))
+
+
+def _top_indices(counts: np.ndarray, n: int) -> np.ndarray:
+    """빈도 상위 n개 위치 (전체 정렬 대신 argpartition 후 n개만 정렬)"""
+    if len(counts) > n:
+        top = np.argpartition(counts, -n)[-n:]
+    else:
+        top = np.arange(len(counts))
+    return top[np.argsort(-counts[top], kind='stable')]
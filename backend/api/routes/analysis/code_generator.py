@@ -3,15 +3,36 @@ AI Code Generator - Pandas 코드 자동 생성 API
 
 사용자의 자연어 지시를 받아 데이터 전처리 Pandas 코드를 자동으로 생성합니다.
 """
-from typing import Dict, Any, Optional
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+import pandas as pd
 import json
-from . import get_dataframe
+from . import get_dataframe_async, get_summary
+from .ai_preprocessing import AIDiagnosisRequest, AIDiagnosisResponse, diagnose_data_with_ai
 from services.llm_service import get_llm_service
+from services.llm_cache import get_llm_cache, fingerprint, make_cache_key
+from utils.llm_summary import summarize_for_llm
+from utils.process_pool import process_context, init_sandbox, execute_in_sandbox
 
 router = APIRouter()
 
+# 생성 코드 실행 샌드박스 (별도 프로세스 + 자원 한도, Windows는 프로세스 격리만 적용)
+SANDBOX_WORKERS = 2
+SANDBOX_CPU_SECONDS = 5
+SANDBOX_MEMORY_BYTES = 4 * 1024 ** 3
+
+# 코드 생성 프롬프트에 넣는 데이터 정보의 토큰 상한
+CODEGEN_TOKEN_BUDGET = 600
+
+# 번들 요청의 LLM 동시 호출 상한 (프로세스 전체 공유)
+BUNDLE_LLM_CONCURRENCY = 4
+_bundle_semaphore = asyncio.Semaphore(BUNDLE_LLM_CONCURRENCY)
+
 class CodeGenerationRequest(BaseModel):
     file_id: str
     instruction: str  # 예: "결측치를 평균으로 채워줘" or "age 컬럼을 문자열로 바꿔줘"
@@ -23,27 +44,18 @@ class CodeGenerationResponse(BaseModel):
     explanation: str
     warnings: list[str] = []
 
-@router.post("/analysis/ai-preprocess/generate-code", response_model=CodeGenerationResponse)
-async def generate_preprocessing_code(request: CodeGenerationRequest):
-    """
-    사용자 지시를 바탕으로 Pandas 전처리 코드를 자동 생성합니다.
-    """
-    try:
-        df = get_dataframe(request.file_id)
-    except KeyError:
-        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+class PreprocessBundleRequest(BaseModel):
+    file_id: str
+    instructions: List[str] = []
+    context: Optional[str] = None
+
+class PreprocessBundleResponse(BaseModel):
+    file_id: str
+    diagnosis: AIDiagnosisResponse
+    code_generations: List[CodeGenerationResponse]
 
-    # 데이터프레임 정보 수집
-    df_info = {
-        "columns": list(df.columns),
-        "dtypes": {col: str(df[col].dtype) for col in df.columns},
-        "shape": df.shape,
-        "sample": df.head(3).to_dict(orient="records"),
-        "null_counts": df.isnull().sum().to_dict(),
-    }
 
-    # LLM 프롬프트 구성
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are a Python data scientist assistant. Generate clean, production-ready Pandas code based on the user's instruction.
 
 Rules:
@@ -62,33 +74,68 @@ Output format (JSON):
 }
 """
 
+
+@router.post("/analysis/ai-preprocess/generate-code", response_model=CodeGenerationResponse)
+async def generate_preprocessing_code(request: CodeGenerationRequest):
+    """
+    사용자 지시를 바탕으로 Pandas 전처리 코드를 자동 생성합니다.
+    """
+    try:
+        # 디스크로 내보낸 파일은 이벤트 루프 밖에서 먼저 적재
+        await get_dataframe_async(request.file_id)
+        summary = get_summary(request.file_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+
+    # 데이터프레임 정보 (파일 버전별 캐시된 요약에서 발췌)
+    df_info = {
+        "columns": summary["columns"],
+        "dtypes": summary["dtypes"],
+        "shape": summary["shape"],
+        "sample": summary["sample"][:3],
+        "null_counts": summary["null_counts"],
+    }
+
+    # LLM 프롬프트 구성 (정적 지시문을 앞에, 요청별 데이터/지시를 뒤에 배치)
     user_message = f"""
+아래 데이터에 적용할 Pandas 코드를 생성해주세요.
+
 데이터프레임 정보:
-{json.dumps(df_info, ensure_ascii=False, default=str)[:2000]}
+{summarize_for_llm(df_info, token_budget=CODEGEN_TOKEN_BUDGET)}
 
 사용자 지시:
 {request.instruction}
 
 {('추가 컨텍스트: ' + request.context) if request.context else ''}
-
-위 데이터에 적용할 Pandas 코드를 생성해주세요.
 """
 
     llm = get_llm_service()
+    cache = get_llm_cache()
+    cache_key = make_cache_key((SYSTEM_PROMPT, user_message, fingerprint(df_info)))
     try:
-        response_text = await llm.chat(system_prompt, user_message)
+        # 같은 데이터·지시에 대한 재요청은 캐시된 응답 재사용
+        cached_text = await cache.get_async(cache_key)
+        if cached_text is not None:
+            response_text = cached_text
+        else:
+            response_text = await llm.chat(SYSTEM_PROMPT, user_message, label="code_generation")
         
         # JSON 파싱
         cleaned_text = response_text.replace("```json", "").replace("```", "").strip()
         result = json.loads(cleaned_text)
         
-        return CodeGenerationResponse(
+        response = CodeGenerationResponse(
             success=True,
             code=result.get("code", "# 코드 생성 실패"),
             explanation=result.get("explanation", "설명 없음"),
             warnings=result.get("warnings", [])
         )
         
+        # 파싱/검증을 통과한 응답만 캐시 (원본 텍스트로 대체 반환하는 경우는 캐시하지 않음)
+        if cached_text is None:
+            await cache.set_async(cache_key, response_text, metadata={"route": "code_generation", "file_id": request.file_id})
+        return response
+        
     except json.JSONDecodeError:
         # JSON 파싱 실패 시 원본 텍스트를 코드로 반환
         return CodeGenerationResponse(
@@ -106,6 +153,61 @@ Output format (JSON):
         )
 
 
+async def _bounded(coro):
+    """번들 세마포어 안에서 코루틴 실행"""
+    async with _bundle_semaphore:
+        return await coro
+
+
+@router.post("/analysis/ai-preprocess/bundle", response_model=PreprocessBundleResponse)
+async def run_preprocess_bundle(request: PreprocessBundleRequest):
+    """
+    AI 진단과 지시별 코드 생성을 동시에 실행합니다.
+    
+    대시보드가 두 엔드포인트를 연달아 호출할 때의 LLM 대기 시간을 겹쳐 줄임.
+    """
+    diagnosis, *code_generations = await asyncio.gather(
+        _bounded(diagnose_data_with_ai(AIDiagnosisRequest(file_id=request.file_id))),
+        *(
+            _bounded(generate_preprocessing_code(CodeGenerationRequest(
+                file_id=request.file_id,
+                instruction=instruction,
+                context=request.context
+            )))
+            for instruction in request.instructions
+        )
+    )
+    
+    return PreprocessBundleResponse(
+        file_id=request.file_id,
+        diagnosis=diagnosis,
+        code_generations=code_generations
+    )
+
+
+@lru_cache()
+def _get_sandbox_pool() -> ProcessPoolExecutor:
+    """
+    샌드박스 프로세스 풀 (첫 사용 시 생성)
+    
+    forkserver/spawn으로 서버 주소 공간(적재된 DataFrame 등)을 물려받지 않는 새 프로세스에서
+    시작하므로 메모리 한도가 사용자 코드 실행에 온전히 적용됨.
+    """
+    return ProcessPoolExecutor(
+        max_workers=SANDBOX_WORKERS,
+        mp_context=process_context(),
+        initializer=init_sandbox,
+        initargs=(SANDBOX_MEMORY_BYTES,)
+    )
+
+
+def shutdown_sandbox_pool():
+    """샌드박스 프로세스 풀 종료 (앱 종료 시 호출, 생성된 적 없으면 무시)"""
+    if _get_sandbox_pool.cache_info().currsize:
+        _get_sandbox_pool().shutdown(cancel_futures=True)
+        _get_sandbox_pool.cache_clear()
+
+
 @router.post("/analysis/ai-preprocess/execute-code")
 async def execute_preprocessing_code(request: CodeGenerationRequest):
     """
@@ -113,7 +215,7 @@ async def execute_preprocessing_code(request: CodeGenerationRequest):
     주의: 보안상 위험할 수 있으므로 신중하게 사용
     """
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -135,12 +237,21 @@ async def execute_preprocessing_code(request: CodeGenerationRequest):
                 "code": code
             }
     
-    # 코드 실행
+    # 코드 실행 (별도 프로세스로 전달되는 DataFrame은 사본이므로 원본 복사 불필요)
     try:
-        local_vars = {"df": df.copy()}
-        exec(code, {"__builtins__": {}}, local_vars)
-        
-        new_df = local_vars.get("df", df)
+        loop = asyncio.get_running_loop()
+        pool = _get_sandbox_pool()
+        try:
+            new_df = await loop.run_in_executor(pool, execute_in_sandbox, df, code, SANDBOX_CPU_SECONDS)
+        except BrokenProcessPool:
+            # 자원 한도 초과로 워커가 종료됨 → 다음 요청을 위해 풀 재생성
+            pool.shutdown(wait=False)
+            _get_sandbox_pool.cache_clear()
+            return {
+                "success": False,
+                "error": "코드 실행 오류: 실행 시간 또는 메모리 한도 초과",
+                "code": code
+            }
         
         # 결과 저장
         from . import store_dataframe
@@ -3,17 +3,58 @@ Column Analysis Module - 컬럼 의미 분석 API
 
 AI를 활용하여 각 컬럼의 의미와 데이터 특성을 분석합니다.
 """
+import asyncio
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 import json
-from . import get_dataframe
+from . import get_dataframe_async
 from services.llm_service import get_llm_service
+from services.llm_cache import get_llm_cache, fingerprint
+from utils.llm_summary import count_tokens
 
 router = APIRouter()
 
+# 샘플 값 추출 시 먼저 살펴보는 앞부분 행 수
+SAMPLE_SCAN_ROWS = 100
+
+# 한 번의 LLM 요청에 담는 컬럼 수 상한과 컬럼 정보 토큰 예산
+COLUMNS_PER_REQUEST = 10
+CHUNK_TOKEN_BUDGET = 1500
+
+# 컬럼 분석 LLM 동시 호출 상한 (프로세스 전체 공유)
+COLUMN_EXPLAIN_CONCURRENCY = 8
+_explain_semaphore = asyncio.Semaphore(COLUMN_EXPLAIN_CONCURRENCY)
+
+SYSTEM_PROMPT = """
+You are a data analyst expert. Analyze each column and explain what it represents.
+For each column, provide:
+1. ai_description: What this column likely represents (in Korean, 1-2 sentences)
+2. feature_type: One of [numeric, categorical, datetime, text, id, binary, ordinal]
+3. business_meaning: Business context or usage (in Korean, 1 sentence)
+4. analysis_tips: 2-3 analysis suggestions for this column (in Korean)
+
+Return JSON array format:
+[{
+    "column": "column_name",
+    "ai_description": "...",
+    "feature_type": "...",
+    "business_meaning": "...",
+    "analysis_tips": ["...", "..."]
+}, ...]
+"""
+
+# 컬럼별 분석 결과 캐시: 메모리 LRU 앞단 + SQLite LLM 캐시 (재시작 후에도 TTL 동안 유지)
+# 키는 프롬프트와 컬럼 지문(이름, 타입, 고유값 수, 샘플 값)으로 구성
+COLUMN_CACHE_SIZE = 1024
+_column_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_column_cache_lock = threading.Lock()
+_PROMPT_FINGERPRINT = fingerprint(SYSTEM_PROMPT)
+
 
 class ColumnAnalysisRequest(BaseModel):
     file_id: str
@@ -36,114 +77,205 @@ class ColumnInfo(BaseModel):
 async def explain_columns(request: ColumnAnalysisRequest):
     """컬럼 의미 AI 분석"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
     # 분석할 컬럼 선택
     target_columns = request.columns if request.columns else list(df.columns)[:20]  # 최대 20개
 
-    # 컬럼 정보 수집
+    # 컬럼 정보 수집 (결측/고유값 수와 수치형 통계는 대상 컬럼 전체에 대해 한 번씩 계산)
+    cols = [col for col in dict.fromkeys(target_columns) if col in df.columns]
+    sub = df[cols]
+    null_counts = sub.isna().sum().to_dict()
+    nuniques = sub.nunique().to_dict()
+    numeric_cols = [col for col in cols if sub[col].dtype in ['int64', 'float64']]
+    num_stats = sub[numeric_cols].agg(['min', 'max', 'mean']).to_dict()
+    
     column_info = []
-    for col in target_columns:
-        if col not in df.columns:
-            continue
-        
-        series = df[col]
+    for col in cols:
+        series = sub[col]
+        null_count = int(null_counts[col])
         info = {
             "column": col,
             "dtype": str(series.dtype),
-            "sample_values": series.dropna().head(5).tolist(),
-            "unique_count": int(series.nunique()),
-            "null_count": int(series.isnull().sum()),
-            "null_pct": round(series.isnull().sum() / len(df) * 100, 2),
+            "sample_values": _first_valid(series, 5),
+            "unique_count": int(nuniques[col]),
+            "null_count": null_count,
+            "null_pct": round(null_count / len(df) * 100, 2),
         }
         
         # 기본 통계
-        if series.dtype in ['int64', 'float64']:
-            info["min"] = float(series.min()) if not pd.isna(series.min()) else None
-            info["max"] = float(series.max()) if not pd.isna(series.max()) else None
-            info["mean"] = round(float(series.mean()), 2) if not pd.isna(series.mean()) else None
+        if col in num_stats:
+            stats = num_stats[col]
+            info["min"] = float(stats["min"]) if not pd.isna(stats["min"]) else None
+            info["max"] = float(stats["max"]) if not pd.isna(stats["max"]) else None
+            info["mean"] = round(float(stats["mean"]), 2) if not pd.isna(stats["mean"]) else None
         
         column_info.append(info)
 
-    # AI 분석 요청
+    # 캐시된 컬럼은 재사용하고 나머지만 AI 분석 요청 (컬럼 청크별로 동시 호출 후 병합)
+    cache_keys = {info["column"]: _column_cache_key(info) for info in column_info}
+    result_map = {}
+    misses = []
+    for info in column_info:
+        cached = await _get_cached_column(cache_keys[info["column"]])
+        if cached is not None:
+            result_map[info["column"]] = cached
+        else:
+            misses.append(info)
+    
     llm = get_llm_service()
+    chunks = _chunk_columns(misses)
     
-    system_prompt = """
-You are a data analyst expert. Analyze each column and explain what it represents.
-For each column, provide:
-1. ai_description: What this column likely represents (in Korean, 1-2 sentences)
-2. feature_type: One of [numeric, categorical, datetime, text, id, binary, ordinal]
-3. business_meaning: Business context or usage (in Korean, 1 sentence)
-4. analysis_tips: 2-3 analysis suggestions for this column (in Korean)
+    try:
+        chunk_results = await asyncio.gather(*(_explain_chunk(llm, chunk) for chunk in chunks))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI 분석 오류: {str(e)}")
+    
+    # 결과 병합 (JSON 파싱에 실패한 청크의 컬럼은 규칙 기반 분석으로 대체, 캐시하지 않음)
+    fallback_columns = set()
+    for chunk, ai_results in zip(chunks, chunk_results):
+        if ai_results is None:
+            fallback_columns.update(info["column"] for info in chunk)
+            continue
+        
+        chunk_map = {r["column"]: r for r in ai_results}
+        for info in chunk:
+            ai_info = chunk_map.get(info["column"])
+            if ai_info is not None:
+                result_map[info["column"]] = ai_info
+                await _set_cached_column(cache_keys[info["column"]], ai_info)
+    
+    final_results = []
+    for info in column_info:
+        col = info["column"]
+        if col in fallback_columns:
+            final_results.append({
+                **info,
+                "ai_description": _infer_column_meaning(info),
+                "feature_type": _infer_feature_type(info),
+                "business_meaning": "",
+                "analysis_tips": []
+            })
+            continue
+        
+        ai_info = result_map.get(col, {})
+        final_results.append({
+            **info,
+            "ai_description": ai_info.get("ai_description", "분석 중..."),
+            "feature_type": ai_info.get("feature_type", "unknown"),
+            "business_meaning": ai_info.get("business_meaning", ""),
+            "analysis_tips": ai_info.get("analysis_tips", [])
+        })
+    
+    return {
+        "success": True,
+        "total_columns": len(df.columns),
+        "analyzed_columns": len(final_results),
+        "columns": final_results
+    }
+
+
+def _column_cache_key(info: Dict[str, Any]) -> str:
+    """컬럼 분석 결과 캐시 키 (샘플 값은 순서 무관)"""
+    return "column_explain:" + fingerprint({
+        "prompt": _PROMPT_FINGERPRINT,
+        "column": info["column"],
+        "dtype": info["dtype"],
+        "unique_count": info["unique_count"],
+        "samples": sorted(map(str, info["sample_values"])),
+    })
+
+
+async def _get_cached_column(key: str) -> Optional[Dict[str, Any]]:
+    """메모리 → SQLite 순으로 캐시된 컬럼 분석 결과 조회"""
+    with _column_cache_lock:
+        cached = _column_cache.get(key)
+        if cached is not None:
+            _column_cache.move_to_end(key)
+            return cached
+    
+    stored = await get_llm_cache().get_async(key)
+    if stored is None:
+        return None
+    result = json.loads(stored)
+    _remember_column(key, result)
+    return result
+
+
+async def _set_cached_column(key: str, result: Dict[str, Any]):
+    """컬럼 분석 결과를 메모리와 SQLite 캐시에 저장"""
+    _remember_column(key, result)
+    await get_llm_cache().set_async(
+        key,
+        json.dumps(result, ensure_ascii=False, default=str),
+        metadata={"route": "column_explain", "column": result.get("column")}
+    )
+
+
+def _remember_column(key: str, result: Dict[str, Any]):
+    """메모리 LRU에 저장 (상한 초과 시 가장 오래된 항목 제거)"""
+    with _column_cache_lock:
+        _column_cache[key] = result
+        _column_cache.move_to_end(key)
+        if len(_column_cache) > COLUMN_CACHE_SIZE:
+            _column_cache.popitem(last=False)
 
-Return JSON array format:
-[{
-    "column": "column_name",
-    "ai_description": "...",
-    "feature_type": "...",
-    "business_meaning": "...",
-    "analysis_tips": ["...", "..."]
-}, ...]
-"""
 
+def _chunk_columns(column_info: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    컬럼 정보를 LLM 요청 단위로 분할
+    
+    청크마다 최대 COLUMNS_PER_REQUEST개, 컬럼 정보 토큰 합이 CHUNK_TOKEN_BUDGET 이내가
+    되도록 순서대로 채움 (예산을 넘는 단일 컬럼은 단독 청크).
+    """
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for info in column_info:
+        cost = count_tokens(json.dumps(info, ensure_ascii=False, default=str))
+        if current and (len(current) >= COLUMNS_PER_REQUEST or used + cost > CHUNK_TOKEN_BUDGET):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(info)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _explain_chunk(llm, chunk: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    컬럼 청크 하나를 LLM으로 분석
+    
+    Returns:
+        컬럼별 분석 결과 리스트 (응답 JSON 파싱 실패 시 None)
+    """
     user_prompt = f"""
 분석할 컬럼 정보:
-{json.dumps(column_info, ensure_ascii=False, default=str)[:4000]}
+{json.dumps(chunk, ensure_ascii=False, default=str)}
 
 위 컬럼들의 의미와 분석 방법을 분석해주세요.
 """
-
+    
+    async with _explain_semaphore:
+        response = await llm.chat(SYSTEM_PROMPT, user_prompt, label="column_explain")
+    
+    # JSON 파싱
+    cleaned = response.replace("```json", "").replace("```", "").strip()
     try:
-        response = await llm.chat(system_prompt, user_prompt)
-        
-        # JSON 파싱
-        cleaned = response.replace("```json", "").replace("```", "").strip()
-        ai_results = json.loads(cleaned)
-        
-        # 결과 병합
-        result_map = {r["column"]: r for r in ai_results}
-        
-        final_results = []
-        for info in column_info:
-            col = info["column"]
-            ai_info = result_map.get(col, {})
-            
-            final_results.append({
-                **info,
-                "ai_description": ai_info.get("ai_description", "분석 중..."),
-                "feature_type": ai_info.get("feature_type", "unknown"),
-                "business_meaning": ai_info.get("business_meaning", ""),
-                "analysis_tips": ai_info.get("analysis_tips", [])
-            })
-        
-        return {
-            "success": True,
-            "total_columns": len(df.columns),
-            "analyzed_columns": len(final_results),
-            "columns": final_results
-        }
-        
+        return json.loads(cleaned)
     except json.JSONDecodeError:
-        # JSON 파싱 실패 시 기본 분석 반환
-        return {
-            "success": True,
-            "total_columns": len(df.columns),
-            "analyzed_columns": len(column_info),
-            "columns": [
-                {
-                    **info,
-                    "ai_description": _infer_column_meaning(info),
-                    "feature_type": _infer_feature_type(info),
-                    "business_meaning": "",
-                    "analysis_tips": []
-                }
-                for info in column_info
-            ]
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI 분석 오류: {str(e)}")
+        return None
+
+
+def _first_valid(series: pd.Series, n: int) -> List[Any]:
+    """결측이 아닌 앞쪽 n개 값 (앞부분에서 부족할 때만 전체 dropna)"""
+    values = series.head(SAMPLE_SCAN_ROWS).dropna().head(n)
+    if len(values) < n and len(series) > SAMPLE_SCAN_ROWS:
+        values = series.dropna().head(n)
+    return values.tolist()
 
 
 def _infer_feature_type(info: Dict) -> str:
@@ -7,7 +7,7 @@ from typing import List, Dict, Any
 import pandas as pd
 import numpy as np
 
-from . import get_dataframe, store_dataframe, generate_file_id, parse_uploaded_file, list_stored_files
+from . import get_dataframe_async, get_cached_stat, store_dataframe, generate_file_id, parse_uploaded_file, list_stored_files
 
 router = APIRouter()
 
@@ -70,66 +70,83 @@ async def upload_file(file: UploadFile = File(...)):
 
 @router.get("/analysis/profile/{file_id}", response_model=ProfileResponse)
 async def get_profile(file_id: str):
-    """데이터 프로파일링"""
+    """데이터 프로파일링 (파일 버전별로 캐시)"""
     try:
-        df = get_dataframe(file_id)
+        # 디스크로 내보낸 파일은 이벤트 루프 밖에서 먼저 적재
+        await get_dataframe_async(file_id)
+        profile = get_cached_stat(file_id, "profile", _build_profile)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
+    return ProfileResponse(file_id=file_id, **profile)
+
+
+def _build_profile(df: pd.DataFrame) -> Dict[str, Any]:
+    """컬럼별 결측/고유값/수치형 통계와 경고 계산"""
     columns = []
     missing_summary = {}
     warnings = []
     
-    for col in df.columns:
+    # 결측/고유값 수와 수치형 통계를 컬럼 전체에 대해 한 번씩 계산
+    na_mask = df.isna()
+    missing = na_mask.sum().tolist()
+    missing_pct = (na_mask.mean() * 100).tolist()
+    nunique = df.nunique().tolist()
+    
+    numeric_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+    num = df[numeric_cols].astype(np.float64)
+    num_stats = num.agg(['mean', 'std', 'min', 'max', 'median', 'skew', 'kurt', 'count']).to_dict()
+    quartiles = num.quantile([0.25, 0.75]).to_dict()
+    
+    for i, (col, dtype) in enumerate(df.dtypes.items()):
         col_info = {
             "name": col,
-            "dtype": str(df[col].dtype),
-            "missing": int(df[col].isna().sum()),
-            "missing_pct": round(df[col].isna().mean() * 100, 2),
-            "unique": int(df[col].nunique())
+            "dtype": str(dtype),
+            "missing": int(missing[i]),
+            "missing_pct": round(missing_pct[i], 2),
+            "unique": int(nunique[i])
         }
         
-        if pd.api.types.is_numeric_dtype(df[col]):
-            non_null = df[col].dropna()
-            if len(non_null) > 0:
-                col_info.update({
-                    "mean": round(float(non_null.mean()), 2),
-                    "std": round(float(non_null.std()), 2),
-                    "min": round(float(non_null.min()), 2),
-                    "max": round(float(non_null.max()), 2),
-                    "median": round(float(non_null.median()), 2),
-                    "q1": round(float(non_null.quantile(0.25)), 2),
-                    "q3": round(float(non_null.quantile(0.75)), 2),
-                    "skewness": round(float(non_null.skew()), 3),
-                    "kurtosis": round(float(non_null.kurtosis()), 3),
-                })
+        stats = num_stats.get(col)
+        if stats is not None and stats["count"] > 0:
+            col_info.update({
+                "mean": round(float(stats["mean"]), 2),
+                "std": round(float(stats["std"]), 2),
+                "min": round(float(stats["min"]), 2),
+                "max": round(float(stats["max"]), 2),
+                "median": round(float(stats["median"]), 2),
+                "q1": round(float(quartiles[col][0.25]), 2),
+                "q3": round(float(quartiles[col][0.75]), 2),
+                "skewness": round(float(stats["skew"]), 3),
+                "kurtosis": round(float(stats["kurt"]), 3),
+            })
         
         columns.append(col_info)
         
         if col_info["missing_pct"] > 0:
             missing_summary[col] = col_info["missing_pct"]
     
-    if df.duplicated().sum() > 0:
-        warnings.append(f"중복 행 {df.duplicated().sum()}개 발견")
+    dup_count = int(df.duplicated().sum())
+    if dup_count > 0:
+        warnings.append(f"중복 행 {dup_count}개 발견")
     
     high_missing = [c["name"] for c in columns if c["missing_pct"] > 20]
     if high_missing:
         warnings.append(f"결측치 20% 초과: {', '.join(high_missing)}")
     
-    return ProfileResponse(
-        file_id=file_id,
-        shape={"rows": len(df), "columns": len(df.columns)},
-        columns=columns,
-        missing_summary=missing_summary,
-        warnings=warnings
-    )
+    return {
+        "shape": {"rows": len(df), "columns": len(df.columns)},
+        "columns": columns,
+        "missing_summary": missing_summary,
+        "warnings": warnings,
+    }
 
 
 @router.get("/analysis/correlation/{file_id}", response_model=CorrelationResponse)
 async def get_correlation(file_id: str, method: str = "pearson"):
     """상관관계 분석"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -138,26 +155,37 @@ async def get_correlation(file_id: str, method: str = "pearson"):
     if len(numeric_cols) < 2:
         raise HTTPException(status_code=400, detail="상관관계 분석에 최소 2개 수치형 컬럼 필요")
     
-    corr_matrix = df[numeric_cols].corr(method=method)
-    
-    matrix = []
-    for col in numeric_cols:
-        row = {"id": col}
-        for col2 in numeric_cols:
-            row[col2] = round(float(corr_matrix.loc[col, col2]), 3)
-        matrix.append(row)
-    
-    strong = []
-    for i, col1 in enumerate(numeric_cols):
-        for j, col2 in enumerate(numeric_cols):
-            if i < j:
-                val = corr_matrix.loc[col1, col2]
-                if abs(val) > 0.7:
-                    strong.append({
-                        "pair": [col1, col2],
-                        "correlation": round(float(val), 3),
-                        "direction": "양의 상관" if val > 0 else "음의 상관"
-                    })
+    # 상관계수 방법별로 캐시
+    result = get_cached_stat(
+        file_id, f"corr_{method}",
+        lambda df: _build_correlation(df, numeric_cols, method)
+    )
+    
+    return CorrelationResponse(file_id=file_id, **result)
+
+
+def _build_correlation(df: pd.DataFrame, numeric_cols: List[str], method: str) -> Dict[str, Any]:
+    """상관행렬, 강한 상관 쌍(|r| > 0.7), 요약 문구 계산"""
+    # 라벨 조회(.loc) 대신 ndarray 위치 인덱싱
+    corr = df[numeric_cols].corr(method=method).to_numpy()
+    
+    matrix = [
+        {"id": col, **dict(zip(numeric_cols, row))}
+        for col, row in zip(numeric_cols, np.round(corr, 3).tolist())
+    ]
+    
+    # 상삼각(i < j) 쌍을 한 번에 추출 후 |r| > 0.7 마스킹
+    iu, ju = np.triu_indices(len(numeric_cols), k=1)
+    vals = corr[iu, ju]
+    mask = np.abs(vals) > 0.7
+    strong = [
+        {
+            "pair": [numeric_cols[i], numeric_cols[j]],
+            "correlation": round(val, 3),
+            "direction": "양의 상관" if val > 0 else "음의 상관"
+        }
+        for i, j, val in zip(iu[mask].tolist(), ju[mask].tolist(), vals[mask].tolist())
+    ]
     
     insight = ""
     if strong:
@@ -166,25 +194,20 @@ async def get_correlation(file_id: str, method: str = "pearson"):
     else:
         insight = f"강한 상관관계(|r|>0.7, {method})가 없습니다."
     
-    return CorrelationResponse(
-        file_id=file_id,
-        matrix=matrix,
-        strong_correlations=strong,
-        insight=insight
-    )
+    return {
+        "matrix": matrix,
+        "strong_correlations": strong,
+        "insight": insight,
+    }
 
 
 @router.get("/analysis/files")
 async def list_files():
     """업로드된 파일 목록"""
-    files = []
-    for file_id, df in list_stored_files().items():
-        files.append({
-            "file_id": file_id,
-            "rows": len(df),
-            "columns": len(df.columns),
-            "column_names": df.columns.tolist()
-        })
+    files = [
+        {"file_id": file_id, **meta}
+        for file_id, meta in list_stored_files().items()
+    ]
     return {"files": files}
 
 
@@ -192,15 +215,16 @@ async def list_files():
 async def get_column_values(file_id: str, column: str, max_values: int = 50):
     """컬럼의 고유값 목록 조회 (A/B 테스트 그룹 선택용)"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
     if column not in df.columns:
         raise HTTPException(status_code=400, detail=f"컬럼 '{column}' 없음")
     
-    # 고유값과 각 값의 건수 조회
-    value_counts = df[column].value_counts().head(max_values)
+    # 고유값별 건수 (파일 버전별로 캐시, 결측 제외이므로 길이 = nunique)
+    all_counts = get_cached_stat(file_id, f"value_counts:{column}", lambda df: df[column].value_counts())
+    value_counts = all_counts.head(max_values)
     
     values = [
         {
@@ -213,7 +237,7 @@ async def get_column_values(file_id: str, column: str, max_values: int = 50):
     
     return {
         "column": column,
-        "total_unique": int(df[column].nunique()),
+        "total_unique": len(all_counts),
         "values": values,
         "dtype": str(df[column].dtype)
     }
@@ -9,10 +9,14 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 from scipy import stats
-from . import get_dataframe
+from . import get_dataframe_async
 
 router = APIRouter()
 
+# 날짜 컬럼 탐지: 앞쪽 결측 아닌 값 일부만 파싱하여 성공 비율로 판정
+DATE_SAMPLE_SIZE = 50
+DATE_PARSE_THRESHOLD = 0.8
+
 
 class ForecastRequest(BaseModel):
     file_id: str
@@ -39,7 +43,7 @@ class AnomalyRequest(BaseModel):
 async def forecast_timeseries(request: ForecastRequest):
     """시계열 예측 수행"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
@@ -52,8 +56,9 @@ async def forecast_timeseries(request: ForecastRequest):
         # 데이터 준비
         forecast_df = df[[request.date_column, request.value_column]].copy()
         forecast_df.columns = ['ds', 'y']
-        forecast_df['ds'] = pd.to_datetime(forecast_df['ds'])
-        forecast_df = forecast_df.dropna().sort_values('ds')
+        # 날짜 컬럼 목록은 샘플의 80% 파싱 기준이므로 파싱되지 않는 행은 제외
+        forecast_df['ds'] = pd.to_datetime(forecast_df['ds'], errors="coerce")
+        forecast_df = forecast_df.dropna(subset=['ds', 'y']).sort_values('ds')
 
         if len(forecast_df) < 10:
             raise HTTPException(status_code=400, detail="예측을 위해 최소 10개 이상의 데이터가 필요합니다.")
@@ -121,6 +126,8 @@ async def forecast_timeseries(request: ForecastRequest):
             "summary": f"{request.periods}일 후 예측: {round(predicted_end, 2)} ({'+' if change_rate > 0 else ''}{round(change_rate, 1)}%)"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"예측 오류: {str(e)}")
 
@@ -129,7 +136,7 @@ async def forecast_timeseries(request: ForecastRequest):
 async def whatif_simulation(request: WhatIfRequest):
     """What-If 시뮬레이션"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
@@ -142,38 +149,37 @@ async def whatif_simulation(request: WhatIfRequest):
         raise HTTPException(status_code=400, detail=f"'{request.column}'은 수치형 컬럼이 아닙니다.")
 
     # 현재 통계
+    series = df[request.column]
+    mean, total, std = float(series.mean()), float(series.sum()), float(series.std())
     current_stats = {
-        "mean": round(float(df[request.column].mean()), 2),
-        "sum": round(float(df[request.column].sum()), 2),
-        "std": round(float(df[request.column].std()), 2),
+        "mean": round(mean, 2),
+        "sum": round(total, 2),
+        "std": round(std, 2),
     }
 
-    # 시뮬레이션 적용
+    # 시뮬레이션 적용 (상수배 변환이므로 변환된 컬럼을 만들지 않고 현재 통계에서 계산)
     factor = 1 + (request.change_percent / 100)
-    simulated_values = df[request.column] * factor
-
     simulated_stats = {
-        "mean": round(float(simulated_values.mean()), 2),
-        "sum": round(float(simulated_values.sum()), 2),
-        "std": round(float(simulated_values.std()), 2),
+        "mean": round(mean * factor, 2),
+        "sum": round(total * factor, 2),
+        "std": round(std * abs(factor), 2),
     }
 
-    # 상관된 컬럼들의 영향 분석
-    correlations = []
-    for col in numeric_cols:
-        if col != request.column:
-            corr = df[request.column].corr(df[col])
-            if abs(corr) > 0.3:
-                # 상관관계에 비례한 영향 추정
-                estimated_impact = request.change_percent * corr
-                correlations.append({
-                    "column": col,
-                    "correlation": round(float(corr), 3),
-                    "estimated_impact": round(float(estimated_impact), 2),
-                    "direction": "동반 상승" if corr > 0 and request.change_percent > 0 else 
-                                "동반 하락" if corr > 0 and request.change_percent < 0 else
-                                "역방향 영향"
-                })
+    # 상관된 컬럼들의 영향 분석 (나머지 수치형 컬럼과의 상관계수를 한 번에 계산)
+    other_cols = [col for col in numeric_cols if col != request.column]
+    corrs = df[other_cols].corrwith(df[request.column]).dropna()
+    strong = corrs[corrs.abs() > 0.3]
+    
+    # 상관관계에 비례한 영향 추정
+    correlations = [
+        {
+            "column": col,
+            "correlation": round(corr, 3),
+            "estimated_impact": round(request.change_percent * corr, 2),
+            "direction": _impact_direction(corr, request.change_percent)
+        }
+        for col, corr in zip(strong.index, strong.tolist())
+    ]
 
     return {
         "success": True,
@@ -192,11 +198,20 @@ async def whatif_simulation(request: WhatIfRequest):
     }
 
 
+def _impact_direction(corr: float, change_percent: float) -> str:
+    """상관계수와 변화율 부호로 영향 방향 라벨 결정"""
+    if corr > 0 and change_percent > 0:
+        return "동반 상승"
+    if corr > 0 and change_percent < 0:
+        return "동반 하락"
+    return "역방향 영향"
+
+
 @router.post("/analysis/anomaly")
 async def detect_anomalies(request: AnomalyRequest):
     """이상치 탐지"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
@@ -206,44 +221,44 @@ async def detect_anomalies(request: AnomalyRequest):
     anomalies = []
     summary = {}
 
-    for col in target_cols:
-        if col not in df.columns:
-            continue
-        
-        data = df[col].dropna()
-        if len(data) < 10:
-            continue
-
-        anomaly_mask = pd.Series([False] * len(data), index=data.index)
-
+    # 대상 수치형 컬럼 전체에 대해 한 번에 경계/점수 계산 (결측 제외, 유효 값 10개 미만 컬럼 제외)
+    cols = [col for col in dict.fromkeys(target_cols) if col in df.columns]
+    num = df[cols].select_dtypes(include=[np.number])
+    total_counts = num.count()
+    num = num.loc[:, total_counts >= 10]
+
+    if request.method == "zscore":
+        # scipy.stats.zscore와 같은 모표준편차(ddof=0) 사용
+        z_scores = (num - num.mean()) / num.std(ddof=0)
+        anomaly_mask = z_scores.abs() > 3
+    else:
+        # 기본: IQR
+        quartiles = num.quantile([0.25, 0.75])
+        Q1, Q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        anomaly_mask = num.lt(lower_bound) | num.gt(upper_bound)
+    anomaly_counts = anomaly_mask.sum()
+
+    # 컬럼별 응답 구성
+    for col in num.columns:
         if request.method == "iqr":
-            Q1, Q3 = data.quantile(0.25), data.quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            anomaly_mask = (data < lower_bound) | (data > upper_bound)
-            method_desc = f"IQR 방법 (범위: {round(float(lower_bound), 2)} ~ {round(float(upper_bound), 2)})"
+            method_desc = f"IQR 방법 (범위: {round(float(lower_bound[col]), 2)} ~ {round(float(upper_bound[col]), 2)})"
         elif request.method == "zscore":
-            z_scores = np.abs(stats.zscore(data))
-            anomaly_mask = z_scores > 3
             method_desc = "Z-Score 방법 (|Z| > 3)"
         else:
-            # 기본: IQR
-            Q1, Q3 = data.quantile(0.25), data.quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            anomaly_mask = (data < lower_bound) | (data > upper_bound)
             method_desc = "IQR 방법"
 
-        anomaly_count = int(anomaly_mask.sum())
-        anomaly_pct = round(anomaly_count / len(data) * 100, 2)
+        total_count = int(total_counts[col])
+        anomaly_count = int(anomaly_counts[col])
+        anomaly_pct = round(anomaly_count / total_count * 100, 2)
 
         # 이상치 샘플
-        anomaly_values = data[anomaly_mask].head(10).tolist()
+        anomaly_values = num[col][anomaly_mask[col]].head(10).tolist()
 
         summary[col] = {
-            "total_count": len(data),
+            "total_count": total_count,
             "anomaly_count": anomaly_count,
             "anomaly_percentage": anomaly_pct,
             "method": method_desc,
@@ -279,18 +294,29 @@ async def detect_anomalies(request: AnomalyRequest):
 async def get_forecastable_columns(file_id: str):
     """예측 가능한 컬럼 목록 반환"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
-    # 날짜 컬럼 탐지
+    # 날짜 컬럼 탐지 (datetime 타입은 바로 채택, 수치형은 제외, 나머지는 샘플만 파싱)
     date_columns = []
     for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            date_columns.append(col)
+            continue
+        if pd.api.types.is_numeric_dtype(series):
+            continue
+        
+        sample = series.dropna().head(DATE_SAMPLE_SIZE)
+        if len(sample) == 0:
+            continue
         try:
-            pd.to_datetime(df[col])
+            parsed = pd.to_datetime(sample, errors="coerce")
+        except (TypeError, ValueError, OverflowError):
+            continue
+        if parsed.notna().mean() >= DATE_PARSE_THRESHOLD:
             date_columns.append(col)
-        except:
-            pass
 
     # 수치형 컬럼
     numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
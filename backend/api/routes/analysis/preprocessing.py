@@ -8,7 +8,7 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 import io
-from . import get_dataframe, store_dataframe, generate_file_id
+from . import get_dataframe_async, store_dataframe, generate_file_id
 
 router = APIRouter()
 
@@ -37,7 +37,7 @@ class PreprocessResponse(BaseModel):
 async def handle_missing_values(request: PreprocessRequest):
     """결측치 처리"""
     try:
-        df = get_dataframe(request.file_id).copy()
+        df = (await get_dataframe_async(request.file_id)).copy()
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -92,7 +92,7 @@ async def handle_missing_values(request: PreprocessRequest):
 async def handle_outliers(request: PreprocessRequest):
     """이상치 처리"""
     try:
-        df = get_dataframe(request.file_id).copy()
+        df = (await get_dataframe_async(request.file_id)).copy()
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -158,7 +158,7 @@ async def handle_outliers(request: PreprocessRequest):
 async def remove_duplicates(request: PreprocessRequest):
     """중복 행 제거"""
     try:
-        df = get_dataframe(request.file_id).copy()
+        df = (await get_dataframe_async(request.file_id)).copy()
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -190,7 +190,7 @@ async def remove_duplicates(request: PreprocessRequest):
 async def convert_column_type(request: PreprocessRequest):
     """컬럼 데이터 타입 변환"""
     try:
-        df = get_dataframe(request.file_id).copy()
+        df = (await get_dataframe_async(request.file_id)).copy()
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -242,7 +242,7 @@ async def convert_column_type(request: PreprocessRequest):
 async def get_eda_summary(file_id: str):
     """EDA 요약 정보"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -304,9 +304,10 @@ async def get_eda_summary(file_id: str):
             # 히스토그램 생성 (20 bins)
             try:
                 counts, bin_edges = np.histogram(data, bins=20)
+                edges = np.round(bin_edges, 2).tolist()
                 numeric_stats[-1]["histogram"] = [
-                    {"bin": i, "start": round(float(bin_edges[i]), 2), "end": round(float(bin_edges[i+1]), 2), "count": int(c)}
-                    for i, c in enumerate(counts)
+                    {"bin": i, "start": start, "end": end, "count": c}
+                    for i, (start, end, c) in enumerate(zip(edges[:-1], edges[1:], counts.tolist()))
                 ]
             except Exception:
                 numeric_stats[-1]["histogram"] = []
@@ -347,7 +348,7 @@ async def get_eda_summary(file_id: str):
 async def download_csv(file_id: str):
     """CSV 파일 다운로드"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
@@ -369,7 +370,7 @@ async def download_csv(file_id: str):
 async def download_excel(file_id: str):
     """Excel 파일 다운로드"""
     try:
-        df = get_dataframe(file_id)
+        df = await get_dataframe_async(file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
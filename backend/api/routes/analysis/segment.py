@@ -8,7 +8,7 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 
-from . import get_dataframe
+from . import get_dataframe_async
 
 router = APIRouter()
 
@@ -25,7 +25,7 @@ class SegmentRequest(BaseModel):
 async def analyze_segments(request: SegmentRequest):
     """세그먼트별 분석"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     except Exception as e:
@@ -8,7 +8,7 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 
-from . import get_dataframe
+from . import get_dataframe_async
 
 router = APIRouter()
 
@@ -26,7 +26,7 @@ class TimeSeriesRequest(BaseModel):
 async def analyze_timeseries(request: TimeSeriesRequest):
     """시계열 분석 및 트렌드 예측"""
     try:
-        df = get_dataframe(request.file_id)
+        df = await get_dataframe_async(request.file_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
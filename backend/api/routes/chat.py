@@ -13,7 +13,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from core.workflow import MultiAgentWorkflow
-from services.llm_service import LLMService
+from services.llm_service import get_llm_service
 
 
 router = APIRouter()
@@ -63,8 +63,7 @@ def get_workflow() -> MultiAgentWorkflow:
     """워크플로우 인스턴스 반환 (Singleton)"""
     global _workflow
     if _workflow is None:
-        llm = LLMService()
-        _workflow = MultiAgentWorkflow(llm_service=llm)
+        _workflow = MultiAgentWorkflow(llm_service=get_llm_service())
     return _workflow
 
 
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import time
+from time import perf_counter_ns as _pc
 from typing import Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 
@@ -59,7 +59,7 @@ class MultiAgentWorkflow:
         query_lower = query.lower()
         
         # 등록된 에이전트 목록
-        available = AgentRegistry.list_agents()
+        available = AgentRegistry.agent_names_frozen()
         
         if not available:
             return {"execution_order": [], "error": "등록된 에이전트가 없습니다."}
@@ -114,14 +114,15 @@ class MultiAgentWorkflow:
             )
             
             # 실행
-            start_time = time.time()
+            start_ns = _pc()
             output = await agent.execute(agent_input)
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (_pc() - start_ns) // 1_000_000
             
             # 결과 추가
             new_result = {
                 "agent_name": output.agent_name,
                 "result": output.result,
+                "result_preview": output.result_preview,
                 "confidence": output.confidence,
                 "reasoning": output.reasoning,
                 "sources": output.sources,
@@ -2,5 +2,6 @@
 Services module initialization
 """
 from .llm_service import LLMService
+from .llm_cache import LLMCache, get_llm_cache, fingerprint
 
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "LLMCache", "get_llm_cache", "fingerprint"]
@@ -0,0 +1,192 @@
+"""
+LLM Cache - LLM 응답 캐시
+
+동일한 프롬프트에 대한 LLM 재호출을 방지하는 캐시.
+정규화된 프롬프트의 SHA-256 정확 일치로 조회.
+"""
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from functools import lru_cache
+
+import orjson
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "storage" / "sqlite" / "llm_cache.db"
+
+# 만료 항목 정리 주기 (초, set 시 마지막 정리 이후 이 시간이 지났으면 함께 삭제)
+PURGE_INTERVAL_SECONDS = 3600
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    소문자화, 공백 축약
+    
+    구두점은 제거하지 않음: '3.5억'/'35억', '-100'/'100', '1,000'/'1000'처럼
+    의미가 다른 수치 질문이 같은 키가 되어 다른 사용자의 계산 결과가 반환될 수 있음.
+    """
+    return _SPACE_RE.sub(" ", text.lower()).strip()
+
+
+def make_cache_key(parts: Sequence[str]) -> str:
+    """프롬프트 파트들로부터 캐시 키 생성"""
+    joined = "\x1f".join(normalize_prompt(p) for p in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    구조화 데이터 지문 (키 순서 무관)
+    
+    긴 구조화 데이터(데이터 요약 등)를 프롬프트 대신 짧은 키 파트로 사용할 때 활용
+    """
+    payload = orjson.dumps(
+        obj,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite 기반 LLM 응답 캐시
+
+    Usage:
+        cache = get_llm_cache()
+        result = await cache.get_or_compute(
+            (system_prompt, user_prompt),
+            lambda: llm.chat(system_prompt=system_prompt, user_message=user_prompt),
+        )
+    """
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        ttl_hours: float = 24
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                metadata TEXT,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        
+        # 이전 실행에서 남은 만료 항목 정리
+        self._last_purge = 0.0
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[str]:
+        """정확 일치 조회 (만료 항목 제외)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        metadata: Optional[dict] = None
+    ) -> None:
+        """응답 저장 (정리 주기가 지났으면 만료 항목도 함께 삭제)"""
+        now = time.time()
+        with self._lock:
+            # 컬럼명 명시: 이전 스키마(embedding 컬럼 포함) DB에도 그대로 저장
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, metadata, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response,
+                    json.dumps(metadata or {}, ensure_ascii=False),
+                    now,
+                    now + self.ttl_seconds,
+                )
+            )
+            if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                self._last_purge = now
+            self._conn.commit()
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get을 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(
+        self,
+        key: str,
+        response: str,
+        metadata: Optional[dict] = None
+    ) -> None:
+        """set을 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        await asyncio.to_thread(self.set, key, response, metadata)
+
+    async def get_or_compute(
+        self,
+        key_parts: Sequence[str],
+        compute_fn: Callable[[], Awaitable[str]],
+        metadata: Optional[dict] = None
+    ) -> str:
+        """
+        캐시 조회 후 미스 시 계산하여 저장
+
+        Args:
+            key_parts: 캐시 키를 구성할 프롬프트 파트 (예: (system, user))
+            compute_fn: 미스 시 호출할 비동기 함수
+            metadata: 함께 저장할 메타데이터
+
+        Returns:
+            LLM 응답 문자열
+        """
+        key = make_cache_key(key_parts)
+        cached = await self.get_async(key)
+        if cached is not None:
+            return cached
+
+        response = await compute_fn()
+        await self.set_async(key, response, metadata)
+        return response
+
+    def purge_expired(self) -> int:
+        """만료 항목 삭제"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+            )
+            self._conn.commit()
+            self._last_purge = now
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """캐시 초기화"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+@lru_cache()
+def get_llm_cache() -> LLMCache:
+    """LLM 캐시 싱글톤 반환"""
+    return LLMCache()
@@ -4,10 +4,12 @@ LLM Service - OpenAI API 래퍼
 LLM 호출을 캡슐화하여 의존성 주입 가능하게 함.
 """
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from functools import lru_cache
 from dotenv import load_dotenv
+import httpx
 
 # Load .env file from backend directory
 env_path = Path(__file__).parent.parent / ".env"
@@ -16,12 +18,100 @@ load_dotenv(env_path)
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
+from utils.logger import get_logger
+
+logger = get_logger("llm")
+
+
+# 모든 LLMService 인스턴스가 공유하는 커넥션 풀 설정
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# 커넥션 예열 대상 (LLM 공급자 API 엔드포인트)
+LLM_API_BASE = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+
+@lru_cache()
+def get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    공유 HTTP 클라이언트 반환 (keep-alive 커넥션 풀)
+    
+    에이전트/요청마다 TCP+TLS 핸드셰이크를 반복하지 않도록
+    프로세스당 한 쌍의 클라이언트를 재사용.
+    """
+    return (
+        httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+        httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+    )
+
+
+# 호출 라벨별 입력 토큰 / 공급자 prefix 캐시 적중 토큰 누적 (프롬프트 배치 튜닝용)
+_usage_stats: Dict[str, Dict[str, int]] = {}
+_usage_lock = threading.Lock()
+
+
+def record_usage(label: str, response: Any) -> None:
+    """
+    응답의 토큰 사용량 기록
+    
+    LangChain usage_metadata의 input_token_details.cache_read는
+    OpenAI prompt_tokens_details.cached_tokens / Anthropic cache_read_input_tokens에 대응.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    
+    with _usage_lock:
+        stats = _usage_stats.setdefault(label, {"calls": 0, "input_tokens": 0, "cached_tokens": 0})
+        stats["calls"] += 1
+        stats["input_tokens"] += input_tokens
+        stats["cached_tokens"] += cached_tokens
+    logger.debug("LLM usage [%s] input=%d cached=%d", label, input_tokens, cached_tokens)
+
+
+def get_usage_stats() -> Dict[str, Dict[str, Any]]:
+    """라벨별 누적 사용량과 prefix 캐시 적중률"""
+    with _usage_lock:
+        return {
+            label: {
+                **stats,
+                "cache_hit_ratio": round(stats["cached_tokens"] / stats["input_tokens"], 4) if stats["input_tokens"] else 0.0,
+            }
+            for label, stats in _usage_stats.items()
+        }
+
+
+async def warm_http_pool() -> None:
+    """
+    LLM 공급자와 커넥션을 미리 맺어 둠 (앱 시작 시 호출)
+    
+    첫 LLM 요청이 TCP+TLS 핸드셰이크와 HTTP/2 협상 비용을 치르지 않도록
+    가벼운 HEAD 요청으로 keep-alive 커넥션을 풀에 올려 둠. 응답 코드는 무시.
+    """
+    _, async_client = get_http_clients()
+    try:
+        await async_client.head(LLM_API_BASE)
+    except httpx.HTTPError:
+        pass
+
+
+async def close_http_clients() -> None:
+    """공유 HTTP 클라이언트 종료 (앱 종료 시 호출)"""
+    if get_http_clients.cache_info().currsize == 0:
+        return
+    sync_client, async_client = get_http_clients()
+    sync_client.close()
+    await async_client.aclose()
+    get_http_clients.cache_clear()
+
 
 class LLMService:
     """
     LLM 서비스 클래스
     
-    LangChain ChatOpenAI를 래핑하여 통일된 인터페이스 제공
+    LangChain ChatOpenAI를 래핑하여 통일된 인터페이스 제공.
+    HTTP 커넥션 풀은 get_http_clients()로 공유되므로 인스턴스를 여러 개 만들어도
+    커넥션은 재사용되지만, 가급적 get_llm_service() 싱글톤을 사용.
     """
     
     def __init__(
@@ -35,13 +125,31 @@ class LLMService:
         self.temperature = temperature
         self.max_tokens = max_tokens
         
+        http_client, http_async_client = get_http_clients()
         self._llm = ChatOpenAI(
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
             api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            http_client=http_client,
+            http_async_client=http_async_client,
         )
     
+    def _to_langchain_messages(self, messages: List[Dict[str, Any]]) -> List[Any]:
+        """dict 메시지 → LangChain 메시지 변환"""
+        langchain_messages = []
+        for msg in messages:
+            role = msg.get("role", "user")
+            content = msg.get("content", "")
+            
+            if role == "system":
+                langchain_messages.append(SystemMessage(content=content))
+            elif role == "assistant":
+                langchain_messages.append(AIMessage(content=content))
+            else:
+                langchain_messages.append(HumanMessage(content=content))
+        return langchain_messages
+    
     async def invoke(
         self, 
         messages: List[Dict[str, str]],
@@ -52,23 +160,14 @@ class LLMService:
         
         Args:
             messages: [{"role": "system"|"user"|"assistant", "content": "..."}]
+            label: 사용량 집계 라벨 (기본 "default")
             
         Returns:
             응답 문자열
         """
-        langchain_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            
-            if role == "system":
-                langchain_messages.append(SystemMessage(content=content))
-            elif role == "assistant":
-                langchain_messages.append(AIMessage(content=content))
-            else:
-                langchain_messages.append(HumanMessage(content=content))
-        
+        langchain_messages = self._to_langchain_messages(messages)
         response = await self._llm.ainvoke(langchain_messages)
+        record_usage(kwargs.get("label", "default"), response)
         return response.content
     
     def invoke_sync(
@@ -77,19 +176,9 @@ class LLMService:
         **kwargs
     ) -> str:
         """동기 호출"""
-        langchain_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            
-            if role == "system":
-                langchain_messages.append(SystemMessage(content=content))
-            elif role == "assistant":
-                langchain_messages.append(AIMessage(content=content))
-            else:
-                langchain_messages.append(HumanMessage(content=content))
-        
+        langchain_messages = self._to_langchain_messages(messages)
         response = self._llm.invoke(langchain_messages)
+        record_usage(kwargs.get("label", "default"), response)
         return response.content
     
     async def chat(
@@ -114,6 +203,30 @@ class LLMService:
         ]
         return await self.invoke(messages, **kwargs)
     
+    async def chat_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        스트리밍 채팅 인터페이스
+        
+        Args:
+            system_prompt: 시스템 프롬프트
+            user_message: 사용자 메시지
+            
+        Yields:
+            응답 토큰 청크
+        """
+        langchain_messages = self._to_langchain_messages([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ])
+        async for chunk in self._llm.astream(langchain_messages):
+            if chunk.content:
+                yield chunk.content
+    
     def get_model_info(self) -> Dict[str, Any]:
         """모델 정보 반환"""
         return {
@@ -0,0 +1,7 @@
+"""
+Test configuration - backend 패키지 경로 등록
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
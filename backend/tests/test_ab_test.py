@@ -0,0 +1,50 @@
+"""
+A/B 테스트 - t-검정 결과를 scipy.stats.ttest_ind와 비교
+"""
+import math
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from api.routes.analysis.ab_test import _t_test
+
+
+def _run(group_a, group_b, welch):
+    group_a, group_b = np.asarray(group_a, dtype=float), np.asarray(group_b, dtype=float)
+    return _t_test(
+        group_a.mean(), group_b.mean(),
+        group_a.var(ddof=1), group_b.var(ddof=1),
+        len(group_a), len(group_b),
+        welch=welch
+    )
+
+
+@pytest.mark.parametrize("welch", [False, True])
+def test_matches_scipy(welch):
+    rng = np.random.default_rng(0)
+    group_a, group_b = rng.normal(0, 1, 50), rng.normal(0.3, 2, 40)
+    
+    stat, p_value = _run(group_a, group_b, welch)
+    expected = stats.ttest_ind(group_a, group_b, equal_var=not welch)
+    
+    assert stat == pytest.approx(expected.statistic)
+    assert p_value == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize("welch", [False, True])
+def test_constant_groups_with_different_means_are_significant(welch):
+    """두 그룹이 각각 상수이고 평균이 다르면 ±inf, p=0 (scipy와 동일)"""
+    stat, p_value = _run([1, 1, 1], [2, 2, 2], welch)
+    
+    assert stat == -math.inf
+    assert p_value == 0.0
+    assert _run([2, 2, 2], [1, 1, 1], welch)[0] == math.inf
+
+
+@pytest.mark.parametrize("welch", [False, True])
+def test_identical_constant_groups_are_undefined(welch):
+    stat, p_value = _run([1, 1, 1], [1, 1, 1], welch)
+    
+    assert math.isnan(stat)
+    assert math.isnan(p_value)
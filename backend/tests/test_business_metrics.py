@@ -0,0 +1,127 @@
+"""
+비즈니스 메트릭 - 벡터화 구현을 기존 반복문 구현(참조)과 비교
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.routes.analysis import generate_file_id, store_dataframe
+from api.routes.analysis.business_metrics import (
+    BusinessMetricsRequest,
+    _calculate_arpu,
+    _calculate_churn,
+    _calculate_cohort,
+)
+
+
+def _reference_cohort(df, user_column, date_column):
+    """기존 코호트 분석 (코호트별 반복문)"""
+    df = df.copy()
+    df[date_column] = pd.to_datetime(df[date_column])
+    
+    first_purchase = df.groupby(user_column)[date_column].min().reset_index()
+    first_purchase.columns = [user_column, 'cohort_date']
+    first_purchase['cohort'] = first_purchase['cohort_date'].dt.to_period('M')
+    
+    df = df.merge(first_purchase[[user_column, 'cohort']], on=user_column)
+    df['activity_month'] = df[date_column].dt.to_period('M')
+    df['period_number'] = (df['activity_month'] - df['cohort']).apply(lambda x: x.n if hasattr(x, 'n') else 0)
+    
+    cohort_data = df.groupby(['cohort', 'period_number'])[user_column].nunique().reset_index()
+    cohort_sizes = df.groupby('cohort')[user_column].nunique()
+    
+    cohort_table = []
+    for cohort in sorted(cohort_data['cohort'].unique())[-6:]:
+        cohort_row = {"cohort": str(cohort)}
+        for period in range(min(6, int(cohort_data['period_number'].max()) + 1)):
+            users = cohort_data[(cohort_data['cohort'] == cohort) & (cohort_data['period_number'] == period)][user_column].sum()
+            retention = users / max(cohort_sizes.get(cohort, 1), 1)
+            cohort_row[f"M{period}"] = round(float(retention), 3)
+        cohort_table.append(cohort_row)
+    return cohort_table
+
+
+def _reference_churn(df, user_column, date_column):
+    """기존 이탈률 계산 (기간별 set 차집합)"""
+    df = df.copy()
+    df['period'] = pd.to_datetime(df[date_column]).dt.to_period('M')
+    periods = sorted(df['period'].unique())
+    
+    churn_data = []
+    for i in range(1, len(periods)):
+        prev_users = set(df[df['period'] == periods[i-1]][user_column])
+        curr_users = set(df[df['period'] == periods[i]][user_column])
+        churned = prev_users - curr_users
+        churn_data.append({
+            "period": str(periods[i]),
+            "prev_users": len(prev_users),
+            "churned_users": len(churned),
+            "churn_rate": round(len(churned) / max(len(prev_users), 1), 4)
+        })
+    return churn_data
+
+
+@pytest.fixture
+def events():
+    """10개월간 200명의 활동 로그 (월별 신규 유입 + 무작위 재방문)"""
+    rng = np.random.default_rng(0)
+    months = pd.period_range("2024-01", periods=10, freq="M")
+    users = rng.integers(0, 200, 3000)
+    start = users % 10
+    offset = rng.integers(0, 10, 3000)
+    month_idx = np.minimum(start + offset * (rng.random(3000) < 0.5), 9)
+    dates = [
+        (months[m].start_time + pd.Timedelta(days=int(d))).strftime("%Y-%m-%d")
+        for m, d in zip(month_idx, rng.integers(0, 28, 3000))
+    ]
+    return pd.DataFrame({
+        "user": [f"u{u}" for u in users],
+        "date": dates,
+        "revenue": rng.integers(1, 100, 3000).astype(float),
+        "segment": [f"s{u % 4}" for u in users],
+    })
+
+
+def _store(df):
+    file_id = generate_file_id()
+    store_dataframe(file_id, df)
+    return file_id
+
+
+def test_cohort_matches_reference(events):
+    req = BusinessMetricsRequest(
+        file_id=_store(events), metric_type="cohort", user_column="user", date_column="date"
+    )
+    result = _calculate_cohort(events, req)
+    
+    assert result["cohort_table"] == _reference_cohort(events, "user", "date")
+    assert len(result["cohort_table"]) == 6
+
+
+def test_churn_matches_reference(events):
+    req = BusinessMetricsRequest(
+        file_id=_store(events), metric_type="churn", user_column="user", date_column="date"
+    )
+    result = _calculate_churn(events, req)
+    
+    assert result["monthly_churn"] == _reference_churn(events, "user", "date")[-6:]
+
+
+def test_arpu_segments_match_reference(events):
+    req = BusinessMetricsRequest(
+        file_id=_store(events), metric_type="arpu",
+        revenue_column="revenue", user_column="user", group_column="segment"
+    )
+    result = _calculate_arpu(events, req)
+    
+    expected = []
+    for group in events["segment"].unique()[:10]:
+        subset = events[events["segment"] == group]
+        expected.append({
+            "segment": str(group),
+            "arpu": round(subset["revenue"].sum() / max(subset["user"].nunique(), 1), 2),
+            "users": int(subset["user"].nunique()),
+        })
+    
+    assert result["segment_arpu"] == sorted(expected, key=lambda x: x["arpu"], reverse=True)
+    assert result["total_users"] == events["user"].nunique()
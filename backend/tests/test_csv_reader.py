@@ -0,0 +1,38 @@
+"""
+CSV reader - pyarrow 경로와 C 엔진 결과 비교
+"""
+import io
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from utils.csv_reader import read_csv_bytes
+
+pytest.importorskip("pyarrow")
+
+
+DATED_CSV = (
+    b"date,timestamp,time,count,name,flag,score,maybe,note\n"
+    b"2024-01-01,2024-01-01 10:00:00,10:00:00,1,a,true,1.5,True,\n"
+    b"2024-01-02,2024-01-02T11:00:00,11:00:00,,b,false,,,x\n"
+    b",2024-01-03,12:00,3,NA,True,2,False,None\n"
+)
+
+
+def test_dated_csv_matches_c_engine():
+    """날짜/시각 문자열, 결측 정수, 결측 불리언 컬럼의 dtype과 값이 C 엔진과 동일"""
+    expected = pd.read_csv(io.BytesIO(DATED_CSV), engine="c")
+    
+    result = read_csv_bytes(DATED_CSV)
+    
+    assert_frame_equal(result, expected)
+    assert not any(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in result.dtypes)
+
+
+def test_file_object_and_ragged_rows_fall_back():
+    """파일 객체 입력과 pyarrow가 거부하는 행(열 개수 불일치)도 C 엔진과 동일하게 처리"""
+    ragged = b"a,b\n1,2\n3\n"
+    expected = pd.read_csv(io.BytesIO(ragged), engine="c")
+    
+    assert_frame_equal(read_csv_bytes(io.BytesIO(ragged)), expected)
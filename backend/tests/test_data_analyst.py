@@ -0,0 +1,35 @@
+"""
+데이터 분석 에이전트 - 상관계수를 df.corr()와 비교
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.specialists.data_analyst import DataAnalystAgent
+
+
+def _correlation(df):
+    agent = DataAnalystAgent()
+    numeric_cols, arr = agent._extract_numeric(df)
+    result = agent._analyze_correlation(numeric_cols, arr, agent._numeric_stats(arr))
+    return pd.DataFrame(
+        [{col: row[col] for col in numeric_cols} for row in result["matrix_data"]],
+        index=numeric_cols,
+    )
+
+
+@pytest.mark.parametrize("missing", [0.0, 0.3])
+def test_matches_pandas_corr(missing):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=500)
+    df = pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(scale=0.5, size=500),
+        "z": rng.normal(size=500),
+        "const": np.ones(500),
+    })
+    if missing:
+        for col in ("x", "y"):
+            df.loc[rng.random(500) < missing, col] = np.nan
+    
+    pd.testing.assert_frame_equal(_correlation(df), df.corr().round(2))
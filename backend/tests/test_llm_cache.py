@@ -0,0 +1,58 @@
+"""
+LLM 캐시 - 저장/조회, 만료 정리, 이전 스키마 호환
+"""
+import asyncio
+import sqlite3
+import time
+
+from services.llm_cache import LLMCache
+
+
+def test_get_or_compute_calls_once(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db")
+    calls = []
+    
+    async def compute():
+        calls.append(1)
+        return "answer"
+    
+    async def run():
+        first = await cache.get_or_compute(("system", "user"), compute)
+        second = await cache.get_or_compute(("system", "  USER "), compute)
+        return first, second
+    
+    assert asyncio.run(run()) == ("answer", "answer")
+    assert len(calls) == 1
+
+
+def test_expired_rows_are_purged(tmp_path):
+    cache = LLMCache(tmp_path / "cache.db", ttl_hours=0)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    
+    # 다시 열 때 만료 항목 정리
+    cache = LLMCache(tmp_path / "cache.db")
+    count = cache._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+    assert count == 0
+
+
+def test_legacy_schema_with_embedding_column(tmp_path):
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE llm_cache (
+            key TEXT PRIMARY KEY, response TEXT NOT NULL, embedding TEXT,
+            metadata TEXT, created_at REAL NOT NULL, expires_at REAL NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+        ("old", "cached", None, "{}", time.time(), time.time() + 3600)
+    )
+    conn.commit()
+    conn.close()
+    
+    cache = LLMCache(path)
+    cache.set("new", "value")
+    assert cache.get("old") == "cached"
+    assert cache.get("new") == "value"
@@ -0,0 +1,64 @@
+"""
+DataFrame 저장소 - 디스크 내보내기/재적재와 만료
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+import api.routes.analysis as store
+
+
+@pytest.fixture(autouse=True)
+def small_store(tmp_path, monkeypatch):
+    """메모리 1개 + 임시 디렉터리로 내보내는 저장소"""
+    monkeypatch.setattr(store, "MAX_IN_MEMORY_FILES", 1)
+    monkeypatch.setattr(store, "SPILL_DIR", tmp_path)
+    yield
+    store.shutdown_spill_executor()
+    store.clear_spilled()
+
+
+def test_spilled_frame_is_reloaded():
+    first, second = store.generate_file_id(), store.generate_file_id()
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+    store.store_dataframe(first, df)
+    store.store_dataframe(second, pd.DataFrame({"a": [1]}))
+    store.shutdown_spill_executor()
+    
+    assert store.list_stored_files()[first]["in_memory"] is False
+    pd.testing.assert_frame_equal(store.get_dataframe(first), df)
+
+
+def test_unserializable_frame_stays_in_memory():
+    first, second = store.generate_file_id(), store.generate_file_id()
+    mixed = pd.DataFrame({"a": [1, "x", 2.5]})
+    store.store_dataframe(first, mixed)
+    store.store_dataframe(second, pd.DataFrame({"a": [1]}))
+    store.shutdown_spill_executor()
+    
+    assert store.list_stored_files()[first]["in_memory"] is True
+    assert store.get_dataframe(first) is mixed
+
+
+def test_expired_files_drop_their_version(monkeypatch):
+    file_id = store.generate_file_id()
+    store.store_dataframe(file_id, pd.DataFrame({"a": [1]}))
+    assert file_id in store._versions
+    
+    monkeypatch.setattr(store, "FILE_TTL_SECONDS", 0)
+    store.store_dataframe(store.generate_file_id(), pd.DataFrame({"a": [2]}))
+    
+    assert file_id not in store._versions
+    with pytest.raises(KeyError):
+        store.get_dataframe(file_id)
+
+
+def test_async_reload_from_disk():
+    first, second = store.generate_file_id(), store.generate_file_id()
+    df = pd.DataFrame({"a": [1.5, 2.5]})
+    store.store_dataframe(first, df)
+    store.store_dataframe(second, pd.DataFrame({"a": [1]}))
+    store.shutdown_spill_executor()
+    
+    pd.testing.assert_frame_equal(asyncio.run(store.get_dataframe_async(first)), df)
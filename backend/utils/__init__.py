@@ -3,5 +3,8 @@ Utils module initialization
 """
 from .logger import get_logger
 from .exceptions import AgentError, WorkflowError
+from .csv_reader import read_csv_bytes
+from .llm_summary import summarize_for_llm, count_tokens
+from .process_pool import process_context
 
-__all__ = ["get_logger", "AgentError", "WorkflowError"]
+__all__ = ["get_logger", "AgentError", "WorkflowError", "read_csv_bytes", "summarize_for_llm", "count_tokens", "process_context"]
@@ -0,0 +1,100 @@
+"""
+CSV Reader - CSV 파싱 유틸리티
+"""
+import io
+import importlib.util
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+# pyarrow는 선택 의존성 - 없으면 기본 C 파서 사용
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# C 파서(pandas 기본값)의 결측값 표기와 불리언 리터럴
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+TRUE_VALUES = ["True", "TRUE", "true"]
+FALSE_VALUES = ["False", "FALSE", "false"]
+
+
+def _read_with_pyarrow(content: Union[bytes, str]) -> pd.DataFrame:
+    """
+    pyarrow.csv로 파싱하여 C 파서와 같은 dtype의 DataFrame 생성
+    
+    pyarrow는 ISO 날짜/시각 문자열을 temporal 타입으로 추론하지만 C 파서는 텍스트로 두므로
+    해당 컬럼은 문자열로 읽음. 텍스트 컬럼은 pandas가 str 값에 추론하는 문자열 dtype으로 변환.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    def source():
+        return io.BytesIO(content) if isinstance(content, bytes) else content
+    
+    convert_options = pa_csv.ConvertOptions(
+        null_values=NA_VALUES,
+        true_values=TRUE_VALUES,
+        false_values=FALSE_VALUES,
+        strings_can_be_null=True,
+    )
+    
+    # 타입은 첫 블록에서 추론되므로 첫 블록 스키마만으로 temporal 컬럼을 알 수 있음 (전체 파싱 1회)
+    reader = pa_csv.open_csv(source(), convert_options=convert_options)
+    schema = reader.schema
+    reader.close()
+    if len(set(schema.names)) != len(schema.names):
+        # 중복 헤더는 C 파서가 "a", "a.1"로 바꾸므로 C 파서로 처리
+        raise ValueError("duplicate column names")
+    
+    convert_options.column_types = {
+        field.name: pa.string()
+        for field in schema
+        if pa.types.is_temporal(field.type)
+    }
+    table = pa_csv.read_csv(source(), convert_options=convert_options)
+    
+    df = table.to_pandas()
+    string_dtype = pd.Series(["x"]).dtype
+    for field, column in zip(table.schema, table.columns):
+        col = df[field.name]
+        if string_dtype != object and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            df[field.name] = col.astype(string_dtype)
+        elif col.dtype == object and column.null_count > 0:
+            # to_pandas는 결측을 None으로, C 파서는 NaN으로 반환
+            df[field.name] = col.where(col.notna(), np.nan)
+    return df
+
+
+def read_csv_bytes(content: Union[bytes, str, "io.IOBase"]) -> pd.DataFrame:
+    """
+    CSV 바이트(또는 경로/파일 객체)를 DataFrame으로 변환
+    
+    pyarrow가 있으면 멀티스레드 파서를 사용하고, pyarrow가 거부하는 입력은 C 파서로 처리.
+    두 경로의 dtype은 동일 (날짜 형식 텍스트는 텍스트, 결측이 있는 정수는 float64, 결측은 NaN).
+    
+    Args:
+        content: CSV 바이트, 경로 또는 파일 객체
+    
+    Returns:
+        DataFrame
+    """
+    if hasattr(content, "read"):
+        content = content.read()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+    
+    if HAS_PYARROW:
+        import pyarrow as pa
+        
+        try:
+            return _read_with_pyarrow(content)
+        except (pa.ArrowInvalid, ValueError):
+            # 행마다 필드 수가 다른 경우 등 pyarrow가 거부하는 입력은 C 파서로 처리
+            pass
+    
+    source = io.BytesIO(content) if isinstance(content, bytes) else content
+    return pd.read_csv(source)
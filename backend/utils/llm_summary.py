@@ -0,0 +1,98 @@
+"""
+LLM Summary - LLM 프롬프트용 압축 데이터 요약
+"""
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # 보통 langchain-openai와 함께 설치됨
+    tiktoken = None
+
+
+# 토크나이저가 없을 때 사용하는 토큰당 대략적인 문자 수
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache()
+def _get_encoder():
+    """공유 tiktoken 인코더 (미설치/오프라인 등으로 사용할 수 없으면 None)"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 (tiktoken이 없으면 문자 수 기반 추정)"""
+    encoder = _get_encoder()
+    if encoder is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoder.encode(text))
+
+
+def _compact(value: Any) -> str:
+    """공백 없는 한 줄 JSON 문자열"""
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def summarize_for_llm(
+    summary: Dict[str, Any],
+    token_budget: int = 800,
+    max_samples: int = 3
+) -> str:
+    """
+    데이터 요약을 토큰 예산 안의 압축된 줄 단위 텍스트로 변환
+    
+    섹션은 우선순위 순서(크기, 스키마, 결측, 고유값 수, 값 샘플, 샘플 행)로 출력.
+    예산을 다 쓸 때까지 항목을 추가하고, 잘린 섹션은 "(+N more)"로 끝내며 이후 섹션은
+    생략하므로 구조 중간에서 끊기지 않음.
+    
+    Args:
+        summary: "shape", "columns", "dtypes"와 선택적으로
+            "null_counts", "unique_counts", "value_samples", "sample"을 담은 dict
+        token_budget: 출력 텍스트의 최대 토큰 수
+        max_samples: 포함할 최대 샘플 행 수
+    
+    Returns:
+        요약 텍스트
+    """
+    dtypes = summary.get("dtypes", {})
+    sections: List[Tuple[str, List[str]]] = [
+        ("shape", ["x".join(str(n) for n in summary.get("shape", ()))]),
+        ("cols", [f"{col}:{dtypes.get(col, '?')}" for col in summary.get("columns", [])]),
+        ("nulls", [f"{col}:{n}" for col, n in summary.get("null_counts", {}).items() if n]),
+        ("uniques", [f"{col}:{n}" for col, n in summary.get("unique_counts", {}).items()]),
+        ("values", [f"{col}={_compact(vals)}" for col, vals in summary.get("value_samples", {}).items()]),
+        (f"samples(<={max_samples})", [_compact(row) for row in summary.get("sample", [])[:max_samples]]),
+    ]
+    
+    used = 0
+    lines: List[str] = []
+    for name, entries in sections:
+        if not entries:
+            continue
+    
+        header = f"{name}: "
+        used += count_tokens(header)
+        if used > token_budget:
+            break
+    
+        kept: List[str] = []
+        for entry in entries:
+            cost = count_tokens(entry) + 1  # 구분자
+            if used + cost > token_budget:
+                break
+            used += cost
+            kept.append(entry)
+    
+        line = header + ", ".join(kept)
+        if len(kept) < len(entries):
+            lines.append(f"{line} (+{len(entries) - len(kept)} more)")
+            break
+        lines.append(line)
+    
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+"""
+Process Pool - 워커 프로세스 풀 지원
+
+워커 풀의 시작 방식(context)과 워커 안에서 실행되는 함수 모음.
+워커 함수를 api.routes가 아닌 이 모듈에 두어 spawn/forkserver 워커가
+FastAPI 앱 전체 대신 가벼운 이 모듈만 import하도록 함.
+"""
+import multiprocessing
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows - 자원 한도 없이 프로세스 격리만 적용
+    resource = None
+
+
+# 난수 키 배치 하나의 최대 원소 수 (메모리 상한)
+BOOTSTRAP_BATCH_ELEMENTS = 2_000_000
+
+
+def process_context():
+    """
+    멀티스레드 서버에서 안전한 multiprocessing context (forkserver, 없으면 spawn)
+    
+    fork()는 멀티스레드 부모(로그 리스너, HTTP 클라이언트, 이벤트 루프)를 복제하여
+    다른 스레드가 잡고 있던 lock 때문에 자식이 멈출 수 있음.
+    forkserver/spawn은 깨끗한 프로세스에서 워커를 시작하므로 서버 주소 공간
+    (적재된 DataFrame 등)도 물려받지 않음.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def random_subset_sums(
+    combined: np.ndarray,
+    m: int,
+    n_iterations: int,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """반복마다 combined에서 크기 m인 무작위 부분집합의 합 계산 (NumPy 배치 처리)"""
+    n = len(combined)
+    rng = rng or np.random.default_rng()
+    batch = max(1, min(n_iterations, BOOTSTRAP_BATCH_ELEMENTS // n))
+    
+    sums = np.empty(n_iterations)
+    for start in range(0, n_iterations, batch):
+        stop = min(start + batch, n_iterations)
+        # 난수 키가 가장 작은 m개의 위치 = 무작위 부분집합 (argpartition은 O(n))
+        idx = np.argpartition(rng.random((stop - start, n)), m - 1, axis=1)[:, :m]
+        sums[start:stop] = combined[idx].sum(axis=1)
+    return sums
+
+
+def subset_sums_chunk(combined: np.ndarray, m: int, n_iterations: int, seed) -> np.ndarray:
+    """부트스트랩 풀 작업 (워커마다 독립적인 난수 스트림)"""
+    return random_subset_sums(combined, m, n_iterations, np.random.default_rng(seed))
+
+
+def init_sandbox(memory_bytes: int):
+    """샌드박스 워커 초기화 - 주소 공간 한도 설정"""
+    if resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def execute_in_sandbox(df: pd.DataFrame, code: str, cpu_seconds: int) -> pd.DataFrame:
+    """
+    샌드박스 워커에서 생성된 코드를 df에 실행
+    
+    워커는 재사용되므로 작업마다 CPU 한도를 (지금까지 사용한 CPU 시간 + cpu_seconds)로 다시 설정.
+    한도를 넘으면 SIGXCPU로 워커가 종료됨.
+    """
+    if resource is not None:
+        used = sum(resource.getrusage(resource.RUSAGE_SELF)[:2])
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(used) + cpu_seconds
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    
+    local_vars = {"df": df}
+    exec(code, {"__builtins__": {}}, local_vars)
+    return local_vars.get("df", df)